@@ -58,6 +58,7 @@ setup(
         'django-extensions',
         'djangorestframework',
         'south',
+        'celery>=3.1',
         ],
   platforms=['OS Independent'],
   license='Gnu Public License V2',
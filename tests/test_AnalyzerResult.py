@@ -4,6 +4,7 @@ from unit_timeside import unittest, TestRunner
 from timeside.analyzer.core import AnalyzerResult, AnalyzerResultContainer
 from timeside import __version__
 import numpy as np
+import h5py
 from math import pi
 
 
@@ -164,6 +165,21 @@ class TestAnalyzerResultNumpy(TestAnalyzerResultGoodType):
         self.assertEqual(d_numpy, results)
 
 
+class TestAnalyzerResultNpz(TestAnalyzerResultGoodType):
+    """ test AnalyzerResult npz serialize """
+
+    def tearDown(self):
+        results = AnalyzerResultContainer([self.result])
+        results.to_npz('/tmp/t.npz')
+        d_npz = results.from_npz('/tmp/t.npz')
+        if verbose:
+            print '%15s' % 'from npz:',
+            print d_npz
+        self.assertEqual(d_npz, results)
+        d_npz = results.from_npz(results.to_npz(compress=True))
+        self.assertEqual(d_npz, results)
+
+
 class TestAnalyzerResultHdf5(TestAnalyzerResultGoodType):
     """ test AnalyzerResult hdf5 serialize """
 
@@ -177,6 +193,131 @@ class TestAnalyzerResultHdf5(TestAnalyzerResultGoodType):
         self.assertEqual(results, res_hdf5)
 
 
+class TestAnalyzerResultHdf5Compressed(TestAnalyzerResultGoodType):
+    """ test AnalyzerResult compressed hdf5 serialize """
+
+    def tearDown(self):
+        results = AnalyzerResultContainer([self.result])
+        results.to_hdf5('/tmp/t.h5', compression='gzip', shuffle=True,
+                        chunks=(16, 16, 16))
+        res_hdf5 = results.from_hdf5('/tmp/t.h5')
+        self.assertEqual(results, res_hdf5)
+
+
+class TestAnalyzerResultHdf5Layout(unittest.TestCase):
+    """ test the layout of the AnalyzerResult hdf5 datasets """
+
+    def setUp(self):
+        self.result = AnalyzerResult.factory(data_mode='label',
+                                             time_mode='segment')
+        self.result.id_metadata.id = 'foo_bar'
+        self.result.data_object.label = [0, 1, 0]
+        self.result.data_object.time = [0., 1., 2.]
+        self.result.data_object.duration = [1., 1., 1.]
+        self.result.label_metadata.label = {0: 'Non Speech', 1: 'Speech'}
+        self.result.label_metadata.description = {1: u'Voix parl\xe9e'}
+
+    def testLabelMetadata(self):
+        "label metadata is read back"
+        results = AnalyzerResultContainer([self.result])
+        results.to_hdf5('/tmp/t.h5')
+        res_hdf5 = results.from_hdf5('/tmp/t.h5')
+        self.assertEqual(res_hdf5['foo_bar'].label_metadata,
+                         self.result.label_metadata)
+
+    def testResultOptions(self):
+        "dataset options are set per result"
+        results = AnalyzerResultContainer([self.result])
+        results.to_hdf5('/tmp/t.h5', compression='lzf',
+                        result_options={'foo_bar': {'compression': 'gzip',
+                                                    'compression_opts': 9}})
+        with h5py.File('/tmp/t.h5', 'r') as h5_file:
+            time = h5_file['foo_bar/data_object/time']
+            self.assertEqual(time.compression, 'gzip')
+            self.assertEqual(time.compression_opts, 9)
+
+    def testListOfListRepr(self):
+        "list of lists stored as a repr string is read back"
+        result = AnalyzerResult.factory(data_mode='value',
+                                        time_mode='global')
+        result.id_metadata.id = 'foo_bar'
+        results = AnalyzerResultContainer([result])
+        results.to_hdf5('/tmp/t.h5')
+        with h5py.File('/tmp/t.h5', 'r+') as h5_file:
+            del h5_file['foo_bar/data_object/value']
+            h5_file['foo_bar/data_object'].create_dataset(
+                'value', data=repr([[0, 1], [0, 1, 2]]),
+                dtype=h5py.special_dtype(vlen=str))
+        res_hdf5 = results.from_hdf5('/tmp/t.h5')
+        self.assertEqual(res_hdf5['foo_bar'].data_object.value.tolist(),
+                         [[0, 1], [0, 1, 2]])
+
+    def write_repr(self, text):
+        result = AnalyzerResult.factory(data_mode='value',
+                                        time_mode='global')
+        result.id_metadata.id = 'foo_bar'
+        results = AnalyzerResultContainer([result])
+        results.to_hdf5('/tmp/t.h5')
+        with h5py.File('/tmp/t.h5', 'r+') as h5_file:
+            del h5_file['foo_bar/data_object/value']
+            h5_file['foo_bar/data_object'].create_dataset(
+                'value', data=text, dtype=h5py.special_dtype(vlen=str))
+        return results.from_hdf5('/tmp/t.h5')['foo_bar'].data_object.value
+
+    def testLegacyRepr(self):
+        "repr strings of numpy arrays from previous files are read back"
+        value = self.write_repr(
+            repr([np.array([0., 1.], dtype='float32'), np.array([2.])]))
+        self.assertEqual([row.tolist() for row in value], [[0., 1.], [2.]])
+
+    def testLegacyReprScalars(self):
+        "repr strings of numpy scalars and typed arrays are read back"
+        from timeside.analyzer.h5tools import literal_eval
+        value = literal_eval("[float32(0.5), array([[1, 2]], dtype=int16), "
+                             "array(['a'], dtype='|S1')]", legacy=True)
+        self.assertEqual(value[0], 0.5)
+        self.assertEqual(value[0].dtype, np.float32)
+        self.assertEqual(value[1].dtype, np.int16)
+        self.assertEqual(value[1].tolist(), [[1, 2]])
+        self.assertEqual(value[2].tolist(), ['a'])
+
+    def testLegacyReprRestricted(self):
+        "repr strings from previous files cannot call any function"
+        for text in ["__import__('os').getcwd()",
+                     "().__class__.__bases__[0].__subclasses__()",
+                     "[array([1], dtype=float32).tofile('/tmp/t.bin')]",
+                     "array([1], dtype=__import__('os').getcwd())",
+                     "array(open('/etc/passwd'))",
+                     "getattr(array, 'tofile')"]:
+            self.assertRaises(ValueError, self.write_repr, text)
+
+    def testReprRestricted(self):
+        "repr strings of the current layout only hold literals"
+        from timeside.analyzer.h5tools import literal_eval
+        self.assertEqual(literal_eval('[-inf, (1, 2-3j), {None: True}]'),
+                         [float('-inf'), (1, 2-3j), {None: True}])
+        self.assertRaises(ValueError, literal_eval, 'array([1])')
+
+    def testNonFiniteRepr(self):
+        "lists holding non finite floats are read back"
+        result = AnalyzerResult.factory(data_mode='value',
+                                        time_mode='global')
+        result.id_metadata.id = 'foo_bar'
+        value = np.empty(2, dtype=object)
+        value[0] = [float('nan'), [1.]]
+        value[1] = [float('-inf')]
+        result.data_object.value = value
+        results = AnalyzerResultContainer([result])
+        results.to_hdf5('/tmp/t.h5')
+        with h5py.File('/tmp/t.h5', 'r') as h5_file:
+            self.assertEqual(h5_file['foo_bar/data_object/value']
+                             .attrs['repr_version'], 1)
+        value = results.from_hdf5('/tmp/t.h5')['foo_bar'].data_object.value
+        self.assertTrue(np.isnan(value[0][0]))
+        self.assertEqual(value[0][1], [1.])
+        self.assertEqual(value[1], [float('-inf')])
+
+
 class TestAnalyzerResultYaml(TestAnalyzerResultGoodType):
     """ test AnalyzerResult yaml serialize """
     def tearDown(self):
@@ -232,6 +373,16 @@ class TestAnalyzerResultJson(TestAnalyzerResultGoodType):
         self.assertEqual(d_json, results)
 
 
+class TestAnalyzerResultJsonStream(TestAnalyzerResultGoodType):
+    """ test AnalyzerResult streaming json serialize """
+    def tearDown(self):
+        import simplejson as json
+        results = AnalyzerResultContainer([self.result])
+        r_json = ''.join(results.iter_json(chunk_rows=1))
+        self.assertEqual(json.loads(r_json), json.loads(results.to_json()))
+        self.assertEqual(results.from_json(r_json), results)
+
+
 class TestAnalyzerResultAsDict(TestAnalyzerResultGoodType):
     """ test AnalyzerResult as Dictionnary"""
 
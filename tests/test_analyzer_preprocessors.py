@@ -21,11 +21,16 @@ class FakeAnalyzer(object):
         return frames, eod
 
 
+class FakeBatchAnalyzer(FakeAnalyzer):
+    def process_batch(self, frames_matrix, eod):
+        self.frames.extend(frames_matrix)
+
+
 class TestAnalyzerPreProcessors(unittest.TestCase):
 
     def tearDown(self):
 
-        analyzer = FakeAnalyzer()
+        analyzer = self.analyzer_class()
 
         process_output = []
         for frames, eod in zip(self.input_frames, self.input_eod):
@@ -44,6 +49,7 @@ class TestDownmixToMono(TestAnalyzerPreProcessors):
 
     def setUp(self):
         self.decorator = downmix_to_mono
+        self.analyzer_class = FakeAnalyzer
         # Decorate the process
         FakeAnalyzer.decorated_process = self.decorator(FakeAnalyzer.process)
 
@@ -90,6 +96,7 @@ class TestFramesAdapter(TestAnalyzerPreProcessors, unittest.TestCase):
 
     def setUp(self):
         self.decorator = frames_adapter
+        self.analyzer_class = FakeAnalyzer
         # Decorate the process
         FakeAnalyzer.decorated_process = self.decorator(FakeAnalyzer.process)
 
@@ -144,5 +151,15 @@ class TestFramesAdapter(TestAnalyzerPreProcessors, unittest.TestCase):
                                           np.arange(2560, 4608).reshape(-1, 2),
                                           last_frames])
 
+
+class TestFramesAdapterBatch(TestFramesAdapter):
+
+    def setUp(self):
+        self.decorator = frames_adapter
+        self.analyzer_class = FakeBatchAnalyzer
+        # Decorate the process
+        FakeBatchAnalyzer.decorated_process = self.decorator(
+            FakeBatchAnalyzer.process)
+
 if __name__ == '__main__':
     unittest.main(testRunner=TestRunner())
@@ -0,0 +1,61 @@
+#! /usr/bin/env python
+
+from unit_timeside import *
+from timeside.decoder.array import ArrayDecoder
+from timeside.analyzer.spectrogram import Spectrogram
+
+import numpy as np
+from scipy.signal import get_window
+
+
+class TestAnalyzerSpectrogram(unittest.TestCase):
+
+    "Test the spectrogram analyzer against a frame by frame FFT"
+
+    def setUp(self):
+        self.samplerate = 8000
+        self.source = np.random.randn(2 * self.samplerate)
+        self.blocksize = 1024
+        self.stepsize = 256
+        self.fft_size = 1024
+        self.window = 'boxcar'
+
+    def testDefault(self):
+        "Default parameters"
+
+    def testWindow(self):
+        "Hanning window"
+        self.window = 'hanning'
+
+    def testZeroPadding(self):
+        "FFT size larger than the blocksize"
+        self.fft_size = 4096
+
+    def tearDown(self):
+        decoder = ArrayDecoder(self.source, samplerate=self.samplerate)
+        spectrogram = Spectrogram(blocksize=self.blocksize,
+                                  stepsize=self.stepsize,
+                                  fft_size=self.fft_size,
+                                  window=self.window)
+        (decoder | spectrogram).run()
+        result = spectrogram.results['spectrogram_analyzer']
+        self.assertEqual(result.data.dtype, np.float32)
+
+        # Frame by frame reference, including the final zero padded frame
+        source = self.source.astype('float32')
+        nb_frames = (len(source) - self.blocksize) // self.stepsize + 2
+        padded = np.zeros((nb_frames - 1) * self.stepsize + self.blocksize)
+        padded[:len(source)] = source
+        window = get_window(self.window, self.blocksize)
+        expected = [np.abs(np.fft.rfft(
+            padded[i * self.stepsize:i * self.stepsize + self.blocksize] *
+            window, self.fft_size)) for i in range(nb_frames)]
+
+        self.assertEqual(result.data.shape,
+                         (nb_frames, self.fft_size // 2 + 1))
+        np.testing.assert_allclose(result.data, expected,
+                                   rtol=1e-4, atol=1e-3)
+
+
+if __name__ == '__main__':
+    unittest.main(testRunner=TestRunner())
@@ -0,0 +1,52 @@
+#! /usr/bin/env python
+
+from unit_timeside import *
+from timeside.decoder.array import ArrayDecoder
+from timeside.analyzer.waveform import Waveform
+import numpy as np
+
+
+class TestAnalyzerWaveform(unittest.TestCase):
+
+    def setUp(self):
+        self.samplerate = 8000
+        self.analyzer = Waveform()
+        self.decoder = ArrayDecoder(np.zeros(self.samplerate),
+                                    samplerate=self.samplerate)
+        self.pipe = self.decoder | self.analyzer
+
+    def waveform(self, blocks):
+        self.decoder.setup()
+        self.analyzer.source_mediainfo = self.decoder.mediainfo()
+        self.analyzer.setup(channels=blocks[0].shape[1],
+                            samplerate=self.samplerate,
+                            blocksize=len(blocks[0]),
+                            totalframes=sum(len(b) for b in blocks))
+        for index, block in enumerate(blocks):
+            self.analyzer.process(block, eod=index == len(blocks) - 1)
+        self.analyzer.post_process()
+        return self.analyzer.results['waveform_analyzer'].data
+
+    def testFloat64(self):
+        "float64 frames are kept in double precision"
+        blocks = [np.random.randn(1024, 2) for i in range(3)]
+        data = self.waveform(blocks)
+        self.assertEqual(data.dtype, np.float64)
+        np.testing.assert_array_equal(data, np.vstack(blocks))
+
+    def testFloat32(self):
+        "float32 frames are kept in single precision"
+        blocks = [np.random.randn(1024, 1).astype('float32')
+                  for i in range(2)]
+        data = self.waveform(blocks)
+        self.assertEqual(data.dtype, np.float32)
+        np.testing.assert_array_equal(data, np.vstack(blocks))
+
+    def testPipe(self):
+        "runs in a pipe"
+        self.pipe.run()
+        data = self.analyzer.results['waveform_analyzer'].data
+        self.assertEqual(data.shape, (self.samplerate, 1))
+
+if __name__ == '__main__':
+    unittest.main(testRunner=TestRunner())
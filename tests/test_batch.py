@@ -0,0 +1,57 @@
+#! /usr/bin/env python
+
+from unit_timeside import *
+from timeside.tools.batch import run_batch
+from timeside.decoder.array import ArrayDecoder
+from timeside.analyzer.level import Level
+
+import numpy as np
+
+
+class TestRunBatch(unittest.TestCase):
+
+    "Test the batch runner"
+
+    def setUp(self):
+        self.sources = [0.1, 0.2, 0.5, 0.8]
+        self.jobs = 2
+        self.ordered = True
+
+    def process(self, amplitude):
+        if amplitude > 0.6:
+            raise ValueError('too loud')
+        samplerate = 8000
+        decoder = ArrayDecoder(amplitude * np.ones(samplerate),
+                               samplerate=samplerate)
+        level = Level()
+        (decoder | level).run()
+        return float(level.results['level.max'].data_object.value)
+
+    def testParallel(self):
+        "Process sources in worker processes"
+
+    def testUnordered(self):
+        "Yield results as they are completed"
+        self.ordered = False
+
+    def testSingleJob(self):
+        "Process sources in the current process"
+        self.jobs = 1
+
+    def tearDown(self):
+        results = list(run_batch(self.process, self.sources,
+                                 jobs=self.jobs, ordered=self.ordered))
+        if self.ordered:
+            self.assertEqual([r[0] for r in results], self.sources)
+        self.assertEqual(sorted(r[0] for r in results), self.sources)
+        for source, value, error in results:
+            if source > 0.6:
+                self.assertIsNone(value)
+                self.assertIn('too loud', error)
+            else:
+                self.assertIsNone(error)
+                self.assertAlmostEqual(value, 20 * np.log10(source), 2)
+
+
+if __name__ == '__main__':
+    unittest.main(testRunner=TestRunner())
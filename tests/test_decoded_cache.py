@@ -0,0 +1,128 @@
+#! /usr/bin/env python
+
+from unit_timeside import *
+from timeside.decoder.cache import DecodedCache
+
+import numpy as np
+import tempfile
+import shutil
+import os
+
+
+class TestDecodedCache(unittest.TestCase):
+
+    "Test the on-disk cache of decoded audio"
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(suffix='-timeside')
+        self.cache = DecodedCache(self.cache_dir)
+        self.samplerate = 8000
+        self.frames = np.random.randn(self.samplerate, 2).astype('float32')
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def store(self, key, frames, blocksize=1000):
+        writer = self.cache.writer(key, channels=frames.shape[1])
+        for pos in range(0, len(frames), blocksize):
+            writer.append(frames[pos:pos + blocksize])
+        writer.commit(samplerate=self.samplerate)
+
+    def testKey(self):
+        "Cache keys depend on the format and on the segment"
+        key = self.cache.key('abc', 44100, 2)
+        self.assertEqual(key, self.cache.key('abc', 44100, 2, 0, None))
+        self.assertNotEqual(key, self.cache.key('abc', 22050, 2))
+        self.assertNotEqual(key, self.cache.key('abc', 44100, 1))
+        self.assertNotEqual(key, self.cache.key('abc', 44100, 2, 1.5, 2))
+
+    def testRoundTrip(self):
+        "Cached frames are read back unchanged"
+        key = self.cache.key('abc', self.samplerate, 2)
+        self.assertIsNone(self.cache.get(key))
+        self.store(key, self.frames)
+        frames, info = self.cache.get(key)
+        np.testing.assert_array_equal(frames, self.frames)
+        self.assertEqual(info['samplerate'], self.samplerate)
+        self.assertEqual(info['frames'], len(self.frames))
+
+    def testAbort(self):
+        "Aborted entries are not stored"
+        key = self.cache.key('abc', self.samplerate, 2)
+        writer = self.cache.writer(key, channels=2)
+        writer.append(self.frames)
+        writer.abort()
+        self.assertNotIn(key, self.cache)
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def testEviction(self):
+        "Least recently used entries are evicted"
+        self.cache.max_size = 2 * self.frames.nbytes
+        keys = [self.cache.key(sha1, self.samplerate, 2)
+                for sha1 in ['a', 'b', 'c']]
+        self.store(keys[0], self.frames)
+        self.store(keys[1], self.frames)
+        # Access the first entry so that the second is the oldest
+        os.utime(os.path.join(self.cache_dir, keys[1] + '.json'), (0, 0))
+        self.cache.get(keys[0])
+        self.store(keys[2], self.frames)
+        self.assertIn(keys[0], self.cache)
+        self.assertNotIn(keys[1], self.cache)
+        self.assertIn(keys[2], self.cache)
+        self.assertLessEqual(self.cache.size(), self.cache.max_size)
+
+    def testConcurrentWriters(self):
+        "Writers of the same key do not share their temporary file"
+        key = self.cache.key('abc', self.samplerate, 2)
+        writers = [self.cache.writer(key, channels=2) for n in range(3)]
+        self.assertEqual(len(set(writer.tmp_path for writer in writers)), 3)
+        for pos in range(0, len(self.frames), 1000):
+            for writer in writers:
+                writer.append(self.frames[pos:pos + 1000])
+        writers[0].abort()
+        writers[1].commit(samplerate=self.samplerate)
+        writers[2].commit(samplerate=self.samplerate)
+        frames, info = self.cache.get(key)
+        np.testing.assert_array_equal(frames, self.frames)
+        self.assertEqual(sorted(os.listdir(self.cache_dir)),
+                         [key + '.f32', key + '.json'])
+
+
+class TestFileDecoderCache(unittest.TestCase):
+
+    "Test the decoding through the on-disk cache"
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(suffix='-timeside')
+        self.source = os.path.join(os.path.dirname(__file__),
+                                   "samples", "sweep.wav")
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def decode(self, **kwargs):
+        from timeside.decoder.file import FileDecoder
+        from timeside.analyzer.level import Level
+        decoder = FileDecoder(self.source, cache=self.cache_dir, **kwargs)
+        pipe = decoder | Level()
+        pipe.run()
+        return decoder
+
+    def testKey(self):
+        "The whole media has the same key with or without its duration"
+        decoder = self.decode()
+        self.assertFalse(decoder.from_cache)
+        self.assertTrue(self.decode().from_cache)
+        self.assertTrue(
+            self.decode(duration=decoder.uri_total_duration).from_cache)
+
+    def testStop(self):
+        "Stopping a decoder reading from the cache does nothing"
+        self.decode()
+        decoder = self.decode()
+        self.assertTrue(decoder.from_cache)
+        decoder.stop()
+
+
+if __name__ == '__main__':
+    unittest.main(testRunner=TestRunner())
@@ -7,6 +7,8 @@ from __future__ import division
 from numpy import arange, sin
 from unit_timeside import *
 from timeside.decoder.utils import get_uri, get_media_uri_info, path2uri
+from timeside.decoder.utils import BlockBuffer, FramesStack
+import numpy as np
 import os.path
 
 
@@ -107,5 +109,72 @@ class TestGetMediaInfo(unittest.TestCase):
         self.assertEqual(self.expected_samplerate, uri_info['streams'][0]['samplerate'])
         self.assertEqual(self.expected_depth, uri_info['streams'][0]['depth'])
 
+class TestBlockBuffer(unittest.TestCase):
+    "Test BlockBuffer cutting of frames into blocks"
+
+    def setUp(self):
+        self.blocksize = 1024
+        self.channels = 2
+        self.source = np.random.randn(10000, self.channels).astype('float32')
+
+    def testSmallBuffers(self):
+        "Incoming buffers smaller than the blocksize"
+        self.buffersize = 100
+
+    def testLargeBuffers(self):
+        "Incoming buffers larger than the blocksize"
+        self.buffersize = 3000
+
+    def testAlignedBuffers(self):
+        "Incoming buffers aligned on the blocksize"
+        self.buffersize = 2 * self.blocksize
+
+    def tearDown(self):
+        block_buffer = BlockBuffer(self.blocksize, self.channels)
+        blocks = []
+        for pos in range(0, len(self.source), self.buffersize):
+            blocks.extend(
+                block_buffer.push(self.source[pos:pos + self.buffersize]))
+        for block in blocks:
+            self.assertEqual(block.shape, (self.blocksize, self.channels))
+        last_block = block_buffer.flush()
+        self.assertEqual(len(last_block),
+                         len(self.source) % self.blocksize)
+        np.testing.assert_array_equal(np.vstack(blocks + [last_block]),
+                                      self.source)
+
+
+class TestFramesStack(unittest.TestCase):
+    "Test FramesStack storage of the decoded blocks"
+
+    def setUp(self):
+        self.blocks = [(np.random.randn(1024, 2), False),
+                       (np.random.randn(1024, 2), False),
+                       (np.random.randn(100, 2), True)]
+        self.frames_stack = FramesStack()
+
+    def testReplay(self):
+        "Blocks are replayed unchanged"
+        for block in self.blocks[:2]:
+            self.frames_stack.append(block)
+        # Replay while the stack is still growing
+        self.assertEqual(self.frames_stack[0][0].shape, (1024, 2))
+        self.frames_stack.append(self.blocks[2])
+
+    def testLength(self):
+        "Stack length is the number of blocks"
+        for block in self.blocks:
+            self.frames_stack.append(block)
+
+    def tearDown(self):
+        self.assertEqual(len(self.frames_stack), len(self.blocks))
+        for (frames, eod), (expected_frames, expected_eod) in zip(
+                self.frames_stack, self.blocks):
+            self.assertEqual(eod, expected_eod)
+            np.testing.assert_allclose(frames, expected_frames, rtol=1e-6)
+        self.assertEqual(self.frames_stack.frames.shape, (2148, 2))
+        self.frames_stack.close()
+
+
 if __name__ == '__main__':
     unittest.main(testRunner=TestRunner())
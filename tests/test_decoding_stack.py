@@ -5,6 +5,7 @@ from __future__ import division
 from timeside.decoder.file import FileDecoder
 from timeside.analyzer.level import Level
 from timeside.core import ProcessPipe
+from timeside.decoder.utils import FramesStack
 from unit_timeside import *
 
 import os.path
@@ -20,6 +21,8 @@ class TestDecodingFromStack(unittest.TestCase):
         self.samplerate, self.channels, self.blocksize = None, None, None
         self.start = 0
         self.duration = None
+        self.stack = True
+        self.stack_type = list
 
         self.expected_samplerate = 44100
         self.expected_channels = 2
@@ -35,7 +38,7 @@ class TestDecodingFromStack(unittest.TestCase):
         decoder = FileDecoder(uri=self.source,
                               start=self.start,
                               duration=self.duration,
-                              stack=True)
+                              stack=self.stack)
         self.assertTrue(decoder.stack)
         self.assertFalse(decoder.from_stack)
 
@@ -56,13 +59,13 @@ class TestDecodingFromStack(unittest.TestCase):
         decoder = FileDecoder(uri=self.source,
                               start=self.start,
                               duration=self.duration,
-                              stack=True)
+                              stack=self.stack)
         level_on_file = Level()
         pipe = (decoder | level_on_file)
 
         pipe.run()
 
-        self.assertIsInstance(pipe.frames_stack, list)
+        self.assertIsInstance(pipe.frames_stack, self.stack_type)
 
         results_on_file = pipe.results['level.rms'].data.copy()
 
@@ -83,5 +86,14 @@ class TestDecodingFromStack(unittest.TestCase):
                          results_on_file)
 
 
+class TestDecodingFromMmapStack(TestDecodingFromStack):
+    "Test decoder stack stored in a memory-mapped file"
+
+    def setUp(self):
+        super(TestDecodingFromMmapStack, self).setUp()
+        self.stack = 'mmap'
+        self.stack_type = FramesStack
+
+
 if __name__ == '__main__':
     unittest.main(testRunner=TestRunner())
@@ -247,5 +247,78 @@ class TestEncodingOverwriteForced(unittest.TestCase):
         super(TestEncodingOverwriteForced, self).tearDown()
 
 
+class TestMultiEncoding(unittest.TestCase):
+    "Test encoding to several files with a single pipeline"
+
+    def setUp(self):
+        from timeside.encoder.wav import WavEncoder
+        from timeside.encoder.flac import FlacEncoder
+        from timeside.encoder.ogg import VorbisEncoder
+        self.samplerate = 44100
+        self.source_duration = 5.
+        self.encoders = []
+        for encoder_function in [WavEncoder, FlacEncoder, VorbisEncoder]:
+            sink = tmp_file_sink(prefix=self.__class__.__name__,
+                                 suffix='.' + encoder_function.file_extension())
+            self.encoders.append(encoder_function(sink, overwrite=True))
+
+    def tearDown(self):
+        for encoder in self.encoders:
+            if os.path.exists(encoder.filename):
+                os.unlink(encoder.filename)
+
+    def testMultiEncoder(self):
+        "Every output is encoded"
+        from timeside.encoder.multi import MultiEncoder
+        t = np.arange(int(self.source_duration * self.samplerate))
+        source = .75 * np.sin(2 * pi * 440. * t / self.samplerate)
+        decoder = ArrayDecoder(source[:, np.newaxis],
+                               samplerate=self.samplerate)
+        encoder = MultiEncoder(self.encoders)
+        (decoder | encoder).run()
+        self.assertEqual(encoder.num_samples, len(t))
+        for sub_encoder in self.encoders:
+            media_info = get_media_uri_info(get_uri(sub_encoder.filename))
+            self.assertAlmostEqual(self.source_duration,
+                                   media_info['duration'], delta=0.1)
+
+    def testBranchEncoders(self):
+        "Encoders which can not be branched run in their own pipeline"
+        from timeside.encoder.multi import MultiEncoder, branch_encoders
+        from timeside.encoder.webm import WebMEncoder
+        sink = tmp_file_sink(prefix=self.__class__.__name__, suffix='.webm')
+        video_encoder = WebMEncoder(sink, overwrite=True, video=True)
+        self.encoders.append(video_encoder)
+        processors = branch_encoders(self.encoders)
+        self.assertEqual(len(processors), 2)
+        self.assertTrue(isinstance(processors[0], MultiEncoder))
+        self.assertEqual(processors[0].encoders, self.encoders[:-1])
+        self.assertTrue(processors[1] is video_encoder)
+        self.assertRaises(ValueError, MultiEncoder, self.encoders)
+
+        t = np.arange(int(self.source_duration * self.samplerate))
+        source = .75 * np.sin(2 * pi * 440. * t / self.samplerate)
+        pipe = ArrayDecoder(source[:, np.newaxis], samplerate=self.samplerate)
+        for processor in processors:
+            pipe = pipe | processor
+        pipe.run()
+        for encoder in self.encoders:
+            self.assertTrue(os.path.getsize(encoder.filename) > 0)
+
+    def testHidden(self):
+        "MultiEncoder is not listed with the encoders"
+        import timeside.core
+        import timeside.encoder.multi
+        ids = [proc.id() for proc in timeside.core.processors()]
+        self.assertFalse('gst_multi_enc' in ids)
+
+    def testStreamingEncoder(self):
+        "Streaming encoders are not supported"
+        from timeside.encoder.multi import MultiEncoder
+        from timeside.encoder.mp3 import Mp3Encoder
+        self.assertRaises(ValueError, MultiEncoder,
+                          [Mp3Encoder(None, streaming=True)])
+
+
 if __name__ == '__main__':
     unittest.main(testRunner=TestRunner())
@@ -0,0 +1,207 @@
+#! /usr/bin/env python
+
+from unit_timeside import unittest, TestRunner
+from timeside.decoder.array import ArrayDecoder
+from timeside.grapher.core import Spectrum
+from timeside.grapher.utils import ColumnRaster
+from timeside.grapher.waveform_simple import Waveform
+from timeside.grapher.waveform_contour import WaveformContourBlack
+from timeside.grapher.spectrogram_log import SpectrogramLog
+from timeside.grapher.spectrogram_lin import SpectrogramLinear
+from timeside.grapher.waveform_centroid import WaveformCentroid
+from timeside.grapher.pixels import PixelBuckets
+from timeside.grapher.utils import peaks, peaks_batch, scale_centroids
+
+from PIL import Image
+import numpy as np
+
+
+class TestColumnRaster(unittest.TestCase):
+
+    "Test the vectorized drawing of spans"
+
+    def setUp(self):
+        self.image = Image.new('RGBA', (4, 8), (0, 0, 0, 255))
+
+    def testSpans(self):
+        "Spans are drawn in their column, the last one on top"
+        raster = ColumnRaster()
+        raster.add_span(1, 2, 5, (255, 0, 0))
+        raster.add_span(1, 4, 6, (0, 255, 0))
+        raster.add_spans([0, 3], [0, 7], [7, 7], (0, 0, 255))
+        pixels = np.asarray(raster.draw(self.image))
+        np.testing.assert_array_equal(pixels[2:4, 1], [[255, 0, 0, 255]] * 2)
+        np.testing.assert_array_equal(pixels[4:7, 1], [[0, 255, 0, 255]] * 3)
+        np.testing.assert_array_equal(pixels[:, 0, 2], [255] * 8)
+        np.testing.assert_array_equal(pixels[:, 3, 2], [0] * 7 + [255])
+        np.testing.assert_array_equal(pixels[:, 2], [[0, 0, 0, 255]] * 8)
+        self.assertEqual(len(raster), 0)
+
+    def testClipping(self):
+        "Spans and colors out of the image are clipped"
+        raster = ColumnRaster()
+        raster.add_span(0, -3, 20, (256, 0, 0))
+        raster.add_span(5, 0, 7, (255, 0, 0))
+        pixels = np.asarray(raster.draw(self.image))
+        np.testing.assert_array_equal(pixels[:, 0, 0], [255] * 8)
+        np.testing.assert_array_equal(pixels[:, 1:, 0], 0)
+
+    def testAntiAlias(self):
+        "Span ends are blended according to their fractional part"
+        raster = ColumnRaster()
+        raster.anti_alias(np.array([0, 2]), np.array([2.5, 1.]),
+                          np.array([4.25, 1.]), (200, 200, 200))
+        pixels = np.asarray(raster.draw(self.image))
+        self.assertEqual(pixels[5, 0, 0], 50)
+        self.assertEqual(pixels[1, 0, 0], 100)
+        np.testing.assert_array_equal(pixels[:, 2, 0], 0)
+
+
+class TestWaveformRaster(unittest.TestCase):
+
+    "Test the rendering of waveforms"
+
+    def setUp(self):
+        samplerate = 44100
+        self.source = np.sin(np.linspace(0, 2000, 2 * samplerate)) * 0.5
+        self.samplerate = samplerate
+
+    def render(self, grapher):
+        decoder = ArrayDecoder(self.source, samplerate=self.samplerate)
+        (decoder | grapher).run()
+        return np.asarray(grapher.render().convert('RGB'))
+
+    def testWaveform(self):
+        "Peaks are drawn around the middle of the image"
+        pixels = self.render(Waveform(width=200, height=100))
+        background = np.all(pixels == pixels[0, 0], axis=-1)
+        self.assertTrue(background[:20].all())
+        self.assertTrue(background[-20:].all())
+        self.assertFalse(background[30:70].all(axis=0).any())
+
+    def testContour(self):
+        "The contour curve is drawn in every column"
+        pixels = self.render(WaveformContourBlack(width=200, height=100))
+        background = np.all(pixels == pixels[0, 0], axis=-1)
+        self.assertFalse(background.all(axis=0).any())
+
+
+class TestSpectrogramPixels(unittest.TestCase):
+
+    "Test the mapping of spectra to the rows of the spectrograms"
+
+    def check_spectra(self, grapher):
+        grapher.setup(1, 44100, 1024, 44100 * 10)
+        spectra = np.random.rand(5, grapher.fft_size / 2 + 1)
+        grapher.draw_spectra(grapher.image_width - 3, spectra)
+        for column, spectrum in enumerate(spectra[:3]):
+            expected = [int((255 - alpha) * spectrum[index] +
+                            alpha * spectrum[index + 1])
+                        for index, alpha in zip(grapher.bin_index,
+                                                grapher.bin_weights[1])]
+            np.testing.assert_array_equal(
+                grapher.spectrogram[grapher.image_width - 3 + column,
+                                    :len(expected)], expected)
+        grapher.post_process()
+        image = np.asarray(grapher.image)
+        self.assertEqual(image.shape, (grapher.image_height,
+                                       grapher.image_width))
+        np.testing.assert_array_equal(image[::-1, -1],
+                                      grapher.spectrogram[-1])
+
+    def testLog(self):
+        "Rows of the log spectrogram"
+        self.check_spectra(SpectrogramLog(width=100, height=64))
+
+    def testLinear(self):
+        "Rows of the linear spectrogram"
+        self.check_spectra(SpectrogramLinear(width=100, height=64))
+
+
+class TestSpectrum(unittest.TestCase):
+
+    "Test the batched spectral analysis of the pixel buffers"
+
+    def setUp(self):
+        self.spectrum = Spectrum(4096, 44100, 1024, 44100 * 10, 100, 22050,
+                                 np.hanning)
+
+    def testBatch(self):
+        "Buffers analyzed at once or one by one give the same spectra"
+        buffers = np.random.randn(6, 431)
+        expected = buffers.copy()
+        centroids, db_spectra = self.spectrum.analyze_batch(buffers)
+        centroids = self.spectrum.scale_centroids(centroids)
+        np.testing.assert_array_equal(buffers, expected)
+        self.assertEqual(db_spectra.shape, (6, 2049))
+        for index, samples in enumerate(buffers):
+            centroid, db_spectrum = self.spectrum.process(
+                samples[:, np.newaxis], False)
+            self.assertAlmostEqual(centroid, centroids[index])
+            np.testing.assert_allclose(db_spectrum, db_spectra[index])
+
+    def testSTFT(self):
+        "Spectra of the windowed buffers padded up to the FFT size"
+        buffers = np.random.randn(4, 431)
+        centroids, db_spectra = self.spectrum.analyze_batch(buffers)
+        spectra = np.abs(np.fft.rfft(buffers * np.hanning(431), 4096,
+                                     axis=1)) / 431.
+        expected = ((20 * np.log10(spectra + 1e-30)).clip(-120, 0) +
+                    120) / 120
+        np.testing.assert_allclose(db_spectra, expected)
+        self.assertEqual(self.spectrum.stfts.keys(), [(431, 4096)])
+
+    def testBuffers(self):
+        "Buffers of different sizes and silent buffers"
+        buffers = list(np.random.randn(3, 431)) + [np.zeros(200)]
+        centroids, db_spectra = self.spectrum.analyze_buffers(buffers)
+        self.assertEqual(len(centroids), 4)
+        self.assertEqual(centroids[-1], 0)
+        centroids = scale_centroids(centroids, 100, 22050)
+        self.assertTrue(np.all((centroids >= 0) & (centroids <= 1)))
+
+
+class TestPixelBuckets(unittest.TestCase):
+
+    "Test the pixel columns frontend shared by the graphers"
+
+    def setUp(self):
+        samplerate = 44100
+        self.source = np.random.randn(2 * samplerate)
+        self.samplerate = samplerate
+
+    def decoder(self):
+        return ArrayDecoder(self.source, samplerate=self.samplerate)
+
+    def render(self, *graphers):
+        pipe = self.decoder()
+        for grapher in graphers:
+            pipe = pipe | grapher
+        buckets = [item for item in pipe.processors
+                   if isinstance(item, PixelBuckets)]
+        pipe.run()
+        return buckets, [np.asarray(grapher.render()) for grapher in graphers]
+
+    def testPeaksBatch(self):
+        "Peaks of the rows of a matrix"
+        samples = np.random.randn(10, 50)
+        np.testing.assert_array_equal(peaks_batch(samples),
+                                      [peaks(row) for row in samples])
+
+    def testShared(self):
+        "Graphers of the same width share their frontend"
+        graphers = [Waveform(width=200, height=50),
+                    WaveformCentroid(width=200, height=100),
+                    WaveformContourBlack(width=200, height=50),
+                    SpectrogramLog(width=200, height=50),
+                    SpectrogramLinear(width=100, height=50)]
+        buckets, images = self.render(*graphers)
+        self.assertEqual(sorted(item.width for item in buckets), [100, 200])
+        for grapher, image in zip(graphers, images):
+            buckets, expected = self.render(type(grapher)(
+                width=grapher.image_width, height=grapher.image_height))
+            np.testing.assert_array_equal(image, expected[0])
+
+
+if __name__ == '__main__':
+    unittest.main(testRunner=TestRunner())
@@ -0,0 +1,220 @@
+#! /usr/bin/env python
+
+from unit_timeside import unittest, TestRunner
+from timeside.decoder.array import ArrayDecoder
+from timeside.analyzer.core import AnalyzerResultContainer
+from timeside.analyzer.h5tools import DatasetAccumulator
+from timeside.analyzer.spectrogram import Spectrogram
+from timeside.analyzer.waveform import Waveform
+from timeside.analyzer.level import Level
+from timeside.analyzer.odf import OnsetDetectionFunction
+
+import os
+import tempfile
+import h5py
+import numpy as np
+
+
+class TestDatasetAccumulator(unittest.TestCase):
+
+    "Test DatasetAccumulator"
+
+    def setUp(self):
+        fd, self.h5_path = tempfile.mkstemp(suffix='.h5')
+        os.close(fd)
+        self.h5_file = h5py.File(self.h5_path, 'w')
+
+    def tearDown(self):
+        self.h5_file.close()
+        os.remove(self.h5_path)
+
+    def testAppendExtend(self):
+        "Rows are written across several chunks"
+        acc = DatasetAccumulator(self.h5_file, 'values', shape=(3,))
+        acc.chunk_rows = 4
+        acc._buffer = acc._buffer[:4]
+        expected = np.arange(30.).reshape(10, 3)
+        acc.append(expected[0])
+        acc.extend(expected[1:9])
+        acc.append(expected[9])
+        self.assertEqual(len(acc), 10)
+        self.assertIsInstance(acc.data, h5py.Dataset)
+        np.testing.assert_array_equal(acc.data[...], expected)
+
+    def testEmpty(self):
+        "An empty accumulator gives an empty dataset"
+        acc = DatasetAccumulator(self.h5_file, 'values', dtype='float32')
+        self.assertEqual(acc.data.shape, (0,))
+        self.assertEqual(acc.data.dtype, np.dtype('float32'))
+
+
+class TestStreamToHdf5(unittest.TestCase):
+
+    "Test the streaming of framewise results to a HDF5 file"
+
+    def setUp(self):
+        samplerate = 44100
+        self.source = np.random.randn(3 * samplerate, 2)
+        self.samplerate = samplerate
+        fd, self.h5_path = tempfile.mkstemp(suffix='.h5')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.h5_path)
+
+    def run_pipe(self, stream=False):
+        decoder = ArrayDecoder(self.source, samplerate=self.samplerate)
+        pipe = (decoder | Level() | Waveform() | Spectrogram() |
+                OnsetDetectionFunction())
+        if stream:
+            pipe.results.stream_to_hdf5(self.h5_path)
+        pipe.run()
+        return pipe.results
+
+    def testStreamedResults(self):
+        "Streamed results are the same as in-memory results"
+        expected = self.run_pipe()
+        results = self.run_pipe(stream=True)
+        self.assertIsInstance(results['spectrogram_analyzer'].data,
+                              h5py.Dataset)
+        self.assertIsInstance(results['waveform_analyzer'].data,
+                              h5py.Dataset)
+        results.to_hdf5(self.h5_path)
+
+        self.assertEqual(sorted(results.keys()), sorted(expected.keys()))
+        for key in expected:
+            np.testing.assert_array_equal(results[key].data,
+                                          expected[key].data)
+
+        from_file = AnalyzerResultContainer().from_hdf5(self.h5_path)
+        self.assertEqual(sorted(from_file.keys()), sorted(expected.keys()))
+        for key in expected:
+            self.assertEqual(from_file[key].id_metadata,
+                             results[key].id_metadata)
+            np.testing.assert_array_equal(from_file[key].data,
+                                          expected[key].data)
+
+    def testNoStreamGroup(self):
+        "The temporary datasets are not left in the file"
+        results = self.run_pipe(stream=True)
+        results.to_hdf5(self.h5_path)
+        with h5py.File(self.h5_path, 'r') as h5_file:
+            self.assertNotIn('_stream', h5_file)
+            self.assertIn('spectrogram_analyzer', h5_file)
+
+    def testWriteTwice(self):
+        "Streamed results can be written again, to the same or another file"
+        results = self.run_pipe(stream=True)
+        results.to_hdf5(self.h5_path)
+        results.to_hdf5(self.h5_path, pyramids=True)
+        fd, other_path = tempfile.mkstemp(suffix='.h5')
+        os.close(fd)
+        try:
+            results.to_hdf5(other_path)
+            for path in [self.h5_path, other_path]:
+                from_file = AnalyzerResultContainer.from_hdf5(path)
+                self.assertEqual(sorted(from_file.keys()),
+                                 sorted(results.keys()))
+                for key in results:
+                    np.testing.assert_array_equal(from_file[key].data,
+                                                  results[key].data)
+        finally:
+            os.remove(other_path)
+        results.close()
+        self.assertIsNone(results._h5_sink)
+
+    def testUnwrittenSink(self):
+        "The file of results never written is removed when closed"
+        results = self.run_pipe(stream=True)
+        results.close()
+        self.assertFalse(os.path.exists(self.h5_path))
+        open(self.h5_path, 'w').close()
+
+    def testCollectedSink(self):
+        "The file of results is only removed by an explicit close"
+        import gc
+        self.run_pipe(stream=True)
+        gc.collect()
+        self.assertTrue(os.path.exists(self.h5_path))
+
+    def testContextManager(self):
+        "The container closes its files on exit"
+        with self.run_pipe(stream=True) as results:
+            self.assertIsNotNone(results._h5_sink)
+        self.assertIsNone(results._h5_sink)
+        self.assertFalse(os.path.exists(self.h5_path))
+        open(self.h5_path, 'w').close()
+
+
+class TestLazyHdf5(unittest.TestCase):
+
+    "Test the lazy loading and time slicing of results from a HDF5 file"
+
+    def setUp(self):
+        samplerate = 44100
+        self.source = np.random.randn(3 * samplerate, 2)
+        decoder = ArrayDecoder(self.source, samplerate=samplerate)
+        pipe = decoder | Level() | Spectrogram()
+        pipe.run()
+        self.results = pipe.results
+        fd, self.h5_path = tempfile.mkstemp(suffix='.h5')
+        os.close(fd)
+        self.results.to_hdf5(self.h5_path)
+
+    def tearDown(self):
+        os.remove(self.h5_path)
+
+    def testLazy(self):
+        "Lazy results are backed by the datasets of the file"
+        results = AnalyzerResultContainer.from_hdf5(self.h5_path, lazy=True)
+        spectrogram = results['spectrogram_analyzer']
+        self.assertIsInstance(spectrogram.data, h5py.Dataset)
+        np.testing.assert_array_equal(
+            spectrogram.data, self.results['spectrogram_analyzer'].data)
+        np.testing.assert_array_equal(results['level.rms'].data,
+                                      self.results['level.rms'].data)
+        results.close()
+
+    def testCollectedContainer(self):
+        "Lazy results stay readable after their container is collected"
+        import gc
+        spectrogram = AnalyzerResultContainer.from_hdf5(
+            self.h5_path, lazy=True)['spectrogram_analyzer']
+        gc.collect()
+        np.testing.assert_array_equal(
+            spectrogram.data[:2],
+            self.results['spectrogram_analyzer'].data[:2])
+        spectrogram._h5_file.close()
+
+    def testFramewiseSlice(self):
+        "Frames between two times are read"
+        results = AnalyzerResultContainer.from_hdf5(self.h5_path, lazy=True)
+        part = results.time_slice(1., 2.)
+        spectrogram = self.results['spectrogram_analyzer']
+        mask = (spectrogram.time >= 1.) & (spectrogram.time < 2.)
+        np.testing.assert_array_equal(part['spectrogram_analyzer'].data,
+                                      spectrogram.data[mask])
+        np.testing.assert_allclose(part['spectrogram_analyzer'].time,
+                                   spectrogram.time[mask])
+        results.close()
+
+    def testSegmentSlice(self):
+        "Segments overlapping the time range are read"
+        from timeside.analyzer.core import AnalyzerResult
+        result = AnalyzerResult.factory(data_mode='label',
+                                        time_mode='segment')
+        result.id_metadata.id = 'segments'
+        result.audio_metadata.start = 0
+        result.data_object.label = [0, 1, 0, 1]
+        result.data_object.time = [0., 1., 2., 3.]
+        result.data_object.duration = [1., 1., 1., 1.]
+        AnalyzerResultContainer([result]).to_hdf5(self.h5_path)
+        results = AnalyzerResultContainer.from_hdf5(self.h5_path, lazy=True)
+        part = results['segments'].time_slice(1.5, 3.)
+        np.testing.assert_array_equal(part.data, [1, 0])
+        np.testing.assert_array_equal(part.time, [1., 2.])
+        results.close()
+
+
+if __name__ == '__main__':
+    unittest.main(testRunner=TestRunner())
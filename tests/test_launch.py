@@ -0,0 +1,49 @@
+#! /usr/bin/env python
+
+from unit_timeside import *
+from timeside.analyzer.core import AnalyzerResultContainer
+import imp
+import os
+import shutil
+import sys
+import tempfile
+
+LAUNCHER = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        '..', 'scripts', 'timeside-launch')
+
+
+class TestLaunchOptions(unittest.TestCase):
+
+    "Test the options of timeside-launch"
+
+    def setUp(self):
+        self.launch = imp.load_source('timeside_launch', LAUNCHER)
+        self.outputdir = tempfile.mkdtemp()
+        self.argv = sys.argv
+
+    def tearDown(self):
+        sys.argv = self.argv
+        shutil.rmtree(self.outputdir)
+
+    def parse_args(self, *args):
+        sys.argv = ['timeside-launch', '-o', self.outputdir] + list(args)
+        return self.launch.parse_args()
+
+    def testResultsFormats(self):
+        "Every results format is saved by the results container"
+        options, args = self.parse_args('-R', 'json,yaml,xml,hdf5,npz',
+                                        'file.wav')
+        self.assertEqual(options.r_formats,
+                         ['json', 'yaml', 'xml', 'hdf5', 'npz'])
+        self.assertEqual(args, ['file.wav'])
+        for f in options.r_formats:
+            self.assertTrue(hasattr(AnalyzerResultContainer, 'to_' + f))
+
+    def testUnknownResultsFormat(self):
+        "Unknown results formats are rejected"
+        self.assertRaises(ValueError, self.parse_args, '-R', 'npy',
+                          'file.wav')
+
+
+if __name__ == '__main__':
+    unittest.main(testRunner=TestRunner())
@@ -31,6 +31,14 @@ class TestListCoreProcessors(unittest.TestCase):
         procs = timeside.core.processors(timeside.api.IGrapher)
         self.assertNotEquals(len(procs), 0)
 
+    def testHidesFrontends(self):
+        "does not list the frontends shared by the processors"
+        import timeside.analyzer.stft
+        import timeside.grapher.pixels
+        ids = [proc.id() for proc in timeside.core.processors()]
+        self.assertFalse('stft' in ids)
+        self.assertFalse('grapher_pixels' in ids)
+
 
 if __name__ == '__main__':
     unittest.main(testRunner=TestRunner())
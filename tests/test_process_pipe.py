@@ -0,0 +1,320 @@
+#! /usr/bin/env python
+
+from unit_timeside import *
+from timeside.core import Processor
+from timeside.decoder.array import ArrayDecoder
+from timeside.analyzer.level import Level
+from timeside.analyzer.dc import MeanDCShift
+from timeside.analyzer.spectrogram import Spectrogram
+from timeside.analyzer.stft import STFT
+from timeside.analyzer.odf import OnsetDetectionFunction
+
+import numpy as np
+import Queue
+import threading
+import time
+
+
+class TestProcessPipeWorkers(unittest.TestCase):
+
+    "Test ProcessPipe.run() with a pool of workers"
+
+    def setUp(self):
+        samplerate = 44100
+        self.source = np.random.randn(4 * samplerate, 2)
+        self.samplerate = samplerate
+
+    def run_pipe(self, workers=None):
+        decoder = ArrayDecoder(self.source, samplerate=self.samplerate)
+        pipe = decoder | Level() | MeanDCShift() | Spectrogram()
+        pipe.run(workers=workers)
+        return pipe.results
+
+    def testSameResults(self):
+        "Parallel run gives the same results as a sequential run"
+        expected = self.run_pipe()
+        results = self.run_pipe(workers=3)
+        self.assertEqual(sorted(results.keys()), sorted(expected.keys()))
+        for key in expected:
+            np.testing.assert_array_equal(results[key].data,
+                                          expected[key].data)
+
+    def testSingleWorker(self):
+        "Run with a single worker"
+        expected = self.run_pipe()
+        results = self.run_pipe(workers=1)
+        for key in expected:
+            np.testing.assert_array_equal(results[key].data,
+                                          expected[key].data)
+
+
+class TestSharedParents(unittest.TestCase):
+
+    "Test the sharing of equivalent parents in a pipe"
+
+    def setUp(self):
+        samplerate = 44100
+        self.decoder = ArrayDecoder(np.random.randn(2 * samplerate),
+                                    samplerate=samplerate)
+
+    def stft_processors(self, pipe):
+        return [item for item in pipe.processors if isinstance(item, STFT)]
+
+    def testSameSTFT(self):
+        "Analyzers with the same STFT parameters share one STFT"
+        spectrogram = Spectrogram(blocksize=1024, stepsize=512)
+        odf = OnsetDetectionFunction(blocksize=1024, stepsize=512)
+        pipe = self.decoder | spectrogram | odf
+        stft = self.stft_processors(pipe)
+        self.assertEqual(len(stft), 1)
+        self.assertIs(spectrogram.stft, stft[0])
+        self.assertIs(odf.parents[0].stft, stft[0])
+        pipe.run()
+        self.assertIn('odf', pipe.results)
+
+    def testDifferentSTFT(self):
+        "Analyzers with different STFT parameters do not share their STFT"
+        pipe = (self.decoder | Spectrogram(blocksize=1024) |
+                Spectrogram(blocksize=1024, window='hanning'))
+        self.assertEqual(len(self.stft_processors(pipe)), 2)
+
+    def testWindowArray(self):
+        "A window given as samples is equivalent to the same named window"
+        from scipy.signal import get_window
+        stft = STFT(blocksize=1024, window='hann')
+        self.assertTrue(stft.equivalent(
+            STFT(blocksize=1024, window=get_window('hann', 1024))))
+        self.assertFalse(stft.equivalent(
+            STFT(blocksize=1024, window=np.hanning(1024))))
+        self.assertFalse(stft.equivalent(STFT(blocksize=1024)))
+
+    def testParallelSharedSTFT(self):
+        "Shared STFT is processed before its children in a parallel run"
+        spectrogram = Spectrogram(blocksize=1024, stepsize=512)
+        pipe = self.decoder | spectrogram
+        pipe.run()
+        expected = spectrogram.results['spectrogram_analyzer'].data.copy()
+
+        spectrogram = Spectrogram(blocksize=1024, stepsize=512)
+        pipe = (self.decoder | spectrogram |
+                OnsetDetectionFunction(blocksize=1024, stepsize=512))
+        pipe.run(workers=4)
+        np.testing.assert_array_equal(
+            spectrogram.results['spectrogram_analyzer'].data, expected)
+
+
+class TestEquivalentParents(unittest.TestCase):
+
+    "Test the deduplication of equivalent parents in a pipe"
+
+    def setUp(self):
+        samplerate = 44100
+        self.decoder = ArrayDecoder(np.random.randn(2 * samplerate),
+                                    samplerate=samplerate)
+
+    def count(self, pipe, processor_class):
+        return len([item for item in pipe.processors
+                    if isinstance(item, processor_class)])
+
+    def testEquivalent(self):
+        "Processors constructed with the same arguments are equivalent"
+        odf = OnsetDetectionFunction()
+        self.assertTrue(odf.equivalent(OnsetDetectionFunction(blocksize=1024)))
+        self.assertFalse(odf.equivalent(OnsetDetectionFunction(blocksize=2048)))
+        self.assertFalse(odf.equivalent(Spectrogram()))
+
+    def testSameAnalyzerTwice(self):
+        "An analyzer added twice is run once and shares its results"
+        odf_1 = OnsetDetectionFunction()
+        odf_2 = OnsetDetectionFunction()
+        pipe = self.decoder | odf_1 | odf_2
+        self.assertEqual(self.count(pipe, OnsetDetectionFunction), 1)
+        self.assertEqual(self.count(pipe, Spectrogram), 1)
+        self.assertIs(odf_1.parents[0], odf_2.parents[0])
+        pipe.run()
+        self.assertIn('odf', pipe.results)
+        np.testing.assert_array_equal(odf_2.results['odf'].data,
+                                      odf_1.results['odf'].data)
+        self.assertFalse(hasattr(odf_2, 'source_samplerate'))
+
+    def testDuplicateParents(self):
+        "A merged analyzer has its own list of parents"
+        odf_1 = OnsetDetectionFunction()
+        odf_2 = OnsetDetectionFunction()
+        self.decoder | odf_1 | odf_2
+        self.assertIsNot(odf_1.parents, odf_2.parents)
+        odf_2.parents.append(Level())
+        self.assertEqual(len(odf_1.parents), 1)
+
+    def testDifferentAnalyzers(self):
+        "Analyzers constructed with different arguments are both run"
+        odf_1 = OnsetDetectionFunction(blocksize=1024)
+        odf_2 = OnsetDetectionFunction(blocksize=2048)
+        pipe = self.decoder | odf_1 | odf_2
+        self.assertEqual(self.count(pipe, OnsetDetectionFunction), 2)
+
+    def testSameGrapherTwice(self):
+        "Equivalent graphers added explicitly each render their image"
+        from timeside.grapher.render_analyzers import \
+            DisplayOnsetDetectionFunction
+        grapher_1 = DisplayOnsetDetectionFunction()
+        grapher_2 = DisplayOnsetDetectionFunction()
+        pipe = self.decoder | grapher_1 | grapher_2
+        self.assertEqual(self.count(pipe, DisplayOnsetDetectionFunction), 2)
+        self.assertEqual(self.count(pipe, OnsetDetectionFunction), 1)
+
+    def testSameInstanceTwice(self):
+        "A processor instance added twice is run once"
+        odf = OnsetDetectionFunction()
+        pipe = self.decoder | odf
+        pipe |= odf
+        self.assertEqual(self.count(pipe, OnsetDetectionFunction), 1)
+
+    def testAnalyzerAndGrapher(self):
+        "A grapher shares its parent analyzer with the pipe"
+        from timeside.grapher.render_analyzers import \
+            DisplayOnsetDetectionFunction
+        odf = OnsetDetectionFunction()
+        grapher = DisplayOnsetDetectionFunction()
+        pipe = self.decoder | odf | grapher
+        self.assertEqual(self.count(pipe, OnsetDetectionFunction), 1)
+        self.assertEqual(self.count(pipe, Spectrogram), 1)
+        self.assertIs(grapher.parents[0], odf)
+        pipe.run()
+
+    def testSameParentInstance(self):
+        "A parent instance shared by several processors is added once"
+        from timeside.grapher.render_analyzers import \
+            DisplayOnsetDetectionFunction
+        pipe = (self.decoder | DisplayOnsetDetectionFunction() |
+                DisplayOnsetDetectionFunction())
+        self.assertEqual(self.count(pipe, OnsetDetectionFunction), 1)
+        pipe.run()
+
+
+class StreamChunk(object):
+
+    def __init__(self, data):
+        self.data = data
+
+
+class StreamingProcessor(Processor):
+
+    "Processor streaming the bytes of the frames it receives"
+
+    def __init__(self):
+        super(StreamingProcessor, self).__init__()
+        self.streaming = True
+        self.queue_size = 10
+        self.cancelled = False
+        self.processed = 0
+
+    @staticmethod
+    def id():
+        return "test_streaming"
+
+    def setup(self, channels=None, samplerate=None, blocksize=None,
+              totalframes=None):
+        super(StreamingProcessor, self).setup(channels, samplerate,
+                                              blocksize, totalframes)
+        self.queue = Queue.Queue(self.queue_size)
+
+    def put(self, chunk):
+        while not self.cancelled:
+            try:
+                self.queue.put(chunk, timeout=0.01)
+                return
+            except Queue.Full:
+                pass
+
+    def process(self, frames, eod=False):
+        self.processed += 1
+        self.put(StreamChunk(frames.tostring()))
+        if eod:
+            self.put(None)
+        return frames, eod
+
+    def get_stream_chunk(self, timeout=None):
+        return self.queue.get(timeout=timeout)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class EncodingProcessor(Processor):
+
+    "Processor waiting in release() for the end of the stream, as an encoder"
+
+    def __init__(self):
+        super(EncodingProcessor, self).__init__()
+        self.end_reached = threading.Event()
+        self.cancelled = False
+
+    @staticmethod
+    def id():
+        return "test_encoding"
+
+    def process(self, frames, eod=False):
+        if eod:
+            self.end_reached.set()
+        return frames, eod
+
+    def release(self):
+        # Bounded wait so that a regression fails instead of hanging
+        self.end_reached.wait(5)
+
+    def cancel(self):
+        self.cancelled = True
+        self.end_reached.set()
+
+
+class TestStream(unittest.TestCase):
+
+    "Test the streaming of a pipe"
+
+    def setUp(self):
+        self.source = np.random.randn(100 * 1024)
+        self.streamer = StreamingProcessor()
+        self.pipe = (ArrayDecoder(self.source, samplerate=44100) |
+                     self.streamer)
+
+    def testStream(self):
+        "Chunks are yielded in order"
+        chunks = [chunk.data for chunk in self.pipe.stream()]
+        self.assertEqual(len(chunks), self.streamer.processed)
+        stream = np.fromstring(''.join(chunks), dtype='float32')
+        np.testing.assert_allclose(stream, self.source, rtol=1e-6)
+
+    def testChunkSize(self):
+        "Chunks are coalesced up to the chunk size"
+        chunks = list(self.pipe.stream(chunk_size=20000))
+        self.assertTrue(all(len(chunk) >= 20000 for chunk in chunks[:-1]))
+        stream = np.fromstring(''.join(chunks), dtype='float32')
+        np.testing.assert_allclose(stream, self.source, rtol=1e-6)
+
+    def testCancel(self):
+        "Closing the stream cancels the pipe"
+        stream = self.pipe.stream(queue_size=2)
+        next(stream)
+        stream.close()
+        self.assertTrue(self.streamer.cancelled)
+        self.assertLess(self.streamer.processed, 10)
+        self.assertFalse(self.pipe._is_running)
+
+    def testCancelEncoders(self):
+        "Closing the stream cancels the other encoders of the pipe"
+        encoder = EncodingProcessor()
+        streamer = StreamingProcessor()
+        pipe = (ArrayDecoder(self.source, samplerate=44100) | encoder |
+                streamer)
+        stream = pipe.stream(queue_size=2)
+        next(stream)
+        start = time.time()
+        stream.close()
+        self.assertTrue(encoder.cancelled)
+        self.assertTrue(streamer.cancelled)
+        self.assertLess(time.time() - start, 5)
+
+
+if __name__ == '__main__':
+    unittest.main(testRunner=TestRunner())
@@ -0,0 +1,133 @@
+#! /usr/bin/env python
+
+from unit_timeside import unittest, TestRunner
+from timeside.analyzer.core import AnalyzerResult, AnalyzerResultContainer
+from timeside.analyzer import pyramid
+from timeside.analyzer.pyramid import build_pyramid, select_level
+
+import os
+import tempfile
+import h5py
+import numpy as np
+
+
+class TestBuildPyramid(unittest.TestCase):
+
+    "Test the min/max/mean pyramid levels"
+
+    def check_levels(self, data):
+        levels = build_pyramid(data)
+        self.assertEqual(len(levels[-1]['mean']), 1)
+        for index, level in enumerate(levels):
+            size = 2 ** (index + 1)
+            buckets = [data[i:i + size] for i in range(0, len(data), size)]
+            np.testing.assert_array_equal(
+                level['min'], [bucket.min(axis=0) for bucket in buckets])
+            np.testing.assert_array_equal(
+                level['max'], [bucket.max(axis=0) for bucket in buckets])
+            np.testing.assert_allclose(
+                level['mean'], [bucket.mean(axis=0) for bucket in buckets],
+                rtol=1e-5, atol=1e-6)
+
+    def testOddLength(self):
+        "levels of data of odd length"
+        self.check_levels(np.random.randn(1001))
+
+    def testMultiDimensional(self):
+        "levels of 2d data"
+        self.check_levels(np.random.randn(300, 4).astype('float32'))
+
+    def testOddBlocks(self):
+        "levels of data read by blocks of odd length"
+        block_frames = pyramid.BLOCK_FRAMES
+        pyramid.BLOCK_FRAMES = 7
+        try:
+            self.check_levels(np.random.randn(1001))
+        finally:
+            pyramid.BLOCK_FRAMES = block_frames
+
+    def testShort(self):
+        "no level for a single frame"
+        self.assertEqual(build_pyramid(np.ones(1)), [])
+
+    def testSelectLevel(self):
+        "coarsest level with enough frames"
+        self.assertEqual(select_level(1000, 2000, 10), 0)
+        self.assertEqual(select_level(1000, 250, 10), 2)
+        self.assertEqual(select_level(1000, 240, 10), 2)
+        self.assertEqual(select_level(10 ** 6, 1, 3), 3)
+
+
+class TestResultPyramid(unittest.TestCase):
+
+    "Test the display data of framewise results"
+
+    def setUp(self):
+        self.result = AnalyzerResult.factory(data_mode='value',
+                                             time_mode='framewise')
+        self.result.id_metadata.id = 'foo'
+        self.result.audio_metadata.start = 0
+        self.result.frame_metadata.samplerate = 1000
+        self.result.frame_metadata.stepsize = 10
+        self.result.frame_metadata.blocksize = 20
+        self.data = np.random.randn(100000)
+        self.result.data_object.value = self.data
+
+    def testDisplayData(self):
+        "decimated data between two times"
+        display = self.result.display_data(100, start=100., stop=200.)
+        # 10000 frames in the time range, decimated by 64: the first bucket
+        # starts at frame 9984
+        self.assertGreaterEqual(len(display['mean']), 100)
+        self.assertLess(len(display['mean']), 200)
+        self.assertAlmostEqual(display['time'][0], 99.84)
+        np.testing.assert_allclose(display['mean'][0],
+                                   self.data[9984:10048].mean())
+        self.assertEqual(display['max'][0], self.data[9984:10048].max())
+
+    def testDisplayFullResolution(self):
+        "data itself when there are less frames than pixels"
+        display = self.result.display_data(1000, start=1., stop=2.)
+        np.testing.assert_array_equal(display['mean'], self.data[100:200])
+        np.testing.assert_allclose(display['time'], self.result.time[100:200])
+
+    def testBadResult(self):
+        "pyramids of framewise value results only"
+        result = AnalyzerResult.factory(data_mode='value', time_mode='global')
+        self.assertRaises(ValueError, result.build_pyramid)
+
+    def testHdf5(self):
+        "pyramid saved and lazily loaded from HDF5"
+        fd, h5_path = tempfile.mkstemp(suffix='.h5')
+        os.close(fd)
+        try:
+            AnalyzerResultContainer([self.result]).to_hdf5(h5_path,
+                                                           pyramids=True)
+            results = AnalyzerResultContainer.from_hdf5(h5_path, lazy=True)
+            result = results['foo']
+            self.assertIsInstance(result.pyramid[0]['mean'], h5py.Dataset)
+            expected_levels = build_pyramid(self.data)
+            self.assertEqual(len(result.pyramid), len(expected_levels))
+            for level, expected in zip(result.pyramid, expected_levels):
+                for name in ['min', 'max', 'mean']:
+                    np.testing.assert_array_equal(level[name][...],
+                                                  expected[name])
+            display = result.display_data(100, start=100., stop=200.)
+            expected = self.result.display_data(100, start=100., stop=200.)
+            for key in expected:
+                np.testing.assert_array_equal(display[key], expected[key])
+            results.close()
+        finally:
+            os.remove(h5_path)
+
+    def testRenderLargeResult(self):
+        "large results are rendered from their pyramid"
+        from matplotlib.figure import Figure
+        ax = Figure().add_subplot(111)
+        self.result._render_plot(ax)
+        self.assertLessEqual(len(ax.lines[0].get_xdata()),
+                             self.result.render_frames)
+
+
+if __name__ == '__main__':
+    unittest.main(testRunner=TestRunner())
@@ -0,0 +1,105 @@
+#! /usr/bin/env python
+
+from unit_timeside import *
+import os
+import shutil
+import tempfile
+
+try:
+    import celery
+    from django.conf import settings
+except ImportError:
+    _WITH_SERVER = False
+else:
+    _WITH_SERVER = True
+
+if _WITH_SERVER and not settings.configured:
+    MEDIA_ROOT = tempfile.mkdtemp(suffix='-timeside') + os.sep
+    settings.configure(
+        DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3',
+                               'NAME': ':memory:'}},
+        INSTALLED_APPS=('django.contrib.auth',
+                        'django.contrib.contenttypes',
+                        'timeside.server'),
+        MEDIA_ROOT=MEDIA_ROOT,
+        BROKER_URL='memory://',
+        CELERY_RESULT_BACKEND='cache+memory://',
+        # Run the chord of the tasks synchronously, without workers
+        CELERY_ALWAYS_EAGER=True)
+
+
+@unittest.skipIf(not _WITH_SERVER, 'Django and Celery are not available')
+class TestServerTasks(unittest.TestCase):
+
+    "Test the dispatch of the server tasks to Celery"
+
+    @classmethod
+    def setUpClass(cls):
+        from django.core.management import call_command
+        call_command('syncdb', interactive=False, verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        from django.conf import settings
+        shutil.rmtree(settings.MEDIA_ROOT)
+
+    def setUp(self):
+        from timeside.server import models
+        self.models = models
+        self.experience = models.Experience.objects.create(title='test')
+        for pid in ['level', 'waveform_simple']:
+            processor = models.Processor.objects.create(pid=pid)
+            self.experience.presets.add(
+                models.Preset.objects.create(processor=processor))
+        self.selection = models.Selection.objects.create(title='test')
+
+    def add_item(self, source):
+        from django.conf import settings
+        filename = os.path.basename(source)
+        shutil.copy(source, settings.MEDIA_ROOT + filename)
+        item = self.models.Item.objects.create(title=filename, file=filename)
+        self.selection.items.add(item)
+        return item
+
+    def run_task(self):
+        task = self.models.Task.objects.create(experience=self.experience,
+                                               selection=self.selection)
+        self.assertEqual(task.status, 1)
+        task.status_setter(2)
+        return self.models.Task.objects.get(id=task.id)
+
+    def statuses(self, item):
+        return [result.status for result in
+                self.models.Result.objects.filter(item=item)]
+
+    def testDone(self):
+        "The task and the results are done when all the items are processed"
+        items = [self.add_item(os.path.join(os.path.dirname(__file__),
+                                            'samples', name))
+                 for name in ['sweep.wav', 'guitar.wav']]
+        task = self.run_task()
+        self.assertEqual(task.status, 4)
+        for item in items:
+            statuses = self.statuses(item)
+            self.assertTrue(len(statuses) >= 2)
+            self.assertEqual(set(statuses), set([4]))
+
+    def testFailed(self):
+        "The task and the unfinished results fail with an unreadable item"
+        tmp_dir = tempfile.mkdtemp()
+        corrupt = os.path.join(tmp_dir, 'corrupt.wav')
+        with open(corrupt, 'w') as f:
+            f.write('not audio')
+        sweep = self.add_item(os.path.join(os.path.dirname(__file__),
+                                           'samples', 'sweep.wav'))
+        corrupt = self.add_item(corrupt)
+        shutil.rmtree(tmp_dir)
+        task = self.run_task()
+        self.assertEqual(task.status, 0)
+        self.assertEqual(set(self.statuses(sweep)), set([4]))
+        self.assertEqual(self.statuses(corrupt), [0])
+        self.assertFalse(self.models.Item.objects.get(id=corrupt.id).lock)
+
+
+if __name__ == '__main__':
+    unittest.main(testRunner=TestRunner())
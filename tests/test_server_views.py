@@ -0,0 +1,54 @@
+#! /usr/bin/env python
+
+from unit_timeside import *
+
+try:
+    import rest_framework
+    from django.conf import settings
+except ImportError:
+    _WITH_SERVER = False
+else:
+    _WITH_SERVER = True
+
+if _WITH_SERVER and not settings.configured:
+    settings.configure(
+        DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3',
+                               'NAME': ':memory:'}},
+        INSTALLED_APPS=('django.contrib.auth',
+                        'django.contrib.contenttypes',
+                        'timeside.server'))
+
+
+@unittest.skipIf(not _WITH_SERVER, 'Django REST framework is not available')
+class TestResultAnalyzerView(unittest.TestCase):
+
+    "Test the time range of the results served by the server"
+
+    def setUp(self):
+        from django.test.client import RequestFactory
+        from timeside.server import views
+        self.views = views
+        self.factory = RequestFactory()
+
+    def testTimeRange(self):
+        "Times are read from the query"
+        self.assertEqual(self.views.time_range({}), (None, None))
+        self.assertEqual(self.views.time_range({'start': '1.5'}), (1.5, None))
+        self.assertEqual(self.views.time_range({'start': '1',
+                                                'stop': '2'}), (1., 2.))
+
+    def testBadTimeRange(self):
+        "Malformed times and reversed ranges are rejected"
+        for query in [{'start': ''}, {'stop': 'abc'}, {'start': 'nan'},
+                      {'stop': 'inf'}, {'start': '2', 'stop': '1'}]:
+            self.assertRaises(ValueError, self.views.time_range, query)
+
+    def testBadRequest(self):
+        "The view answers a malformed time range with a bad request"
+        request = self.factory.get('/results/1/', {'start': 'abc'})
+        response = self.views.ResultAnalyzerView().get(request, pk=1)
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main(testRunner=TestRunner())
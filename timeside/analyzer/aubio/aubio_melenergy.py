@@ -49,7 +49,8 @@ class AubioMelEnergy(Analyzer):
         self.melenergy = filterbank(self.n_filters, self.input_blocksize)
         self.melenergy.set_mel_coeffs_slaney(samplerate)
         self.block_read = 0
-        self.melenergy_results = []
+        self.melenergy_results = self.new_accumulator(
+            shape=(self.n_filters,), dtype='float32')
 
     @staticmethod
     @interfacedoc
@@ -79,5 +80,5 @@ class AubioMelEnergy(Analyzer):
         melenergy = self.new_result(data_mode='value', time_mode='framewise')
         melenergy.parameters = dict(n_filters=self.n_filters,
                                     n_coeffs=self.n_coeffs)
-        melenergy.data_object.value = self.melenergy_results
+        melenergy.data_object.value = self.melenergy_results.data
         self.process_pipe.results.add(melenergy)
@@ -58,7 +58,8 @@ class AubioSpecdesc(Analyzer):
         self.specdesc_results = {}
         for method in self.methods:
             self.specdesc[method] = specdesc(method, self.input_blocksize)
-            self.specdesc_results[method] = []
+            self.specdesc_results[method] = self.new_accumulator(
+                dtype='float32')
 
     @staticmethod
     @interfacedoc
@@ -80,8 +81,8 @@ class AubioSpecdesc(Analyzer):
     def process(self, frames, eod=False):
         fftgrain = self.pvoc(frames)
         for method in self.methods:
-            self.specdesc_results[method] += [
-                self.specdesc[method](fftgrain)[0]]
+            self.specdesc_results[method].append(
+                self.specdesc[method](fftgrain)[0])
         return frames, eod
 
     def post_process(self):
@@ -93,6 +94,7 @@ class AubioSpecdesc(Analyzer):
             # Set metadata
             res_specdesc.id_metadata.id += '.' + method
             res_specdesc.id_metadata.name = ' ' + method
-            res_specdesc.data_object.value = self.specdesc_results[method]
+            res_specdesc.data_object.value = self.specdesc_results[
+                method].data
 
             self.process_pipe.results.add(res_specdesc)
@@ -30,6 +30,8 @@ import numpy
 from collections import OrderedDict
 import h5py
 import h5tools
+import pyramid
+from timeside.analyzer.utils import Accumulator
 
 import os
 
@@ -308,9 +310,50 @@ class LabelMetadata(MetadataObject):
         if self.__getattribute__(name) is not None:
             h5group.attrs[name] = self.__getattribute__(name)
 
-        for name in ['label', 'description']:
-            subgroup = h5group.create_group(name)
-            h5tools.dict_to_hdf5(self.__getattribute__(name), subgroup)
+        # Store the labels, their names and descriptions as a table
+        labels = sorted(set(self.label) | set(self.description))
+        try:
+            labels = [int(label) for label in labels]
+        except (TypeError, ValueError):
+            # Labels which are not integers are stored as attributes
+            for name in ['label', 'description']:
+                subgroup = h5group.create_group(name)
+                h5tools.dict_to_hdf5(self.__getattribute__(name), subgroup)
+            return
+
+        text_dtype = h5py.special_dtype(vlen=unicode)
+        dtype = numpy.dtype([('label', 'int64'),
+                             ('name', text_dtype),
+                             ('description', text_dtype)])
+        table = numpy.array([(label,
+                              unicode(self.label.get(label, '')),
+                              unicode(self.description.get(label, '')))
+                             for label in labels], dtype=dtype)
+        h5group.create_dataset('labels', data=table, maxshape=(None,))
+
+    def from_hdf5(self, h5group):
+        h5tools.dict_from_hdf5(self, h5group)
+        self.label = {}
+        self.description = {}
+        if 'labels' in h5group:
+            for label, name, description in h5group['labels'][...]:
+                if name:
+                    self.label[int(label)] = name
+                if description:
+                    self.description[int(label)] = description
+        else:
+            for name in ['label', 'description']:
+                if name in h5group:
+                    self.__getattribute__(name).update(
+                        (_label_key(key), value)
+                        for key, value in h5group[name].attrs.items())
+
+
+def _label_key(key):
+    try:
+        return int(key)
+    except ValueError:
+        return key
 
 
 class FrameMetadata(MetadataObject):
@@ -356,8 +399,12 @@ class DataObject(MetadataObject):
         if value is None:
             value = []
 
+        if isinstance(value, h5py.Dataset):
+            # HDF5 datasets are kept as is to be read on demand
+            pass
+
         # Set Data with the proper type
-        if name == 'value':
+        elif name == 'value':
             value = numpy.asarray(value)
             if value.dtype.type not in numpy_data_types:
                 raise TypeError(
@@ -409,7 +456,7 @@ class DataObject(MetadataObject):
             child = ET.SubElement(root, key)
             value = getattr(self, key)
             if value not in [None, []]:
-                child.text = repr(value.tolist())
+                child.text = repr(numpy.asarray(value).tolist())
                 child.set('dtype', value.dtype.__str__())
 
         return ET.tostring(root, encoding="utf-8", method="xml")
@@ -424,26 +471,46 @@ class DataObject(MetadataObject):
                 self[key] = numpy.asarray(ast.literal_eval(child.text),
                                           dtype=child.get('dtype'))
 
-    def to_hdf5(self, h5group):
+    def to_hdf5(self, h5group, **options):
+        """Save the data in a h5 file group
+
+        The keyword arguments set the chunk shape and the compression
+        filters of the numeric datasets, see h5tools.dataset_options()
+        """
         # Write Datasets
         for key in self.keys():
             if self.__getattribute__(key) is None:
                 continue
-            if self.__getattribute__(key).dtype == 'object':
-                # Handle numpy type = object as vlen string
-                h5group.create_dataset(key,
-                                       data=self.__getattribute__(
-                                           key).tolist().__repr__(),
-                                       dtype=h5py.special_dtype(vlen=str))
+            if isinstance(self.__getattribute__(key), h5py.Dataset):
+                dataset = self.__getattribute__(key)
+                if dataset.file == h5group.file:
+                    # Data already written in this file while processing
+                    h5group.file.move(dataset.name,
+                                      h5group.name + '/' + key)
+                else:
+                    h5group.copy(dataset, key)
+            elif self.__getattribute__(key).dtype == 'object':
+                # Handle numpy type = object as vlen data
+                h5tools.object_to_hdf5(h5group, key,
+                                       self.__getattribute__(key))
             else:
-                if numpy.prod(self.__getattribute__(key).shape):
+                data = self.__getattribute__(key)
+                if numpy.prod(data.shape):
                     maxshape = None
+                    dataset_options = h5tools.dataset_options(data, **options)
                 else:
                     maxshape = (None,)
-                h5group.create_dataset(
-                    key, data=self.__getattribute__(key), maxshape=maxshape)
+                    dataset_options = {}
+                h5group.create_dataset(key, data=data, maxshape=maxshape,
+                                       **dataset_options)
 
-    def from_hdf5(self, h5group):
+    def from_hdf5(self, h5group, lazy=False):
+        """Load the data from a h5 file group
+
+        If lazy is True, the numeric datasets are not read: they are kept
+        as h5py datasets and only the parts which are accessed are read from
+        the file, which has to stay open.
+        """
         for key, dataset in h5group.items():
             # Load value from the hdf5 dataset and store in data
             # FIXME : the following conditional statement is to prevent
@@ -451,10 +518,12 @@ class DataObject(MetadataObject):
             # see : https://github.com/h5py/h5py/issues/281
             # It should be fixed by the next h5py version
             if dataset.shape != (0,):
-                if h5py.check_dtype(vlen=dataset.dtype):
+                if h5py.check_dtype(vlen=dataset.dtype) is not None:
                     # to deal with VLEN data used for list of
                     # list
-                    self.__setattr__(key, eval(dataset[...].tolist()))
+                    self.__setattr__(key, h5tools.object_from_hdf5(dataset))
+                elif lazy:
+                    self.__setattr__(key, dataset)
                 else:
                     self.__setattr__(key, dataset[...])
             else:
@@ -539,6 +608,10 @@ class AnalyzerResult(MetadataObject):
         self.frame_metadata = FrameMetadata()
         self.label_metadata = LabelMetadata()
         self.parameters = AnalyzerParameters()
+        self._pyramid = None
+        # HDF5 file holding the data of a lazily loaded result, kept open
+        # as long as the result is referenced
+        self._h5_file = None
 
     @staticmethod
     def factory(data_mode='value', time_mode='framewise'):
@@ -555,7 +628,7 @@ class AnalyzerResult(MetadataObject):
         raise ValueError('Wrong arguments')
 
     def __setattr__(self, name, value):
-        if name in ['_data_mode', '_time_mode']:
+        if name in ['_data_mode', '_time_mode', '_pyramid', '_h5_file']:
             super(MetadataObject, self).__setattr__(name, value)
             return
 
@@ -615,8 +688,10 @@ class AnalyzerResult(MetadataObject):
 
         return result
 
-    def to_hdf5(self, h5_file):
+    def to_hdf5(self, h5_file, build_pyramid=False, **options):
         # Save results in HDF5 Dataset
+        # If build_pyramid is True and the result has no pyramid, the
+        # pyramid is computed and written block by block
         group = h5_file.create_group(self.id_metadata.id)
         group.attrs['data_mode'] = self.__getattribute__('data_mode')
         group.attrs['time_mode'] = self.__getattribute__('time_mode')
@@ -624,17 +699,176 @@ class AnalyzerResult(MetadataObject):
             if key in ['data_mode', 'time_mode']:
                 continue
             subgroup = group.create_group(key)
-            self.__getattribute__(key).to_hdf5(subgroup)
+            if key == 'data_object':
+                self.data_object.to_hdf5(subgroup, **options)
+            else:
+                self.__getattribute__(key).to_hdf5(subgroup)
+        if self._pyramid:
+            pyramid.pyramid_to_hdf5(self._pyramid,
+                                    group.create_group('pyramid'), **options)
+        elif build_pyramid:
+            pyramid.build_pyramid_hdf5(self.data_object.value,
+                                       group.create_group('pyramid'),
+                                       **options)
 
     @staticmethod
-    def from_hdf5(h5group):
+    def from_hdf5(h5group, lazy=False):
         # Read Sub-Group
         result = AnalyzerResult.factory(data_mode=h5group.attrs['data_mode'],
                                         time_mode=h5group.attrs['time_mode'])
         for subgroup_name, h5subgroup in h5group.items():
-            result[subgroup_name].from_hdf5(h5subgroup)
+            if subgroup_name == 'data_object':
+                result.data_object.from_hdf5(h5subgroup, lazy=lazy)
+            elif subgroup_name == 'pyramid':
+                result._pyramid = pyramid.pyramid_from_hdf5(h5subgroup,
+                                                            lazy=lazy)
+            else:
+                result[subgroup_name].from_hdf5(h5subgroup)
         return result
 
+    def time_slice(self, start=None, stop=None):
+        """Return a new result holding the data between the times start and
+        stop, in seconds
+
+        Only the selected part of the data is read when the result is loaded
+        lazily from a HDF5 file. Framewise frames are selected from their
+        time, events from their time and segments if they overlap the time
+        range. The audio_metadata start and duration of a framewise slice
+        are the ones of the selected frames, so that its time property
+        stays consistent. A global result is returned as is.
+
+        >>> res = AnalyzerResult.factory(data_mode='value',
+        ...                              time_mode='framewise')
+        >>> res.audio_metadata.start = 0
+        >>> res.frame_metadata.samplerate = 100
+        >>> res.frame_metadata.stepsize = 50
+        >>> res.frame_metadata.blocksize = 100
+        >>> res.data_object.value = numpy.arange(10)
+        >>> part = res.time_slice(1., 3.)
+        >>> part.data
+        array([2, 3, 4, 5])
+        >>> part.time
+        array([ 1. ,  1.5,  2. ,  2.5])
+        """
+        if self.time_mode == 'global':
+            return self
+
+        import copy
+        result = AnalyzerResult.factory(data_mode=self.data_mode,
+                                        time_mode=self.time_mode)
+        for key in self.keys():
+            if key != 'data_object':
+                result.__setattr__(key, copy.deepcopy(self[key]))
+
+        if self.time_mode == 'framewise':
+            step = self._frame_step()
+            start_index, stop_index = self._frame_range(start, stop)
+            result.audio_metadata.start = (self.audio_metadata.start +
+                                           start_index * step)
+            result.audio_metadata.duration = (stop_index - start_index) * step
+            selection = slice(start_index, stop_index)
+            mask = None
+        else:
+            # Events and segments are sorted by time
+            time = self.audio_metadata.start + numpy.asarray(
+                self.data_object.time)
+            mask = numpy.ones(len(time), dtype=bool)
+            if start is not None:
+                if self.time_mode == 'segment':
+                    end = time + numpy.asarray(self.data_object.duration)
+                    mask &= end > start
+                else:
+                    mask &= time >= start
+            if stop is not None:
+                mask &= time < stop
+            indices = numpy.flatnonzero(mask)
+            if len(indices):
+                selection = slice(indices[0], indices[-1] + 1)
+                mask = mask[selection]
+            else:
+                selection = slice(0, 0)
+                mask = None
+
+        for key in result.data_object.keys():
+            data = self.data_object[key]
+            if len(data):
+                data = data[selection]
+                if mask is not None:
+                    data = data[mask]
+            result.data_object.__setattr__(key, data)
+        return result
+
+    def _frame_step(self):
+        "Time in seconds between two frames of a framewise result"
+        return self.frame_metadata.stepsize / self.frame_metadata.samplerate
+
+    def _frame_range(self, start=None, stop=None):
+        """Indices of the first frame and after the last frame of a
+        framewise result between the times start and stop"""
+        step = self._frame_step()
+        start_index, stop_index = 0, len(self)
+        if start is not None:
+            start_index = int(numpy.ceil(
+                (start - self.audio_metadata.start) / step))
+        if stop is not None:
+            stop_index = int(numpy.ceil(
+                (stop - self.audio_metadata.start) / step))
+        start_index = min(max(start_index, 0), len(self))
+        stop_index = min(max(stop_index, start_index), len(self))
+        return start_index, stop_index
+
+    def build_pyramid(self, min_length=1):
+        """Compute the min/max/mean pyramid of the data of a framewise value
+        result, to display it at any scale (see display_data)
+
+        The pyramid is saved with the result by to_hdf5().
+        """
+        if (self.data_mode, self.time_mode) != ('value', 'framewise'):
+            raise ValueError('Pyramids are only computed for framewise value '
+                             'results, not for %s %s results' %
+                             (self.time_mode, self.data_mode))
+        self._pyramid = pyramid.build_pyramid(self.data_object.value,
+                                              min_length=min_length)
+
+    @property
+    def pyramid(self):
+        "Levels of the pyramid of the result, see timeside.analyzer.pyramid"
+        return self._pyramid
+
+    def display_data(self, width, start=None, stop=None):
+        """Return the data of a framewise value result between the times
+        start and stop, decimated to at least `width` frames
+
+        The data is read from the coarsest level of the pyramid of the
+        result having at least `width` frames in this time range, so that
+        the size of the data read does not depend on the size of the result.
+        The pyramid is computed if the result has none.
+
+        Returns
+        -------
+        dict of numpy arrays
+            'time' : start time of the frames
+            'min', 'max', 'mean' : minimum, maximum and mean of the data over
+            the frames
+        """
+        if self._pyramid is None:
+            self.build_pyramid()
+        start_index, stop_index = self._frame_range(start, stop)
+        level = pyramid.select_level(stop_index - start_index, width,
+                                     len(self._pyramid))
+        factor = 2 ** level
+        first = start_index // factor
+        last = -(-stop_index // factor)
+        if level:
+            display = dict((name, numpy.asarray(data[first:last]))
+                           for name, data in self._pyramid[level - 1].items())
+        else:
+            data = numpy.asarray(self.data_object.value[first:last])
+            display = {'min': data, 'max': data, 'mean': data}
+        display['time'] = (self.audio_metadata.start + self._frame_step() *
+                           factor * numpy.arange(first, last))
+        return display
+
     def _render_plot(self, ax):
         return NotImplemented
 
@@ -643,9 +877,7 @@ class AnalyzerResult(MetadataObject):
 
            Return the figure, use fig.show() to display if neeeded
         '''
-        # TODO : this may crash if the data array is too large
-        # possible workaround downsampled the data
-        #  and plot center, min, max values
+        # Large framewise data is plotted from its min/max/mean pyramid
         # see http://stackoverflow.com/a/8881973
 
         fig, ax = plt.subplots()
@@ -825,8 +1057,19 @@ class GlobalLabelResult(LabelObject, GlobalObject, AnalyzerResult):
 
 class FrameValueResult(ValueObject, FramewiseObject, AnalyzerResult):
 
+    # Maximum number of frames plotted by render()
+    render_frames = 4096
+
     def _render_plot(self, ax):
-        ax.plot(self.time, self.data)
+        if len(self) <= self.render_frames:
+            ax.plot(self.time, self.data)
+            return
+        # Plot the envelope of the data from the pyramid
+        display = self.display_data(self.render_frames // 2)
+        if display['mean'].ndim == 1:
+            ax.fill_between(display['time'], display['min'], display['max'],
+                            alpha=0.3)
+        ax.plot(display['time'], display['mean'])
 
 
 class FrameLabelResult(LabelObject, FramewiseObject, AnalyzerResult):
@@ -880,6 +1123,9 @@ class AnalyzerResultContainer(dict):
 
     def __init__(self, analyzer_results=None):
         super(AnalyzerResultContainer, self).__init__()
+        self._h5_sink = None
+        self._h5_sink_flushed = False
+        self._h5_source = None
         if analyzer_results is not None:
             self.add(analyzer_results)
 
@@ -932,8 +1178,8 @@ class AnalyzerResultContainer(dict):
 
         # Define Specialize JSON encoder for numpy array
         def NumpyArrayEncoder(obj):
-            if isinstance(obj, numpy.ndarray):
-                return {'numpyArray': obj.tolist(),
+            if isinstance(obj, (numpy.ndarray, h5py.Dataset)):
+                return {'numpyArray': obj[...].tolist(),
                         'dtype': obj.dtype.__str__()}
             elif isinstance(obj, numpy.generic):
                 return numpy.asscalar(obj)
@@ -948,6 +1194,66 @@ class AnalyzerResultContainer(dict):
         else:
             return json_str
 
+    def iter_json(self, chunk_rows=1024):
+        """Encode the results in JSON piece by piece
+
+        Return a generator of strings whose concatenation is the same JSON
+        document as to_json(). The results are encoded one after the other
+        and the arrays `chunk_rows` rows at a time, so that the whole
+        document is never held in memory. Arrays backed by HDF5 datasets
+        are read chunk by chunk as well.
+
+        >>> res = AnalyzerResult.factory(data_mode='value',
+        ...                              time_mode='global')
+        >>> res.data_object.value = numpy.arange(5)
+        >>> results = AnalyzerResultContainer([res])
+        >>> json_str = ''.join(results.iter_json(chunk_rows=2))
+        >>> AnalyzerResultContainer.from_json(json_str) == results
+        True
+        """
+        import simplejson as json
+
+        def json_default(obj):
+            if isinstance(obj, numpy.generic):
+                return numpy.asscalar(obj)
+            raise TypeError(repr(obj) + " is not JSON serializable")
+
+        def iter_array(array):
+            yield '{"numpyArray": '
+            if array.ndim == 0 or not len(array):
+                yield json.dumps(array[...].tolist())
+            else:
+                separator = '['
+                for start in xrange(0, len(array), chunk_rows):
+                    rows = array[start:start + chunk_rows].tolist()
+                    yield separator + json.dumps(rows)[1:-1]
+                    separator = ', '
+                yield ']'
+            yield ', "dtype": %s}' % json.dumps(str(array.dtype))
+
+        def iter_obj(obj):
+            if isinstance(obj, (numpy.ndarray, h5py.Dataset)):
+                for chunk in iter_array(obj):
+                    yield chunk
+            elif isinstance(obj, dict):
+                separator = '{'
+                for key, value in obj.items():
+                    yield separator + json.dumps(key) + ': '
+                    for chunk in iter_obj(value):
+                        yield chunk
+                    separator = ', '
+                yield '}' if separator == ', ' else '{}'
+            else:
+                yield json.dumps(obj, default=json_default)
+
+        separator = '['
+        for res in self.values():
+            yield separator
+            for chunk in iter_obj(res.as_dict()):
+                yield chunk
+            separator = ', '
+        yield ']' if separator == ', ' else '[]'
+
     @staticmethod
     def from_json(json_str):
         import simplejson as json
@@ -986,6 +1292,11 @@ class AnalyzerResultContainer(dict):
 
         yaml.add_representer(numpy.ndarray, numpyArray_representer)
 
+        def h5Dataset_representer(dumper, obj):
+            return numpyArray_representer(dumper, obj[...])
+
+        yaml.add_representer(h5py.Dataset, h5Dataset_representer)
+
         yaml_str = yaml.dump([res.as_dict() for res in self.values()])
         if output_file:
             open(output_file, 'w').write(yaml_str)
@@ -1024,14 +1335,214 @@ class AnalyzerResultContainer(dict):
     def from_numpy(input_file):
         return numpy.load(input_file)
 
-    def to_hdf5(self, output_file):
+    def to_npz(self, output_file=None, compress=False):
+        """Save the results in a numpy .npz archive
+
+        The data arrays are stored as raw binary buffers with their dtype,
+        and the metadata as a JSON string, so that reading them back does
+        not require to parse the data or to unpickle anything. Arrays of
+        objects (e.g. lists of lists) are stored in the JSON metadata.
+
+        Parameters
+        ----------
+        output_file : str or file
+            if None, return the content of the archive as a string
+        compress : bool
+            compress the archive with zip deflate
+
+        >>> res = AnalyzerResult.factory(data_mode='value',
+        ...                              time_mode='framewise')
+        >>> res.id_metadata.id = 'foo'
+        >>> res.data_object.value = numpy.ones((100, 2), dtype='float32')
+        >>> npz_str = AnalyzerResultContainer([res]).to_npz()
+        >>> results = AnalyzerResultContainer.from_npz(npz_str)
+        >>> results['foo'].data.dtype, results['foo'].data.shape
+        (dtype('float32'), (100, 2))
+        """
+        import simplejson as json
+        from StringIO import StringIO
+
+        def json_default(obj):
+            if isinstance(obj, numpy.generic):
+                return numpy.asscalar(obj)
+            raise TypeError(repr(obj) + " is not JSON serializable")
+
+        arrays = {}
+        metadata = []
+        for index, res in enumerate(self.values()):
+            res_dict = res.as_dict()
+            data_object = {}
+            for key, value in res_dict.pop('data_object').items():
+                value = numpy.asarray(value)
+                if value.dtype == 'object':
+                    data_object[key] = {'list': value.tolist(),
+                                        'dtype': str(value.dtype)}
+                else:
+                    name = '%d_%s' % (index, key)
+                    arrays[name] = value
+                    data_object[key] = {'array': name}
+            res_dict['data_object'] = data_object
+            metadata.append(res_dict)
+
+        arrays['metadata'] = numpy.array(json.dumps(metadata,
+                                                    default=json_default))
+        output = StringIO() if output_file is None else output_file
+        if compress:
+            numpy.savez_compressed(output, **arrays)
+        else:
+            numpy.savez(output, **arrays)
+        if output_file is None:
+            return output.getvalue()
+
+    @staticmethod
+    def from_npz(input_file):
+        """Load results saved by to_npz() from a file, a file object or a
+        string"""
+        import simplejson as json
+        from StringIO import StringIO
+
+        if (isinstance(input_file, str) and
+                input_file.startswith('PK\x03\x04')):
+            # Content of the archive
+            input_file = StringIO(input_file)
+        results = AnalyzerResultContainer()
+        with numpy.load(input_file) as npz:
+            metadata = json.loads(npz['metadata'].item())
+            for res_dict in metadata:
+                res = AnalyzerResult.factory(data_mode=res_dict['data_mode'],
+                                             time_mode=res_dict['time_mode'])
+                for key, value in res_dict.items():
+                    if key in ['data_mode', 'time_mode', 'data_object']:
+                        continue
+                    res[key] = value
+                for key, value in res_dict['data_object'].items():
+                    if 'array' in value:
+                        res.data_object[key] = npz[value['array']]
+                    else:
+                        res.data_object[key] = numpy.asarray(
+                            value['list'], dtype=value['dtype'])
+                results.add(res)
+        return results
+
+    def stream_to_hdf5(self, output_file, compression=None,
+                       compression_opts=None, shuffle=False):
+        """Write the framewise values of the analyzers to a HDF5 file while
+        they are computed, instead of holding them in memory
+
+        This has to be called before running the pipe. Once the pipe has
+        run, call to_hdf5() with the same file to write the other results
+        in this file. The streamed values are then read from this file on
+        demand, until close() is called. The file is removed by close() if
+        to_hdf5() has not been called.
+
+        The compression filters of the streamed values are set by the
+        keyword arguments, see h5tools.dataset_options().
+        """
+        self._close_h5_sink_file()
+        self._h5_sink = h5py.File(output_file, 'w')
+        self._h5_sink_flushed = False
+        self._h5_sink_options = dict(compression=compression,
+                                     compression_opts=compression_opts,
+                                     shuffle=shuffle)
+
+    def new_hdf5_accumulator(self, shape=(), dtype='float64'):
+        """Return a DatasetAccumulator writing in the file set by
+        stream_to_hdf5()"""
+        group = self._h5_sink.require_group('_stream')
+        return h5tools.DatasetAccumulator(group, str(len(group)),
+                                          shape=shape, dtype=dtype,
+                                          **self._h5_sink_options)
+
+    def _is_h5_sink(self, output_file):
+        return (self._h5_sink is not None and
+                os.path.abspath(self._h5_sink.filename) ==
+                os.path.abspath(output_file))
+
+    def to_hdf5(self, output_file, result_options=None, pyramids=False,
+                **options):
+        """Save the results in a HDF5 file
+
+        Parameters
+        ----------
+        output_file : str
+            path of the HDF5 file, overwritten if it exists
+        result_options : dict
+            dataset options of some results, by result id. They override the
+            keyword arguments for these results.
+        pyramids : bool
+            save the display pyramids of the framewise value results (see
+            AnalyzerResult.build_pyramid). The missing pyramids are written
+            level by level while they are computed, without being kept in
+            memory.
+        compression, compression_opts, shuffle, chunks :
+            chunk shape and compression filters of the numeric datasets,
+            see h5tools.dataset_options()
+
+        >>> import tempfile, os
+        >>> fd, path = tempfile.mkstemp(suffix='.h5')
+        >>> res = AnalyzerResult.factory(data_mode='value',
+        ...                              time_mode='framewise')
+        >>> res.id_metadata.id = 'spectrogram'
+        >>> res.data_object.value = numpy.zeros((1000, 513))
+        >>> results = AnalyzerResultContainer([res])
+        >>> results.to_hdf5(path, compression='gzip', shuffle=True,
+        ...                 chunks=(256, 513))
+        >>> with h5py.File(path, 'r') as h5_file:
+        ...     value = h5_file['spectrogram/data_object/value']
+        ...     print value.compression, value.chunks
+        gzip (256, 513)
+        >>> os.close(fd); os.remove(path)
+        """
+        if self._is_h5_sink(output_file):
+            self._close_h5_sink(result_options, pyramids, options)
+            return
+
         # Open HDF5 file and save dataset (overwrite any existing file)
         with h5py.File(output_file, 'w') as h5_file:
+            self._write_hdf5(h5_file, result_options, pyramids, options)
+
+    def _write_hdf5(self, h5_file, result_options, pyramids, options):
+        for res in self.values():
+            res_options = dict(options)
+            if result_options and res.id in result_options:
+                res_options.update(result_options[res.id])
+            build_pyramid = (pyramids and res.data_mode == 'value' and
+                             res.time_mode == 'framewise')
+            res.to_hdf5(h5_file, build_pyramid=build_pyramid, **res_options)
+
+    def _close_h5_sink(self, result_options, pyramids, options):
+        h5_file = self._h5_sink
+        streamed = [res for res in self.values()
+                    if isinstance(res.data_object['value'], h5py.Dataset) and
+                    res.data_object['value'].file == h5_file]
+        if self._h5_sink_flushed:
+            # Written again: keep the streamed values aside while the
+            # results are rewritten
+            stream_group = h5_file.require_group('_stream')
+            for res in streamed:
+                h5_file.move(res.data_object['value'].name,
+                             stream_group.name + '/' + res.id)
             for res in self.values():
-                res.to_hdf5(h5_file)
+                if res.id in h5_file:
+                    del h5_file[res.id]
+        self._write_hdf5(h5_file, result_options, pyramids, options)
+        # Remove the values which have not been stored in a result
+        if '_stream' in h5_file:
+            del h5_file['_stream']
+        # The file stays open for writing: the streamed values are read
+        # from it until close() is called
+        h5_file.flush()
+        self._h5_sink_flushed = True
 
     @staticmethod
-    def from_hdf5(input_file):
+    def from_hdf5(input_file, lazy=False):
+        """Load the results from a HDF5 file
+
+        If lazy is True, the data of the results are read from the file
+        only when they are accessed, e.g. through time_slice(). Each result
+        holds a reference to the file, which stays open until close() is
+        called on the container or the results are garbage collected.
+        """
         import h5py
         # TODO : enable import for yaafe hdf5 format
 
@@ -1040,15 +1551,56 @@ class AnalyzerResultContainer(dict):
         results = AnalyzerResultContainer()
         try:
             for group in h5_file.values():
-                result = AnalyzerResult.from_hdf5(group)
+                result = AnalyzerResult.from_hdf5(group, lazy=lazy)
+                if lazy:
+                    result._h5_file = h5_file
                 results.add(result)
         except TypeError:
             print('TypeError for HDF5 serialization')
         finally:
-            h5_file.close()  # Close the HDF5 file
+            if lazy:
+                results._h5_source = h5_file
+            else:
+                h5_file.close()  # Close the HDF5 file
 
         return results
 
+    def time_slice(self, start=None, stop=None):
+        """Return a new container holding the data of the results between the
+        times start and stop, in seconds (see AnalyzerResult.time_slice)"""
+        return AnalyzerResultContainer(
+            [result.time_slice(start, stop) for result in self.values()])
+
+    def close(self):
+        """Close the HDF5 files used by lazily loaded or streamed results
+
+        A file set by stream_to_hdf5() is removed if the results have not
+        been written to it by to_hdf5(). The data of lazily loaded results
+        cannot be read anymore.
+
+        The container can also be used as a context manager calling close()
+        on exit.
+        """
+        if self._h5_source:
+            self._h5_source.close()
+        self._h5_source = None
+        self._close_h5_sink_file()
+
+    def _close_h5_sink_file(self):
+        if self._h5_sink:
+            filename = self._h5_sink.filename
+            self._h5_sink.close()
+            if not self._h5_sink_flushed and os.path.exists(filename):
+                os.remove(filename)
+        self._h5_sink = None
+        self._h5_sink_flushed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 
 class Analyzer(Processor):
 
@@ -1135,6 +1687,42 @@ class Analyzer(Processor):
 
         return result
 
+    def new_accumulator(self, shape=(), dtype='float64', stepsize=None,
+                        stream=True):
+        """
+        Create a growable array to accumulate the framewise values of the
+        analyzer, preallocated for the expected number of frames
+
+        Parameters
+        ----------
+        shape : tuple
+            shape of the value computed for each frame
+        dtype : str
+            data type of the values
+        stepsize : int
+            number of samples between two values, input_stepsize by default
+        stream : bool
+            if the results of the pipe are streamed to a HDF5 file
+            (see AnalyzerResultContainer.stream_to_hdf5), write the values
+            to this file as they are computed. Should be False for values
+            which are not stored as is in a result.
+
+        Returns
+        -------
+        Accumulator or h5tools.DatasetAccumulator
+        """
+        results = self.process_pipe.results if self.process_pipe else None
+        if stream and results is not None and results._h5_sink is not None:
+            return results.new_hdf5_accumulator(shape=shape, dtype=dtype)
+
+        if stepsize is None:
+            stepsize = self.input_stepsize
+        if self.source_totalframes and stepsize:
+            size_hint = self.source_totalframes // stepsize + 1
+        else:
+            size_hint = None
+        return Accumulator(shape=shape, dtype=dtype, size_hint=size_hint)
+
 DOCTEST_ALIAS = {'wav_file':
                  'https://github.com/yomguy/timeside-samples/raw/master/samples/sweep.mp3'}
 
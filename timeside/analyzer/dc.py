@@ -37,7 +37,8 @@ class MeanDCShift(Analyzer):
               totalframes=None):
         super(MeanDCShift, self).setup(
             channels, samplerate, blocksize, totalframes)
-        self.values = numpy.array([0])
+        self.values = self.new_accumulator(stream=False)
+        self.values.append(0)
 
     @staticmethod
     @interfacedoc
@@ -56,11 +57,11 @@ class MeanDCShift(Analyzer):
 
     def process(self, frames, eod=False):
         if frames.size:
-            self.values = numpy.append(self.values, numpy.mean(frames))
+            self.values.append(numpy.mean(frames))
         return frames, eod
 
     def post_process(self):
         dc_result = self.new_result(data_mode='value', time_mode='global')
         dc_result.data_object.value = numpy.round(
-            numpy.mean(100 * self.values), 3)
+            numpy.mean(100 * self.values.data), 3)
         self.process_pipe.results.add(dc_result)
@@ -39,3 +39,244 @@ def dict_from_hdf5(dict_like, h5group):
     # Read attributes
     for name, value in h5group.attrs.items():
         dict_like[name] = value
+
+
+class DatasetAccumulator(object):
+
+    """
+    Growable array of rows of a fixed shape written in a resizable and
+    chunked HDF5 dataset
+
+    It has the same interface as timeside.analyzer.utils.Accumulator but
+    only keeps the rows of the current chunk in memory. The data property
+    returns the h5py dataset. The compression filters are set as in
+    dataset_options().
+    """
+
+    # Size in bytes of the chunks
+    chunk_bytes = 1024 * 1024
+
+    def __init__(self, h5group, name, shape=(), dtype='float64',
+                 compression=None, compression_opts=None, shuffle=False):
+        import numpy
+
+        self.shape = tuple(shape)
+        self.dtype = numpy.dtype(dtype)
+        row_bytes = max(self.dtype.itemsize * int(numpy.prod(self.shape)), 1)
+        self.chunk_rows = max(self.chunk_bytes // row_bytes, 1)
+        options = dataset_options(numpy.empty(0), compression=compression,
+                                  compression_opts=compression_opts,
+                                  shuffle=shuffle)
+        options['chunks'] = (self.chunk_rows,) + self.shape
+        self.dataset = h5group.create_dataset(
+            name, shape=(0,) + self.shape, maxshape=(None,) + self.shape,
+            dtype=self.dtype, **options)
+        self._buffer = numpy.empty((self.chunk_rows,) + self.shape,
+                                   dtype=self.dtype)
+        self._buffered = 0
+
+    def __len__(self):
+        return len(self.dataset) + self._buffered
+
+    def flush(self):
+        "Write the buffered rows to the dataset"
+        if self._buffered:
+            length = len(self.dataset)
+            self.dataset.resize(length + self._buffered, axis=0)
+            self.dataset[length:] = self._buffer[:self._buffered]
+            self._buffered = 0
+
+    def append(self, row):
+        "Append a single row"
+        self._buffer[self._buffered] = row
+        self._buffered += 1
+        if self._buffered == self.chunk_rows:
+            self.flush()
+
+    def extend(self, rows):
+        "Append several rows given as an array of shape (n,) + shape"
+        import numpy
+
+        rows = numpy.asarray(rows)
+        pos = 0
+        while pos < len(rows):
+            count = min(self.chunk_rows - self._buffered, len(rows) - pos)
+            self._buffer[self._buffered:self._buffered + count] = \
+                rows[pos:pos + count]
+            self._buffered += count
+            pos += count
+            if self._buffered == self.chunk_rows:
+                self.flush()
+
+    @property
+    def data(self):
+        "The h5py dataset holding the accumulated rows"
+        self.flush()
+        return self.dataset
+
+
+def dataset_options(data, compression=None, compression_opts=None,
+                    shuffle=False, chunks=None):
+    """
+    Return the keyword arguments of h5py create_dataset() setting the
+    chunk shape and the filters of a dataset storing data
+
+    Parameters
+    ----------
+    data : numpy array
+    compression : str
+        compression filter: 'gzip', 'lzf' or None
+    compression_opts : int
+        compression level of the gzip filter (0-9)
+    shuffle : bool
+        enable the shuffle filter, which usually improves the compression
+        of numeric data
+    chunks : tuple or True
+        chunk shape, clipped to the shape of data. If True or if a filter is
+        enabled, let h5py guess it.
+    """
+    options = {}
+    if compression is not None:
+        options['compression'] = compression
+        if compression_opts is not None:
+            options['compression_opts'] = compression_opts
+    if shuffle:
+        options['shuffle'] = True
+    if chunks is not None and chunks is not True:
+        options['chunks'] = tuple(max(min(chunk, size), 1)
+                                  for chunk, size in zip(chunks, data.shape))
+    elif chunks or options:
+        options['chunks'] = True
+    return options
+
+
+# Version of the repr() strings written by object_to_hdf5(), stored in the
+# 'repr_version' attribute of their dataset. The datasets written before
+# have no such attribute and may hold any repr(), numpy arrays included.
+REPR_VERSION = 1
+
+
+def literal_eval(text, legacy=False):
+    """
+    Evaluate the repr() of python literals, nan and inf included
+
+    Nothing is evaluated: the syntax tree of the text is walked and only
+    literals are rebuilt. If legacy is True, the array(...) and numpy
+    scalar calls found in the repr() strings written before REPR_VERSION
+    are also rebuilt, with a literal value and a known data type. Any other
+    expression raises a ValueError.
+    """
+    import ast
+    import numpy
+
+    names = {'None': None, 'True': True, 'False': False,
+             'nan': float('nan'), 'inf': float('inf')}
+    if legacy:
+        types = dict((name, numpy.dtype(name).type)
+                     for name in numpy.sctypeDict
+                     if isinstance(name, str) and name.isalnum())
+    else:
+        types = {}
+
+    def dtype(node):
+        if isinstance(node, ast.Name) and node.id in types:
+            return numpy.dtype(types[node.id])
+        if isinstance(node, ast.Str):
+            return numpy.dtype(node.s)
+        raise ValueError('unknown data type in %r' % text)
+
+    def convert(node):
+        if isinstance(node, (ast.Num, ast.Str)):
+            return node.n if isinstance(node, ast.Num) else node.s
+        if isinstance(node, ast.Name) and node.id in names:
+            return names[node.id]
+        if isinstance(node, ast.Tuple):
+            return tuple(convert(item) for item in node.elts)
+        if isinstance(node, ast.List):
+            return [convert(item) for item in node.elts]
+        if isinstance(node, ast.Dict):
+            return dict((convert(key), convert(value))
+                        for key, value in zip(node.keys, node.values))
+        if (isinstance(node, ast.UnaryOp) and
+                isinstance(node.op, (ast.UAdd, ast.USub))):
+            value = convert(node.operand)
+            if isinstance(value, (int, long, float, complex)):
+                return -value if isinstance(node.op, ast.USub) else value
+        if (isinstance(node, ast.BinOp) and
+                isinstance(node.op, (ast.Add, ast.Sub))):
+            # Complex numbers
+            left = convert(node.left)
+            right = convert(node.right)
+            if (isinstance(left, (int, long, float)) and
+                    isinstance(right, complex)):
+                if isinstance(node.op, ast.Add):
+                    return left + right
+                return left - right
+        if (legacy and isinstance(node, ast.Call) and
+                isinstance(node.func, ast.Name) and len(node.args) == 1 and
+                node.starargs is None and node.kwargs is None):
+            value = convert(node.args[0])
+            keywords = dict((keyword.arg, keyword.value)
+                            for keyword in node.keywords)
+            if node.func.id == 'array' and set(keywords) <= set(['dtype']):
+                if 'dtype' in keywords:
+                    return numpy.array(value, dtype=dtype(keywords['dtype']))
+                return numpy.array(value)
+            if node.func.id in types and not keywords:
+                return types[node.func.id](value)
+        raise ValueError('malformed repr string, only literals are read: '
+                         '%r' % text)
+
+    return convert(ast.parse(text.strip(), mode='eval').body)
+
+
+def object_to_hdf5(h5group, name, value):
+    """
+    Save a numpy array of objects inside a h5 file group
+
+    A vector of numeric sequences (e.g. lists of various lengths) is stored
+    as a variable length numeric dataset. Any other array is stored as the
+    repr() of its list, that can only hold python literals.
+    """
+    import numpy
+    import h5py
+
+    if value.ndim == 1 and len(value):
+        try:
+            rows = [numpy.asarray(row) for row in value]
+        except ValueError:
+            rows = None
+        if rows and all(row.ndim == 1 and row.dtype.kind in 'biuf'
+                        for row in rows):
+            base_dtype = numpy.result_type(*rows)
+            dataset = h5group.create_dataset(
+                name, shape=(len(rows),),
+                dtype=h5py.special_dtype(vlen=base_dtype))
+            for index, row in enumerate(rows):
+                dataset[index] = row.astype(base_dtype)
+            return dataset
+
+    dataset = h5group.create_dataset(name, data=repr(value.tolist()),
+                                     dtype=h5py.special_dtype(vlen=str))
+    dataset.attrs['repr_version'] = REPR_VERSION
+    return dataset
+
+
+def object_from_hdf5(dataset):
+    """
+    Load a numpy array of objects saved by object_to_hdf5()
+    """
+    import numpy
+    import h5py
+
+    base_dtype = h5py.check_dtype(vlen=dataset.dtype)
+    if base_dtype in (str, unicode):
+        text = dataset[...].tolist()
+        legacy = 'repr_version' not in dataset.attrs
+        return numpy.asarray(literal_eval(text, legacy=legacy))
+
+    rows = dataset[...]
+    value = numpy.empty(len(rows), dtype=object)
+    for index, row in enumerate(rows):
+        value[index] = row.tolist()
+    return value
@@ -53,7 +53,6 @@ class IRITSpeech4Hz(Analyzer):
               totalframes=None):
         super(IRITSpeech4Hz, self).setup(
             channels, samplerate, blocksize, totalframes)
-        self.energy4hz = []
         # Classification
         self.threshold = 2.0
 
@@ -67,6 +66,8 @@ class IRITSpeech4Hz(Analyzer):
         self.nbFilters = 30
         self.modulLen = 2.0
         self.melFilter = melFilterBank(self.nbFilters, self.nFFT, samplerate)
+        self.energy4hz = self.new_accumulator(shape=(self.nbFilters,),
+                                              stream=False)
 
     @staticmethod
     @interfacedoc
@@ -114,8 +115,7 @@ class IRITSpeech4Hz(Analyzer):
         num = firwin(self.orderFilter, Wn, pass_zero=False)
 
         # Energy on the frequency range
-        self.energy4hz = array(self.energy4hz)
-        energy = lfilter(num, 1, self.energy4hz.T, 0)
+        energy = lfilter(num, 1, self.energy4hz.data.T, 0)
         energy = sum(energy)
 
         # Normalization
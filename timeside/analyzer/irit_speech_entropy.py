@@ -39,7 +39,7 @@ class IRITSpeechEntropy(Analyzer):
               totalframes=None):
         super(IRITSpeechEntropy, self).setup(
             channels, samplerate, blocksize, totalframes)
-        self.entropyValue = []
+        self.entropyValue = self.new_accumulator(stream=False)
         self.threshold = 0.4
         self.smoothLen = 5
         self.modulLen = 2
@@ -68,7 +68,7 @@ class IRITSpeechEntropy(Analyzer):
 
     def post_process(self):
 
-        entropyValue = array(self.entropyValue)
+        entropyValue = self.entropyValue.data
         w = self.modulLen * self.samplerate() / self.blocksize()
         modulentropy = computeModulation(entropyValue, w, False)
         confEntropy = array(modulentropy - self.threshold) / self.threshold
@@ -39,7 +39,7 @@ class Level(Analyzer):
         # max_level
         self.max_value = 0
         # rms_level
-        self.mean_values = np.array([])
+        self.mean_values = self.new_accumulator(stream=False)
 
     @staticmethod
     @interfacedoc
@@ -63,8 +63,7 @@ class Level(Analyzer):
             if max_value > self.max_value:
                 self.max_value = max_value
             # rms_level
-            self.mean_values = np.append(self.mean_values,
-                                         np.mean(np.square(frames)))
+            self.mean_values.append(np.mean(np.square(frames)))
         return frames, eod
 
     def post_process(self):
@@ -86,7 +85,7 @@ class Level(Analyzer):
         rms_level.id_metadata.id += '.' + "rms"
         rms_level.id_metadata.name += ' ' + "RMS"
 
-        rms_val = np.sqrt(np.mean(self.mean_values))
+        rms_val = np.sqrt(np.mean(self.mean_values.data))
 
         if rms_val == 0:
             rms_val = MACHINE_EPSILON
@@ -119,10 +119,25 @@ def frames_adapter(process_func):
     >>> frames_, eod_ = process(analyzer,frames,eod)
     >>> analyzer.frames
     [array([0, 1, 2, 3]), array([3, 4, 5, 6]), array([6, 7, 8, 9]), array([ 9, 10, 11, 12]), array([12, 13,  0,  0])]
+
+    If the analyzer defines a `process_batch(frames_matrix, eod)` method,
+    it is called instead of process with all the adapted frames of the block
+    stacked as the rows of a single read-only strided view, without copy:
+
+    >>> class Fake_Batch_Analyzer(Fake_Analyzer):
+    ...     def process_batch(self, frames_matrix, eod):
+    ...         self.frames.append(frames_matrix)
+    >>> analyzer = Fake_Batch_Analyzer()
+    >>> frames_, eod_ = process(analyzer, np.asarray(range(0,12)), False)
+    >>> analyzer.frames
+    [array([[0, 1, 2, 3],
+           [3, 4, 5, 6],
+           [6, 7, 8, 9]])]
     '''
 
     import functools
     import numpy as np
+    from numpy.lib.stride_tricks import as_strided
 
     class framesBuffer(object):
 
@@ -131,7 +146,10 @@ def frames_adapter(process_func):
             self.stepsize = stepsize
             self.buffer = None
 
-        def frames(self, frames, eod):
+        def frames_matrix(self, frames, eod):
+            """Return all the complete frames as a single 2-D view
+            of shape (nb_frames, blocksize) + frames.shape[1:] and the
+            list of their eod flags"""
             if self.buffer is not None:
                 stack = np.concatenate([self.buffer, frames])
             else:
@@ -161,8 +179,16 @@ def frames_adapter(process_func):
             if eod and len(eod_list):
                 eod_list[-1] = eod
 
-            for index, eod in zip(xrange(0, nb_frames * self.stepsize, self.stepsize), eod_list):
-                yield (stack[index:index + self.blocksize], eod)
+            matrix = as_strided(
+                stack,
+                shape=(nb_frames, self.blocksize) + stack.shape[1:],
+                strides=(self.stepsize * stack.strides[0],) + stack.strides)
+            return matrix, eod_list
+
+        def frames(self, frames, eod):
+            matrix, eod_list = self.frames_matrix(frames, eod)
+            for adapted_frames, adapted_eod in zip(matrix, eod_list):
+                yield (adapted_frames, adapted_eod)
 
     @functools.wraps(process_func)
     def wrapper(analyzer, frames, eod):
@@ -172,8 +198,17 @@ def frames_adapter(process_func):
                                                   analyzer.input_stepsize)
 
         # Processing
-        for adapted_frames, adapted_eod in analyzer.frames_buffer.frames(frames, eod):
-            process_func(analyzer, adapted_frames, adapted_eod)
+        if hasattr(analyzer, 'process_batch'):
+            # All the frames of the block are passed at once
+            # as overlapping rows of a read-only matrix
+            matrix, eod_list = analyzer.frames_buffer.frames_matrix(frames,
+                                                                    eod)
+            matrix.flags.writeable = False
+            analyzer.process_batch(matrix, eod)
+        else:
+            for adapted_frames, adapted_eod in analyzer.frames_buffer.frames(
+                    frames, eod):
+                process_func(analyzer, adapted_frames, adapted_eod)
 
         return frames, eod
     return wrapper
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014 Parisson SARL
+
+# This file is part of TimeSide.
+
+# TimeSide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+
+# TimeSide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with TimeSide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Multi-resolution min/max/mean pyramids of framewise data
+
+Level k of a pyramid summarizes the frames of the data by buckets of 2**k
+frames: each row holds the minimum, the maximum and the mean of the frames
+of a bucket, the last bucket holding the remaining frames. Level 0 is the
+data itself and is not stored in the pyramid.
+
+>>> data = numpy.arange(10.)
+>>> levels = build_pyramid(data)
+>>> len(levels)
+4
+>>> levels[0]['max']
+array([ 1.,  3.,  5.,  7.,  9.])
+>>> levels[2]['mean']
+array([ 3.5,  8.5])
+"""
+
+from __future__ import division
+
+import numpy
+
+# Number of frames read at once from the data
+BLOCK_FRAMES = 2 ** 16
+
+
+def level_lengths(length, min_length=1):
+    """Return the number of rows of the levels 1, 2, ... of the pyramid of
+    data of the given length, the last level being the first one with no
+    more than min_length rows"""
+    lengths = []
+    while length > min_length:
+        length = -(-length // 2)
+        lengths.append(length)
+    return lengths
+
+
+class PyramidBuilder(object):
+
+    """Reduce blocks of frames into every level of a pyramid as they arrive
+
+    Only the last bucket of each level, which may still get frames from the
+    next block, is kept in memory: the complete rows of a level are passed
+    to the extend() method of its accumulators, which may write them to a
+    file (see h5tools.DatasetAccumulator).
+
+    Parameters
+    ----------
+    sinks : list of dict
+        sinks[k - 1] holds the accumulators of the 'min', 'max' and 'mean'
+        rows of level k
+    mean_dtype : numpy dtype
+        dtype of the mean rows
+    """
+
+    def __init__(self, sinks, mean_dtype):
+        self.sinks = sinks
+        self.mean_dtype = mean_dtype
+        # Bucket of each level waiting for the bucket paired with it
+        self._pending = [None] * len(sinks)
+        self._empty = None
+
+    def extend(self, block):
+        "Reduce a block of frames into the levels"
+        block = numpy.asarray(block)
+        if self._empty is None:
+            self._empty = self._frames(block[:0])
+        self._reduce(0, self._frames(block), final=False)
+
+    def close(self):
+        "Write the last buckets of the levels"
+        if self._empty is not None:
+            self._reduce(0, self._empty, final=True)
+
+    @staticmethod
+    def _frames(block):
+        return {'min': block, 'max': block,
+                'sum': block.astype('float64'),
+                'count': numpy.ones(len(block))}
+
+    def _reduce(self, index, rows, final):
+        """Reduce the rows of level `index` by pairs into the next level"""
+        if index == len(self.sinks):
+            return
+        pending = self._pending[index]
+        if pending is not None:
+            rows = dict((name, numpy.concatenate([pending[name], rows[name]]))
+                        for name in rows)
+            self._pending[index] = None
+        length = len(rows['count'])
+        if length % 2 and not final:
+            self._pending[index] = dict((name, rows[name][-1:])
+                                        for name in rows)
+            rows = dict((name, rows[name][:-1]) for name in rows)
+            length -= 1
+        if not length:
+            if final:
+                self._reduce(index + 1, self._empty, final)
+            return
+
+        indices = numpy.arange(0, length, 2)
+        next_rows = {
+            'min': numpy.minimum.reduceat(rows['min'], indices, axis=0),
+            'max': numpy.maximum.reduceat(rows['max'], indices, axis=0),
+            'sum': numpy.add.reduceat(rows['sum'], indices, axis=0),
+            'count': numpy.add.reduceat(rows['count'], indices)}
+        shape = (-1,) + (1,) * (next_rows['sum'].ndim - 1)
+        mean = next_rows['sum'] / next_rows['count'].reshape(shape)
+        sink = self.sinks[index]
+        sink['min'].extend(next_rows['min'])
+        sink['max'].extend(next_rows['max'])
+        sink['mean'].extend(mean.astype(self.mean_dtype))
+        self._reduce(index + 1, next_rows, final)
+
+
+def _mean_dtype(data):
+    if data.dtype.kind == 'f':
+        return data.dtype
+    return numpy.dtype('float64')
+
+
+def _feed(builder, data):
+    for start in xrange(0, len(data), BLOCK_FRAMES):
+        builder.extend(data[start:start + BLOCK_FRAMES])
+    builder.close()
+
+
+def build_pyramid(data, min_length=1):
+    """Return the levels 1, 2, ... of the pyramid of data
+
+    Parameters
+    ----------
+    data : numpy array or h5py dataset
+        framewise data, the first axis being the frame axis. It is read
+        block by block.
+    min_length : int
+        the last level is the first one with no more than min_length rows
+
+    Returns
+    -------
+    levels : list of dict
+        levels[k - 1] is level k, a dict of 'min', 'max' and 'mean' arrays
+    """
+    from timeside.analyzer.utils import Accumulator
+
+    mean_dtype = _mean_dtype(data)
+    sinks = [{'min': Accumulator(data.shape[1:], data.dtype, length),
+              'max': Accumulator(data.shape[1:], data.dtype, length),
+              'mean': Accumulator(data.shape[1:], mean_dtype, length)}
+             for length in level_lengths(len(data), min_length)]
+    _feed(PyramidBuilder(sinks, mean_dtype), data)
+    return [dict((name, sink[name].data) for name in sink) for sink in sinks]
+
+
+def select_level(length, width, nb_levels):
+    """Return the index of the coarsest level giving at least width rows
+    for length frames of data, 0 being the data itself"""
+    if length <= width or width < 1:
+        return 0
+    return min(int(numpy.floor(numpy.log2(length / width))), nb_levels)
+
+
+def pyramid_to_hdf5(levels, h5group, **options):
+    """Save the levels of a pyramid in a h5 file group, with the dataset
+    options of h5tools.dataset_options()"""
+    from timeside.analyzer import h5tools
+
+    for index, level in enumerate(levels):
+        subgroup = h5group.create_group(str(index + 1))
+        for name in ['min', 'max', 'mean']:
+            subgroup.create_dataset(
+                name, data=level[name],
+                **h5tools.dataset_options(level[name], **options))
+
+
+def build_pyramid_hdf5(data, h5group, min_length=1, compression=None,
+                       compression_opts=None, shuffle=False, chunks=None):
+    """Compute the pyramid of data and write its levels in a h5 file group
+    as they are computed, in the layout of pyramid_to_hdf5()
+
+    Unlike build_pyramid(), the memory used does not depend on the length
+    of data. The chunk shape is set by h5tools.DatasetAccumulator.
+    """
+    from timeside.analyzer import h5tools
+
+    mean_dtype = _mean_dtype(data)
+    options = dict(compression=compression,
+                   compression_opts=compression_opts, shuffle=shuffle)
+    sinks = []
+    for index, length in enumerate(level_lengths(len(data), min_length)):
+        subgroup = h5group.create_group(str(index + 1))
+        sinks.append(dict(
+            (name, h5tools.DatasetAccumulator(subgroup, name, data.shape[1:],
+                                              dtype, **options))
+            for name, dtype in [('min', data.dtype), ('max', data.dtype),
+                                ('mean', mean_dtype)]))
+    _feed(PyramidBuilder(sinks, mean_dtype), data)
+    for sink in sinks:
+        for accumulator in sink.values():
+            accumulator.flush()
+
+
+def pyramid_from_hdf5(h5group, lazy=False):
+    """Load the levels of a pyramid from a h5 file group. If lazy is True,
+    the levels are h5py datasets."""
+    levels = []
+    for index in range(1, len(h5group) + 1):
+        subgroup = h5group[str(index)]
+        if lazy:
+            levels.append(dict((name, subgroup[name])
+                               for name in ['min', 'max', 'mean']))
+        else:
+            levels.append(dict((name, subgroup[name][...])
+                               for name in ['min', 'max', 'mean']))
+    return levels
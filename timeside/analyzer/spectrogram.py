@@ -22,16 +22,35 @@
 from timeside.core import implements, interfacedoc
 from timeside.analyzer.core import Analyzer
 from timeside.api import IAnalyzer
-from timeside.analyzer.preprocessors import downmix_to_mono, frames_adapter
+from timeside.analyzer.stft import STFT
 import numpy as np
 
 
 class Spectrogram(Analyzer):
 
-    """Spectrogram analyzer"""
+    """Spectrogram analyzer
+
+    The spectra are computed by a STFT parent processor, which is shared
+    with the other analyzers of the pipe using the same STFT parameters.
+
+    Parameters
+    ----------
+    blocksize : int
+        size of the analysis frames
+    stepsize : int
+        hop size between the frames, blocksize / 2 by default
+    fft_size : int
+        size of the FFT, blocksize by default
+    window : str or tuple
+        analysis window as accepted by scipy.signal.get_window,
+        'boxcar' (no windowing) by default
+    dtype : str
+        data type of the spectrogram values
+    """
     implements(IAnalyzer)
 
-    def __init__(self, blocksize=2048, stepsize=None, fft_size=None):
+    def __init__(self, blocksize=2048, stepsize=None, fft_size=None,
+                 window='boxcar', dtype='float32'):
         super(Spectrogram, self).__init__()
 
         self.input_blocksize = blocksize
@@ -45,13 +64,20 @@ class Spectrogram(Analyzer):
         else:
             self.FFT_SIZE = fft_size
 
-        self.values = []
+        self.dtype = np.dtype(dtype)
+
+        self.parents.append(STFT(blocksize=self.input_blocksize,
+                                 stepsize=self.input_stepsize,
+                                 fft_size=self.FFT_SIZE,
+                                 window=window))
 
     @interfacedoc
     def setup(self, channels=None, samplerate=None,
               blocksize=None, totalframes=None):
         super(Spectrogram, self).setup(channels, samplerate,
                                        blocksize, totalframes)
+        self.values = self.new_accumulator(shape=(self.FFT_SIZE // 2 + 1,),
+                                           dtype=self.dtype)
 
     @staticmethod
     @interfacedoc
@@ -68,14 +94,16 @@ class Spectrogram(Analyzer):
     def unit():
         return ""
 
-    @downmix_to_mono
-    @frames_adapter
+    @property
+    def stft(self):
+        return self.parents[0]
+
     def process(self, frames, eod=False):
-            self.values.append(np.abs(np.fft.rfft(frames, self.FFT_SIZE)))
-            return frames, eod
+        self.values.extend(np.abs(self.stft.spectra))
+        return frames, eod
 
     def post_process(self):
         spectrogram = self.new_result(data_mode='value', time_mode='framewise')
         spectrogram.parameters = {'FFT_SIZE': self.FFT_SIZE}
-        spectrogram.data_object.value = self.values
+        spectrogram.data_object.value = self.values.data
         self.process_pipe.results.add(spectrogram)
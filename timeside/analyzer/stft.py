@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014 Parisson SARL
+
+# This file is part of TimeSide.
+
+# TimeSide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+
+# TimeSide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with TimeSide.  If not, see <http://www.gnu.org/licenses/>.
+
+from timeside.core import Processor
+from timeside.analyzer.preprocessors import downmix_to_mono, frames_adapter
+import numpy as np
+from scipy.signal import get_window
+
+
+class STFT(Processor):
+
+    """Short-time Fourier transform frontend
+
+    This processor does not produce any result: it computes the STFT of the
+    mono downmix of each decoded block so that spectral analyzers declaring
+    it as a parent can share it. The pipe runs a single STFT for all
+    the parents with the same parameters.
+
+    After each call to process, `spectra` holds the complex spectra of the
+    frames completed by the block, one frame per row.
+
+    Parameters
+    ----------
+    blocksize : int
+        size of the analysis frames
+    stepsize : int
+        hop size between the frames, blocksize / 2 by default
+    fft_size : int
+        size of the FFT, blocksize by default
+    window : str, tuple or array
+        analysis window as accepted by scipy.signal.get_window, or the
+        blocksize samples of the window, 'boxcar' (no windowing) by default
+    """
+
+    def __init__(self, blocksize=2048, stepsize=None, fft_size=None,
+                 window='boxcar'):
+        super(STFT, self).__init__()
+
+        self.input_blocksize = blocksize
+        if stepsize:
+            self.input_stepsize = stepsize
+        else:
+            self.input_stepsize = blocksize / 2
+
+        if not fft_size:
+            self.fft_size = blocksize
+        else:
+            self.fft_size = fft_size
+
+        self.window_type = window
+        if isinstance(window, np.ndarray):
+            self.window = window
+        elif window == 'boxcar':
+            self.window = None
+        else:
+            self.window = get_window(window, blocksize)
+
+    @staticmethod
+    def id():
+        return "stft"
+
+    def setup(self, channels=None, samplerate=None, blocksize=None,
+              totalframes=None):
+        super(STFT, self).setup(channels, samplerate, blocksize, totalframes)
+        self.spectra = np.empty((0, self.fft_size // 2 + 1),
+                                dtype='complex128')
+
+    def equivalent(self, other):
+        return (isinstance(other, STFT) and
+                other.input_blocksize == self.input_blocksize and
+                other.input_stepsize == self.input_stepsize and
+                other.fft_size == self.fft_size and
+                np.array_equal(other.window, self.window))
+
+    @downmix_to_mono
+    @frames_adapter
+    def process(self, frames, eod=False):
+        self.process_batch(frames[np.newaxis, :], eod)
+        return frames, eod
+
+    def process_batch(self, frames_matrix, eod=False):
+        if self.window is not None:
+            frames_matrix = frames_matrix * self.window
+        self.spectra = np.fft.rfft(frames_matrix, self.fft_size, axis=1)
@@ -24,6 +24,62 @@ import numpy as np
 MACHINE_EPSILON = np.finfo(np.float32).eps
 
 
+class Accumulator(object):
+
+    """Growable array of rows of a fixed shape
+
+    Rows are appended into a preallocated array whose capacity is doubled
+    when full, so that appending n rows costs O(n) copies instead of the
+    O(n^2) of repeated numpy.append or the per-row overhead of a list.
+
+    >>> acc = Accumulator(shape=(2,), dtype='float32', size_hint=1)
+    >>> acc.append([1, 2])
+    >>> acc.extend(np.ones((3, 2)))
+    >>> len(acc)
+    4
+    >>> acc.data
+    array([[ 1.,  2.],
+           [ 1.,  1.],
+           [ 1.,  1.],
+           [ 1.,  1.]], dtype=float32)
+    """
+
+    def __init__(self, shape=(), dtype='float64', size_hint=None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self._length = 0
+        self._data = np.empty((max(size_hint or 0, 1),) + self.shape,
+                              dtype=self.dtype)
+
+    def __len__(self):
+        return self._length
+
+    def _reserve(self, length):
+        if length > len(self._data):
+            capacity = max(length, 2 * len(self._data))
+            data = np.empty((capacity,) + self.shape, dtype=self.dtype)
+            data[:self._length] = self._data[:self._length]
+            self._data = data
+
+    def append(self, row):
+        "Append a single row"
+        self._reserve(self._length + 1)
+        self._data[self._length] = row
+        self._length += 1
+
+    def extend(self, rows):
+        "Append several rows given as an array of shape (n,) + shape"
+        rows = np.asarray(rows)
+        self._reserve(self._length + len(rows))
+        self._data[self._length:self._length + len(rows)] = rows
+        self._length += len(rows)
+
+    @property
+    def data(self):
+        "View of the accumulated rows"
+        return self._data[:self._length]
+
+
 def downsample_blocking(frames, hop_s, dtype='float32'):
     # downmixing to one channel
     if len(frames.shape) != 1:
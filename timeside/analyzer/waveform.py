@@ -19,10 +19,10 @@
 
 # Author: Paul Brossier <piem@piem.org>
 
+import numpy as np
 from timeside.core import implements, interfacedoc
 from timeside.analyzer.core import Analyzer
 from timeside.api import IAnalyzer
-import numpy as np
 
 
 class Waveform(Analyzer):
@@ -40,7 +40,8 @@ class Waveform(Analyzer):
               blocksize=None, totalframes=None):
         super(Waveform, self).setup(channels, samplerate,
                                     blocksize, totalframes)
-        self.values = []
+        # Created with the data type of the first frames
+        self.values = None
         self.result_blocksize = 1
         self.result_stepsize = 1
 
@@ -62,10 +63,17 @@ class Waveform(Analyzer):
 #    @downmix_to_mono
 #    @frames_adapter
     def process(self, frames, eod=False):
-        self.values.append(frames)
+        if self.values is None:
+            self.values = self.new_accumulator(shape=frames.shape[1:],
+                                               dtype=frames.dtype,
+                                               stepsize=1)
+        self.values.extend(frames)
         return frames, eod
 
     def post_process(self):
         waveform = self.new_result(data_mode='value', time_mode='framewise')
-        waveform.data_object.value = np.vstack(self.values)
+        if self.values is None:
+            waveform.data_object.value = np.empty((0, self.input_channels))
+        else:
+            waveform.data_object.value = self.values.data
         self.process_pipe.results.add(waveform)
@@ -141,6 +141,12 @@ class IEncoder(IProcessor):
     def mime_type():
         """Return the mime type corresponding to this encode format"""
 
+    def encoding_pipe(self):
+        """Return the description of the GStreamer elements encoding the raw
+        audio pushed in the appsrc, up to the output of the muxer, or None if
+        the encoder needs a pipeline of its own and can not be branched on a
+        pipeline shared with other encoders"""
+
     def set_metadata(self, metadata):
         """Set the metadata to be embedded in the encoded output.
 
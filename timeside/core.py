@@ -26,6 +26,7 @@ from .exceptions import Error, PIDError, ApiError
 import re
 import numpy
 import uuid
+import inspect
 
 import gobject
 gobject.threads_init()
@@ -36,6 +37,9 @@ __all__ = ['Processor', 'MetaProcessor', 'implements', 'abstract',
 
 _processors = {}
 
+# Interval in seconds at which a streaming pipe checks its thread is alive
+STREAM_POLL_INTERVAL = 0.5
+
 
 class MetaProcessor(MetaComponent):
     """Metaclass of the Processor class, used mainly for ensuring
@@ -82,6 +86,12 @@ class Processor(Component):
     abstract()
     implements(IProcessor)
 
+    def __new__(cls, *args, **kwargs):
+        instance = super(Processor, cls).__new__(cls)
+        # Keep the construction arguments to compare processors
+        instance._init_args = (args, kwargs)
+        return instance
+
     def __init__(self):
         super(Processor, self).__init__()
 
@@ -148,6 +158,35 @@ class Processor(Component):
     def uuid(self):
         return str(self.UUID)
 
+    def init_parameters(self):
+        """Return the arguments the processor was constructed with, as a dict
+        including the default values of the arguments"""
+        args, kwargs = getattr(self, '_init_args', ((), {}))
+        init = type(self).__init__
+        try:
+            params = inspect.getcallargs(init, self, *args, **kwargs)
+        except TypeError:
+            return {'args': args, 'kwargs': kwargs}
+        # Drop the instance itself
+        params.pop(inspect.getargspec(init).args[0])
+        return params
+
+    def equivalent(self, other):
+        """Return True if other does the same processing as this processor,
+        so that a pipe can run only one of them when they are parents of
+        other processors or analyzers
+
+        By default, processors of the same class and id constructed with
+        the same arguments are equivalent."""
+        if other is self:
+            return True
+        if type(other) is not type(self) or other.id() != self.id():
+            return False
+        params, other_params = self.init_parameters(), other.init_parameters()
+        return (sorted(params.keys()) == sorted(other_params.keys()) and
+                all(_same_value(params[key], other_params[key])
+                    for key in params))
+
     def __del__(self):
         self.release()
 
@@ -155,6 +194,17 @@ class Processor(Component):
         return ProcessPipe(self, other)
 
 
+def _same_value(value, other):
+    if value is other:
+        return True
+    if isinstance(value, numpy.ndarray) or isinstance(other, numpy.ndarray):
+        return numpy.array_equal(value, other)
+    try:
+        return bool(value == other)
+    except Exception:
+        return False
+
+
 class FixedSizeInputAdapter(object):
 
     """Utility to make it easier to write processors which require fixed-sized
@@ -252,6 +302,11 @@ class ProcessPipe(object):
     Attributes:
         processor: List of all processors in the Process pipe
         results : Results Container for all the analyzers of the Pipe process
+
+    An analyzer equivalent to one already in the pipe (see
+    Processor.equivalent) is not added to it: it is never setup, processed
+    nor post-processed and only its results, read through the pipe, are
+    valid.
 """
 
     def __init__(self, *others):
@@ -259,6 +314,7 @@ class ProcessPipe(object):
         self._streamer = None
         self._stream_thread = False
         self._is_running = False
+        self._cancelled = False
 
         self |= others
 
@@ -271,8 +327,24 @@ class ProcessPipe(object):
 
     def __ior__(self, other):
         if isinstance(other, Processor):
-            for parent in other.parents:
-                self |= parent
+            shared = self._equivalent_processor(other)
+            if shared is not None and (
+                    shared is other or
+                    getattr(other, 'type', None) == 'analyzer'):
+                # The results of an analyzer are those of the pipe, so an
+                # equivalent analyzer already in the pipe computes them. The
+                # duplicate is never setup, processed nor post-processed:
+                # only its results, read through the pipe, are valid.
+                other.parents = list(shared.parents)
+                other.process_pipe = self
+                return self
+            for index, parent in enumerate(other.parents):
+                shared = self._equivalent_processor(parent)
+                if shared is not None:
+                    # Share the processor already in the pipe
+                    other.parents[index] = shared
+                else:
+                    self |= parent
             self.processors.append(other)
             other.process_pipe = self
         elif isinstance(other, ProcessPipe):
@@ -289,6 +361,31 @@ class ProcessPipe(object):
 
         return self
 
+    def _equivalent_processor(self, processor):
+        for item in self.processors:
+            if processor.equivalent(item):
+                return item
+        return None
+
+    def _levels(self, items):
+        """Group the items so that each item comes after all of its parents,
+        items of the same level being independent"""
+        levels = {}
+
+        def level(item):
+            if item not in levels:
+                parents_levels = [level(parent) for parent in item.parents
+                                  if parent in items]
+                levels[item] = max(parents_levels) + 1 if parents_levels else 0
+            return levels[item]
+
+        grouped = []
+        for item in items:
+            while len(grouped) <= level(item):
+                grouped.append([])
+            grouped[level(item)].append(item)
+        return grouped
+
     def __repr__(self):
         pipe = ''
         for item in self.processors:
@@ -297,11 +394,30 @@ class ProcessPipe(object):
                 pipe += ' | '
         return pipe
 
-    def run(self, channels=None, samplerate=None, blocksize=None):
-        """Setup/reset all processors in cascade"""
+    def run(self, channels=None, samplerate=None, blocksize=None,
+            workers=None):
+        """Setup/reset all processors in cascade
+
+        Parameters
+        ----------
+        channels, samplerate, blocksize : int
+            Output format requested to the source processor
+        workers : int
+            If set, the processors following the source are run concurrently
+            on a pool of `workers` threads. Each decoded block is passed to
+            all of them and the pipe waits for every processor before reading
+            the next block from the source. A processor is only run on a block
+            once its parents have processed it. Each processor thus still receives
+            the blocks in order, and post_process() is called sequentially,
+            in the pipe order, once all the blocks have been processed.
+            The results are therefore identical to a sequential run.
+            In this mode, every processor receives the source frames: the
+            output of a processor is not passed to the next one.
+        """
 
         source = self.processors[0]
         items = self.processors[1:]
+        self._cancelled = False
         source.setup(channels=channels, samplerate=samplerate,
                      blocksize=blocksize)
         source.SIG_STOP = False
@@ -336,18 +452,42 @@ class ProcessPipe(object):
 
             signal.signal(signal.SIGINT, signal_handler)
 
-        while not eod:
-            frames, eod = source.process()
-            for item in items:
-                frames, eod = item.process(frames, eod)
+        if workers:
+            from multiprocessing.pool import ThreadPool
+            pool = ThreadPool(workers)
+            levels = self._levels(items)
+        else:
+            pool = None
+
+        stopped = False
+        try:
+            while not eod:
+                frames, eod = source.process()
+                if self._cancelled:
+                    # Drain the source without processing the frames
+                    if not stopped and hasattr(source, 'stop'):
+                        source.stop()
+                    stopped = True
+                    continue
+                if pool is None:
+                    for item in items:
+                        frames, eod = item.process(frames, eod)
+                else:
+                    for level in levels:
+                        pool.map(lambda item: item.process(frames, eod), level)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
 
         if source.id() == 'gst_live_dec':
             # Restore default handler for Interruption signal
             signal.signal(signal.SIGINT, signal.SIG_DFL)
 
         # Post-processing
-        for item in items:
-            item.post_process()
+        if not self._cancelled:
+            for item in items:
+                item.post_process()
 
         # Release source
         source.release()
@@ -358,40 +498,120 @@ class ProcessPipe(object):
 
         self._is_running = False
 
-    def stream(self):
+    def cancel(self):
+        """Stop a running pipe
+
+        The source is drained without processing the remaining frames and
+        the processors are not post-processed. The processors defining a
+        cancel() method, like the encoders, are cancelled so that they
+        tear down their pipeline instead of waiting for the end of the
+        stream."""
+        self._cancelled = True
+        for item in list(self.processors):
+            if hasattr(item, 'cancel'):
+                item.cancel()
+
+    def stream(self, queue_size=None, chunk_size=None):
+        """Run the pipe in a thread and yield the chunks of its streaming
+        processor
+
+        Parameters
+        ----------
+        queue_size : int
+            maximum number of chunks waiting for the consumer, the
+            processor blocks when it is reached
+        chunk_size : int
+            if set, chunks are coalesced and yielded as strings of at least
+            chunk_size bytes, except the last one
+
+        Closing the generator, for instance when a client disconnects,
+        cancels the pipe.
+        """
         self._stream_thread = True
 
         import threading
+        import Queue
+
+        streamers = [item for item in self.processors
+                     if getattr(item, 'streaming', False)]
+        if not streamers:
+            raise TypeError('Function only available in streaming mode')
+        if queue_size is not None:
+            for streamer in streamers:
+                streamer.queue_size = queue_size
 
         class PipeThread(threading.Thread):
 
             def __init__(self, process_pipe):
                 super(PipeThread, self).__init__(name='pipe_thread')
                 self.process_pipe = process_pipe
+                self.error = None
+                self.done = False
 
             def run(self):
-                self.process_pipe.run()
+                try:
+                    self.process_pipe.run()
+                except Exception as error:
+                    self.error = error
+                    raise
+                finally:
+                    # Never leave stream() waiting for the pipe to start
+                    cond = self.process_pipe._running_cond
+                    cond.acquire()
+                    self.done = True
+                    cond.notify()
+                    cond.release()
 
+        self._running_cond = threading.Condition(threading.Lock())
         pipe_thread = PipeThread(self)
+        pipe_thread.daemon = True
         pipe_thread.start()
 
         # wait for pipe thread to be ready to stream
-        self._running_cond = threading.Condition(threading.Lock())
         self._running_cond.acquire()
-        while not self._is_running:
+        while not self._is_running and not pipe_thread.done:
             self._running_cond.wait()
         self._running_cond.release()
 
         if self._streamer is None:
+            pipe_thread.join()
+            if pipe_thread.error is not None:
+                raise pipe_thread.error
             raise TypeError('Function only available in streaming mode')
 
-        while pipe_thread.is_alive():
-            # yield count
-            chunk = self._streamer.get_stream_chunk()
-            if chunk is not None:
-                yield chunk
-            else:
-                break
+        pending = []
+        pending_size = 0
+        finished = False
+        try:
+            while True:
+                try:
+                    chunk = self._streamer.get_stream_chunk(
+                        timeout=STREAM_POLL_INTERVAL)
+                except Queue.Empty:
+                    if pipe_thread.is_alive():
+                        continue
+                    break
+                if chunk is None:
+                    break
+                if chunk_size is None:
+                    yield chunk
+                    continue
+                pending.append(chunk.data)
+                pending_size += len(pending[-1])
+                if pending_size >= chunk_size:
+                    yield ''.join(pending)
+                    pending = []
+                    pending_size = 0
+            if pending:
+                yield ''.join(pending)
+            finished = True
+        finally:
+            if not finished:
+                self.cancel()
+            pipe_thread.join()
+            self._stream_thread = False
+            if pipe_thread.error is not None and finished:
+                raise pipe_thread.error
 
     def _register_streamer(self, processor):
         if hasattr(processor, 'streaming') and processor.streaming:
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014 Parisson SARL
+#
+# This file is part of TimeSide.
+
+# TimeSide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+
+# TimeSide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with TimeSide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Persistent on-disk cache of decoded audio
+
+Decoded frames are stored as raw float32 files, along with a small JSON file
+describing the stream, and are read back as memory-mapped arrays.
+"""
+
+from __future__ import division
+
+import os
+import json
+import hashlib
+import tempfile
+
+import numpy as np
+
+CACHE_DTYPE = np.dtype('float32')
+DATA_EXT = '.f32'
+INFO_EXT = '.json'
+TMP_EXT = '.tmp'
+
+
+class DecodedCache(object):
+
+    """On-disk cache of decoded audio frames with a least recently used
+    eviction policy
+
+    Parameters
+    ----------
+    dir : str
+        directory where the decoded data is stored
+    max_size : int
+        maximum size in bytes of the cached data. If None, the cache is not
+        bounded.
+
+    >>> import tempfile, shutil
+    >>> cache_dir = tempfile.mkdtemp()
+    >>> cache = DecodedCache(cache_dir)
+    >>> key = cache.key('08301c3f', samplerate=44100, channels=2)
+    >>> cache.get(key) is None
+    True
+    >>> writer = cache.writer(key, channels=2)
+    >>> writer.append(np.ones((10, 2)))
+    >>> writer.commit(samplerate=44100)
+    >>> frames, info = cache.get(key)
+    >>> frames.shape, info['samplerate']
+    ((10, 2), 44100)
+    >>> shutil.rmtree(cache_dir)
+    """
+
+    def __init__(self, dir, max_size=None):
+        self.dir = dir
+        self.max_size = max_size
+        if not os.path.isdir(self.dir):
+            os.makedirs(self.dir)
+
+    def key(self, sha1, samplerate, channels, start=0, duration=None):
+        "Return the cache key of a decoded media segment"
+        params = '%s:%s:%s:%s:%s' % (sha1, samplerate, channels,
+                                     float(start), duration)
+        return hashlib.sha1(params).hexdigest()
+
+    def _path(self, key, ext):
+        return os.path.join(self.dir, key + ext)
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key, INFO_EXT))
+
+    def get(self, key):
+        """Return a (frames, info) tuple for the given key, where frames is
+        a read-only memory-mapped array of shape (nb_frames, channels),
+        or None if the key is not in the cache"""
+        info_path = self._path(key, INFO_EXT)
+        try:
+            with open(info_path) as f:
+                info = json.load(f)
+        except (IOError, ValueError):
+            return None
+
+        shape = (info['frames'], info['channels'])
+        if info['frames']:
+            frames = np.asarray(np.memmap(self._path(key, DATA_EXT),
+                                          dtype=CACHE_DTYPE, mode='r',
+                                          shape=shape))
+        else:
+            frames = np.empty(shape, dtype=CACHE_DTYPE)
+
+        # Mark the entry as recently used
+        os.utime(info_path, None)
+        return frames, info
+
+    def writer(self, key, channels):
+        "Return a CacheWriter storing decoded frames under the given key"
+        return CacheWriter(self, key, channels)
+
+    def remove(self, key):
+        "Remove an entry from the cache"
+        for ext in [INFO_EXT, DATA_EXT]:
+            try:
+                os.remove(self._path(key, ext))
+            except OSError:
+                pass
+
+    def entries(self):
+        """Return the list of (last access time, size, key) of the cached
+        entries, the least recently used first"""
+        entries = []
+        for filename in os.listdir(self.dir):
+            key, ext = os.path.splitext(filename)
+            if ext != INFO_EXT:
+                continue
+            try:
+                atime = os.path.getmtime(self._path(key, INFO_EXT))
+                size = os.path.getsize(self._path(key, DATA_EXT))
+            except OSError:
+                continue
+            entries.append((atime, size, key))
+        return sorted(entries)
+
+    def size(self):
+        "Total size in bytes of the cached data"
+        return sum(size for atime, size, key in self.entries())
+
+    def evict(self, keep=None):
+        """Remove the least recently used entries until the size of the
+        cache is below max_size. The key `keep` is never removed."""
+        if self.max_size is None:
+            return
+        entries = self.entries()
+        total_size = sum(size for atime, size, key in entries)
+        for atime, size, key in entries:
+            if total_size <= self.max_size:
+                break
+            if key == keep:
+                continue
+            self.remove(key)
+            total_size -= size
+
+
+class CacheWriter(object):
+
+    """Write decoded frames block by block into a DecodedCache entry
+
+    The entry is only visible in the cache once commit() has been called.
+    """
+
+    def __init__(self, cache, key, channels):
+        self.cache = cache
+        self.key = key
+        self.channels = channels
+        self.frames = 0
+        # Concurrent writers of the same key each have their own file
+        fd, self.tmp_path = tempfile.mkstemp(suffix=DATA_EXT + TMP_EXT,
+                                             prefix=key, dir=cache.dir)
+        self._file = os.fdopen(fd, 'wb')
+
+    def append(self, frames):
+        "Append a block of frames"
+        if self._file is None:
+            return
+        frames = np.ascontiguousarray(frames, dtype=CACHE_DTYPE)
+        frames = frames.reshape(-1, self.channels)
+        self._file.write(frames.data)
+        self.frames += frames.shape[0]
+
+    def commit(self, **info):
+        """Store the written frames in the cache along with the given stream
+        information"""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        os.rename(self.tmp_path, self.cache._path(self.key, DATA_EXT))
+
+        info.update(frames=self.frames, channels=self.channels)
+        fd, tmp_info_path = tempfile.mkstemp(suffix=INFO_EXT + TMP_EXT,
+                                             prefix=self.key,
+                                             dir=self.cache.dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(info, f)
+        os.rename(tmp_info_path, self.cache._path(self.key, INFO_EXT))
+
+        self.cache.evict(keep=self.key)
+
+    def abort(self):
+        "Discard the written frames"
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
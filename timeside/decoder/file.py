@@ -34,6 +34,8 @@ from timeside.tools.gstutils import gst_buffer_to_numpy_array
 import threading
 
 from timeside.decoder.utils import get_uri, get_media_uri_info, stack, get_sha1
+from timeside.decoder.utils import BlockBuffer, FramesStack
+from timeside.decoder.cache import DecodedCache
 
 import Queue
 from gst import _gst as gst
@@ -61,7 +63,8 @@ class FileDecoder(Decoder):
     def id():
         return "gst_dec"
 
-    def __init__(self, uri, start=0, duration=None, stack=False, sha1=None):
+    def __init__(self, uri, start=0, duration=None, stack=False, sha1=None,
+                 cache=None):
         """
         Construct a new FileDecoder
 
@@ -73,10 +76,15 @@ class FileDecoder(Decoder):
             start time of the segment in seconds
         duration : float
             duration of the segment in seconds
-        stack : boolean
-            keep decoded data in the stack
+        stack : boolean or str
+            keep decoded data in the stack. If 'mmap', the stack is stored
+            in a memory-mapped temporary file instead of a list in memory.
         sha1 : boolean
             compute the sha1 hash of the data
+        cache : DecodedCache or str
+            on-disk cache of the decoded data, or the directory of this
+            cache. If the decoded data is in the cache, it is read from the
+            cache instead of being decoded again.
 
         """
 
@@ -92,26 +100,51 @@ class FileDecoder(Decoder):
         else:
             self._sha1 = sha1.encode('utf8')
 
-        self.uri_total_duration = get_media_uri_info(self.uri)['duration']
+        self.uri_info = get_media_uri_info(self.uri)
+        self.uri_total_duration = self.uri_info['duration']
+
+        if isinstance(cache, basestring):
+            cache = DecodedCache(cache)
+        self.cache = cache
+        self.from_cache = False
 
         self.mimetype = None
 
     def setup(self, channels=None, samplerate=None, blocksize=None):
 
         self.eod = False
-        self.last_buffer = None
+        self.block_buffer = None
 
         if self.from_stack:
             self._frames_iterator = iter(self.process_pipe.frames_stack)
             return
 
-        if self.stack:
+        if self.stack == 'mmap':
+            self.process_pipe.frames_stack = FramesStack()
+        elif self.stack:
             self.process_pipe.frames_stack = []
 
+        # the output data format we want
+        if blocksize:
+            self.output_blocksize = blocksize
+        if samplerate:
+            self.output_samplerate = int(samplerate)
+        if channels:
+            self.output_channels = int(channels)
+
         if self.uri_duration is None:
             # Set the duration from the length of the file
             self.uri_duration = self.uri_total_duration - self.uri_start
 
+        self.cache_writer = None
+        if self.cache is not None:
+            cache_key = self._cache_key()
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._setup_from_cache(*cached)
+                return
+            self.from_cache = False
+
         if self.is_segment:
             # Check start and duration value
             if self.uri_start > self.uri_total_duration:
@@ -126,14 +159,6 @@ class FileDecoder(Decoder):
         self.discovered_cond = threading.Condition(threading.Lock())
         self.discovered = False
 
-        # the output data format we want
-        if blocksize:
-            self.output_blocksize = blocksize
-        if samplerate:
-            self.output_samplerate = int(samplerate)
-        if channels:
-            self.output_channels = int(channels)
-
         if self.is_segment:
             # Create the pipe with Gnonlin gnlurisource
             self.pipe = ''' gnlurisource name=src uri={uri}
@@ -218,6 +243,45 @@ class FileDecoder(Decoder):
             else:
                 raise IOError('no known audio stream found')
 
+        if self.cache is not None:
+            self.cache_writer = self.cache.writer(cache_key,
+                                                  self.output_channels)
+
+    def _cache_key(self):
+        # Without any requested format, the output format is the one
+        # of the first audio stream of the media
+        stream = self.uri_info['streams'][0] if self.uri_info['streams'] else {}
+        samplerate = self.output_samplerate or stream.get('samplerate')
+        channels = self.output_channels or stream.get('channels')
+        # The same segment must have the same key, whether its duration
+        # was given or resolved from the length of the media
+        return self.cache.key(self.sha1, samplerate, channels,
+                              round(self.uri_start, 6),
+                              round(self.uri_duration, 6))
+
+    def _setup_from_cache(self, frames, info):
+        self.from_cache = True
+        self.cached_frames = frames
+        self.cache_position = 0
+
+        self.output_samplerate = info['samplerate']
+        self.output_channels = info['channels']
+        self.input_samplerate = info['input_samplerate']
+        self.input_channels = info['input_channels']
+        self.input_width = info['input_width']
+        self.input_duration = info['input_duration']
+        self.input_totalframes = info['input_totalframes']
+        self.mimetype = info['mimetype']
+
+    def _cache_info(self):
+        return dict(samplerate=self.output_samplerate,
+                    input_samplerate=self.input_samplerate,
+                    input_channels=self.input_channels,
+                    input_width=self.input_width,
+                    input_duration=self.input_duration,
+                    input_totalframes=self.input_totalframes,
+                    mimetype=self.mimetype)
+
     def _autoplug_cb(self, src, arg0, arg1):
         # use the autoplug-continue callback from uridecodebin
         # to get the mimetype string
@@ -293,26 +357,38 @@ class FileDecoder(Decoder):
     def _on_new_buffer_cb(self, sink):
         buf = sink.emit('pull-buffer')
         new_array = gst_buffer_to_numpy_array(buf, self.output_channels)
-        # print 'processing new buffer', new_array.shape
-        if self.last_buffer is None:
-            self.last_buffer = new_array
-        else:
-            self.last_buffer = np.concatenate(
-                (self.last_buffer, new_array), axis=0)
-        while self.last_buffer.shape[0] >= self.output_blocksize:
-            new_block = self.last_buffer[:self.output_blocksize]
-            self.last_buffer = self.last_buffer[self.output_blocksize:]
-            # print 'queueing', new_block.shape, 'remaining',
-            # self.last_buffer.shape
+        if self.block_buffer is None:
+            self.block_buffer = BlockBuffer(self.output_blocksize,
+                                            self.output_channels)
+        for new_block in self.block_buffer.push(new_array):
             self.queue.put([new_block, False])
 
+    def _last_block(self):
+        # Remaining frames at the end of the stream
+        if self.block_buffer is None:
+            return np.empty((0, self.output_channels), dtype='float32')
+        return self.block_buffer.flush()
+
     @interfacedoc
     @stack
     def process(self):
+        if self.from_cache:
+            start = self.cache_position
+            self.cache_position += self.output_blocksize
+            frames = self.cached_frames[start:self.cache_position]
+            return frames, self.cache_position >= len(self.cached_frames)
+
         buf = self.queue.get()
         if buf == gst.MESSAGE_EOS:
-            return self.last_buffer, True
-        frames, eod = buf
+            frames, eod = self._last_block(), True
+        else:
+            frames, eod = buf
+
+        if self.cache_writer is not None:
+            self.cache_writer.append(frames)
+            if eod:
+                self.cache_writer.commit(**self._cache_info())
+                self.cache_writer = None
         return frames, eod
 
     @interfacedoc
@@ -325,6 +401,10 @@ class FileDecoder(Decoder):
 
     @interfacedoc
     def release(self):
+        if getattr(self, 'cache_writer', None) is not None:
+            # The decoding did not reach the end of the stream
+            self.cache_writer.abort()
+            self.cache_writer = None
         if self.stack:
             self.stack = False
             self.from_stack = True
@@ -357,6 +437,9 @@ class FileDecoder(Decoder):
         return self.tags
 
     def stop(self):
+        if self.from_cache or self.from_stack or not hasattr(self, 'src'):
+            # No GStreamer pipeline is running
+            return
         self.src.send_event(gst.event_new_eos())
 
 if __name__ == "__main__":
@@ -95,7 +95,7 @@ class LiveDecoder(FileDecoder):
     def setup(self, channels=None, samplerate=None, blocksize=None):
 
         self.eod = False
-        self.last_buffer = None
+        self.block_buffer = None
 
         # a lock to wait wait for gstreamer thread to be ready
         self.discovered_cond = threading.Condition(threading.Lock())
@@ -174,7 +174,7 @@ class LiveDecoder(FileDecoder):
     def process(self):
         buf = self.queue.get()
         if buf == gst.MESSAGE_EOS:
-            return self.last_buffer, True
+            return self._last_block(), True
 
         frames, eod = buf
         return frames, eod
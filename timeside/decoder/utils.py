@@ -168,6 +168,152 @@ def stack(process_func):
     return wrapper
 
 
+class BlockBuffer(object):
+
+    """Cut a stream of frames of arbitrary lengths into blocks of a fixed
+    size, without concatenating the incoming frames
+
+    Incoming frames are copied once into a preallocated block. Whenever an
+    incoming array spans a whole block while no block is pending, a view of
+    this array is handed out instead, with no copy at all.
+    A new block is allocated each time a block is handed out, so that the
+    processors may keep a reference to it.
+
+    >>> buffer = BlockBuffer(blocksize=4, channels=1)
+    >>> [block.ravel().tolist() for block in buffer.push(np.arange(6.))]
+    [[0.0, 1.0, 2.0, 3.0]]
+    >>> [block.ravel().tolist() for block in buffer.push(np.arange(6., 9.))]
+    [[4.0, 5.0, 6.0, 7.0]]
+    >>> buffer.flush().ravel().tolist()
+    [8.0]
+    >>> buffer.flush().shape
+    (0, 1)
+    """
+
+    def __init__(self, blocksize, channels, dtype='float32'):
+        self.blocksize = blocksize
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+        self._block = None
+        self._filled = 0
+
+    def __len__(self):
+        "Number of frames pending in the current block"
+        return self._filled
+
+    def push(self, frames):
+        """Append frames to the buffer and return the list of the completed
+        blocks"""
+        frames = frames.reshape(-1, self.channels)
+        nb_frames = frames.shape[0]
+        blocks = []
+        pos = 0
+        while pos < nb_frames:
+            if not self._filled and nb_frames - pos >= self.blocksize:
+                # Aligned on a block boundary: no copy
+                blocks.append(frames[pos:pos + self.blocksize])
+                pos += self.blocksize
+                continue
+            if self._block is None:
+                self._block = np.empty((self.blocksize, self.channels),
+                                       dtype=self.dtype)
+            count = min(self.blocksize - self._filled, nb_frames - pos)
+            self._block[self._filled:self._filled + count] = \
+                frames[pos:pos + count]
+            self._filled += count
+            pos += count
+            if self._filled == self.blocksize:
+                blocks.append(self._block)
+                self._block = None
+                self._filled = 0
+        return blocks
+
+    def flush(self):
+        "Return the pending incomplete block and reset the buffer"
+        if self._block is None:
+            return np.empty((0, self.channels), dtype=self.dtype)
+        block = self._block[:self._filled]
+        self._block = None
+        self._filled = 0
+        return block
+
+
+class FramesStack(object):
+
+    """Stack of (frames, eod) blocks stored contiguously in a temporary file
+
+    It behaves like the list used as the default frames stack but the frames
+    are kept on disk and replayed as views of a read-only memory-mapped
+    array, so that long media can be stacked without holding them in memory.
+
+    >>> frames_stack = FramesStack()
+    >>> frames_stack.append((np.ones((4, 2)), False))
+    >>> frames_stack.append((np.zeros((3, 2)), True))
+    >>> len(frames_stack)
+    2
+    >>> frames, eod = frames_stack[-1]
+    >>> frames.shape, eod
+    ((3, 2), True)
+    >>> [frames.sum() for frames, eod in frames_stack]
+    [8.0, 0.0]
+    """
+
+    def __init__(self, dtype='float32', dir=None):
+        import tempfile
+        self.dtype = np.dtype(dtype)
+        self.channels = None
+        self._file = tempfile.TemporaryFile(dir=dir)
+        self._blocks = []
+        self._totalframes = 0
+        self._frames = None
+
+    def append(self, block):
+        frames, eod = block
+        frames = np.ascontiguousarray(frames, dtype=self.dtype)
+        if self.channels is None:
+            self.channels = frames.shape[1] if frames.ndim > 1 else 1
+        frames = frames.reshape(-1, self.channels)
+        self._file.seek(0, 2)
+        self._file.write(frames.data)
+        self._blocks.append((self._totalframes, frames.shape[0], eod))
+        self._totalframes += frames.shape[0]
+        # The mapping has to be updated to the new size of the file
+        self._frames = None
+
+    def _mapped_frames(self):
+        if self._frames is None:
+            if self._totalframes:
+                self._file.flush()
+                self._frames = np.asarray(
+                    np.memmap(self._file, dtype=self.dtype, mode='r',
+                              shape=(self._totalframes, self.channels)))
+            else:
+                self._frames = np.empty((0, self.channels or 1),
+                                        dtype=self.dtype)
+        return self._frames
+
+    def __len__(self):
+        return len(self._blocks)
+
+    def __getitem__(self, index):
+        start, nb_frames, eod = self._blocks[index]
+        return self._mapped_frames()[start:start + nb_frames], eod
+
+    def __iter__(self):
+        for index in xrange(len(self)):
+            yield self[index]
+
+    @property
+    def frames(self):
+        "All the stacked frames as a single array"
+        return self._mapped_frames()
+
+    def close(self):
+        "Release the mapping and remove the temporary file"
+        self._frames = None
+        self._file.close()
+
+
 def get_sha1(source):
     src_info = source_info(source)
 
@@ -66,6 +66,11 @@ class AudioSink(GstEncoder):
 
         self.start_pipeline(channels, samplerate)
 
+    @interfacedoc
+    def encoding_pipe(self):
+        # The audio is played, not encoded
+        return None
+
     @staticmethod
     @interfacedoc
     def id():
@@ -35,10 +35,14 @@ import gobject
 gobject.threads_init()
 
 import threading
+import Queue
 
 # Streaming queue configuration
 QUEUE_SIZE = 10
 GST_APPSINK_MAX_BUFFERS = 10
+# Interval in seconds at which a blocked streaming encoder checks whether it
+# has been cancelled
+CANCEL_POLL_INTERVAL = 0.1
 
 
 class GstEncoder(Processor):
@@ -62,6 +66,7 @@ class GstEncoder(Processor):
         else:
             self.filename = None
         self.streaming = streaming
+        self.queue_size = QUEUE_SIZE
 
         if not self.filename and not self.streaming:
             raise Exception('Must give an output')
@@ -70,6 +75,7 @@ class GstEncoder(Processor):
         self.eod = False
         self.metadata = None
         self.num_samples = 0
+        self._cancelled = False
 
         self._chunk_len = 0
 
@@ -91,9 +97,9 @@ class GstEncoder(Processor):
         # store a pointer to appsrc in our encoder object
         self.src = self.pipeline.get_by_name('src')
 
+        self._cancelled = False
         if self.streaming:
-            import Queue
-            self._streaming_queue = Queue.Queue(QUEUE_SIZE)
+            self._streaming_queue = Queue.Queue(self.queue_size)
             # store a pointer to appsink in our encoder object
             self.app = self.pipeline.get_by_name('app')
             self.app.set_property('max-buffers', GST_APPSINK_MAX_BUFFERS)
@@ -127,9 +133,9 @@ class GstEncoder(Processor):
     def _on_message_cb(self, bus, message):
         t = message.type
         if t == gst.MESSAGE_EOS:
-            self.end_cond.acquire()
             if self.streaming:
-                self._streaming_queue.put(gst.MESSAGE_EOS)
+                self._put_stream_chunk(gst.MESSAGE_EOS)
+            self.end_cond.acquire()
 
             self.pipeline.set_state(gst.STATE_NULL)
             self.mainloop.quit()
@@ -150,12 +156,40 @@ class GstEncoder(Processor):
     def _on_new_buffer_streaming(self, appsink):
         # print 'pull-buffer'
         chunk = appsink.emit('pull-buffer')
-        self._streaming_queue.put(chunk)
+        self._put_stream_chunk(chunk)
 
     def _on_new_preroll_streaming(self, appsink):
         # print 'preroll'
         chunk = appsink.emit('pull-preroll')
-        self._streaming_queue.put(chunk)
+        self._put_stream_chunk(chunk)
+
+    def _put_stream_chunk(self, chunk):
+        # Wait for the consumer to make room in the queue, unless the
+        # encoding is cancelled
+        while not self._cancelled:
+            try:
+                self._streaming_queue.put(chunk, timeout=CANCEL_POLL_INTERVAL)
+                return
+            except Queue.Full:
+                pass
+
+    def cancel(self):
+        """Stop the encoding before the end of the stream: the pending
+        stream chunks are dropped and the pipeline is torn down"""
+        self._cancelled = True
+        if self.streaming and hasattr(self, '_streaming_queue'):
+            while True:
+                try:
+                    self._streaming_queue.get_nowait()
+                except Queue.Empty:
+                    break
+        if hasattr(self, 'pipeline'):
+            self.pipeline.set_state(gst.STATE_NULL)
+            self.mainloop.quit()
+        self.end_cond.acquire()
+        self.end_reached = True
+        self.end_cond.notify()
+        self.end_cond.release()
 
     @interfacedoc
     def set_metadata(self, metadata):
@@ -178,9 +212,12 @@ class GstEncoder(Processor):
 
         return frames, eod
 
-    def get_stream_chunk(self):
+    def get_stream_chunk(self, timeout=None):
+        """Return the next chunk of the stream, None at the end of the
+        stream. If timeout is set, raise Queue.Empty when no chunk was
+        available within timeout seconds."""
         if self.streaming:
-            chunk = self._streaming_queue.get(block=True)
+            chunk = self._streaming_queue.get(block=True, timeout=timeout)
             if chunk == gst.MESSAGE_EOS:
                 return None
             else:
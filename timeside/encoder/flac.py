@@ -34,8 +34,7 @@ class FlacEncoder(GstEncoder):
         super(FlacEncoder, self).setup(
             channels, samplerate, blocksize, totalframes)
 
-        self.pipe = ''' appsrc name=src ! audioconvert
-                        ! flacenc '''
+        self.pipe = 'appsrc name=src ! ' + self.encoding_pipe()
 
         if self.filename and self.streaming:
             self.pipe += ''' ! tee name=t
@@ -50,6 +49,11 @@ class FlacEncoder(GstEncoder):
 
         self.start_pipeline(channels, samplerate)
 
+    @interfacedoc
+    def encoding_pipe(self):
+        return '''audioconvert
+                        ! flacenc '''
+
     @staticmethod
     @interfacedoc
     def id():
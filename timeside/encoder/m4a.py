@@ -40,11 +40,7 @@ class AacEncoder(GstEncoder):
             channels, samplerate, blocksize, totalframes)
 
         self.streaming = False
-        self.pipe = ''' appsrc name=src
-            ! audioconvert
-            ! voaacenc
-            ! mp4mux
-            '''
+        self.pipe = 'appsrc name=src ! ' + self.encoding_pipe()
 
         if self.filename and self.streaming:
             self.pipe += ''' ! tee name=t
@@ -59,6 +55,13 @@ class AacEncoder(GstEncoder):
 
         self.start_pipeline(channels, samplerate)
 
+    @interfacedoc
+    def encoding_pipe(self):
+        return '''audioconvert
+            ! voaacenc
+            ! mp4mux
+            '''
+
     @staticmethod
     @interfacedoc
     def id():
@@ -41,12 +41,7 @@ class Mp3Encoder(GstEncoder):
         super(Mp3Encoder, self).setup(channels, samplerate, blocksize,
                                       totalframes)
 
-        self.pipe = '''appsrc name=src
-                  ! audioconvert ! audioresample
-                  ! lamemp3enc target=quality quality=2 encoding-engine-quality=standard
-                  ! xingmux
-                  ! id3v2mux
-                  '''
+        self.pipe = 'appsrc name=src ! ' + self.encoding_pipe()
 
         if self.filename and self.streaming:
             self.pipe += ''' ! tee name=t
@@ -61,6 +56,14 @@ class Mp3Encoder(GstEncoder):
 
         self.start_pipeline(channels, samplerate)
 
+    @interfacedoc
+    def encoding_pipe(self):
+        return '''audioconvert ! audioresample
+                  ! lamemp3enc target=quality quality=2 encoding-engine-quality=standard
+                  ! xingmux
+                  ! id3v2mux
+                  '''
+
     @staticmethod
     @interfacedoc
     def id():
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014 Parisson SARL
+
+# This file is part of TimeSide.
+
+# TimeSide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+
+# TimeSide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with TimeSide.  If not, see <http://www.gnu.org/licenses/>.
+
+from timeside.encoder.core import GstEncoder
+
+
+def can_branch(encoder):
+    """Return True if the encoder can be branched on a MultiEncoder"""
+    return (encoder.filename is not None and not encoder.streaming and
+            encoder.encoding_pipe() is not None)
+
+
+def branch_encoders(encoders):
+    """Return the processors encoding to the outputs of the encoders
+
+    The encoders which can be branched share a single MultiEncoder when
+    there are several of them, the others run in their own pipeline.
+    """
+    branched = [encoder for encoder in encoders if can_branch(encoder)]
+    others = [encoder for encoder in encoders if not can_branch(encoder)]
+    if len(branched) > 1:
+        return [MultiEncoder(branched)] + others
+    return branched + others
+
+
+class MultiEncoder(GstEncoder):
+
+    """Encode the audio stream to several files with a single GStreamer
+    pipeline
+
+    The encoders are only used to describe the outputs: a single appsrc
+    feeds a tee linked to the encoding elements of each encoder, so each
+    block is converted to a GStreamer buffer and pushed once for all the
+    outputs, with a single mainloop thread.
+
+    Parameters
+    ----------
+    encoders : list of GstEncoder
+        encoders writing to a file, without streaming, whose encoding_pipe()
+        is not None (see branch_encoders())
+    """
+
+    def __init__(self, encoders):
+        self.encoders = list(encoders)
+        if not self.encoders:
+            raise ValueError('MultiEncoder needs at least one encoder')
+        for encoder in self.encoders:
+            if not can_branch(encoder):
+                raise ValueError('MultiEncoder only handles encoders '
+                                 'writing to a file with a pipeline which '
+                                 'can be branched: %s' % encoder.id())
+        # The outputs have already been checked by the encoders
+        super(MultiEncoder, self).__init__(self.encoders[0].filename,
+                                           overwrite=True)
+        self.filename = None
+        self.filenames = [encoder.filename for encoder in self.encoders]
+
+    @staticmethod
+    def id():
+        return "gst_multi_enc"
+
+    def setup(self, channels=None, samplerate=None, blocksize=None,
+              totalframes=None):
+        super(MultiEncoder, self).setup(channels, samplerate, blocksize,
+                                        totalframes)
+        for encoder in self.encoders:
+            encoder.source_mediainfo = self.source_mediainfo
+
+        self.pipe = 'appsrc name=src ! tee name=t '
+        for encoder in self.encoders:
+            self.pipe += '''
+            t. ! queue ! %s ! filesink location=%s async=False sync=False
+            ''' % (encoder.encoding_pipe(), encoder.filename)
+
+        self.start_pipeline(channels, samplerate)
+
+    def set_metadata(self, metadata):
+        self.metadata = metadata
+        for encoder in self.encoders:
+            encoder.set_metadata(metadata)
+
+    def write_metadata(self):
+        """Write the metadata to the outputs of the encoders supporting it"""
+        for encoder in self.encoders:
+            if hasattr(encoder, 'write_metadata'):
+                encoder.write_metadata()
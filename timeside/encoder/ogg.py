@@ -33,11 +33,7 @@ class VorbisEncoder(GstEncoder):
     def setup(self, channels=None, samplerate=None, blocksize=None, totalframes=None):
         super(VorbisEncoder, self).setup(
             channels, samplerate, blocksize, totalframes)
-        self.pipe = ''' appsrc name=src
-                  ! audioconvert ! audioresample
-                  ! vorbisenc quality=0.9
-                  ! oggmux
-                  '''
+        self.pipe = 'appsrc name=src ! ' + self.encoding_pipe()
 
         if self.filename and self.streaming:
             self.pipe += ''' ! tee name=t
@@ -52,6 +48,13 @@ class VorbisEncoder(GstEncoder):
 
         self.start_pipeline(channels, samplerate)
 
+    @interfacedoc
+    def encoding_pipe(self):
+        return '''audioconvert ! audioresample
+                  ! vorbisenc quality=0.9
+                  ! oggmux
+                  '''
+
     @staticmethod
     @interfacedoc
     def id():
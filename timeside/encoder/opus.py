@@ -41,11 +41,7 @@ class OpusEncoder(GstEncoder):
         super(OpusEncoder, self).setup(channels, samplerate, blocksize,
                                        totalframes)
 
-        self.pipe = '''appsrc name=src
-                  ! audioconvert ! audioresample
-                  ! opusenc audio=true bitrate=128000
-                  ! oggmux
-                  '''
+        self.pipe = 'appsrc name=src ! ' + self.encoding_pipe()
 
         if self.filename and self.streaming:
             self.pipe += ''' ! tee name=t
@@ -60,6 +56,13 @@ class OpusEncoder(GstEncoder):
 
         self.start_pipeline(channels, samplerate)
 
+    @interfacedoc
+    def encoding_pipe(self):
+        return '''audioconvert ! audioresample
+                  ! opusenc audio=true bitrate=128000
+                  ! oggmux
+                  '''
+
     @staticmethod
     @interfacedoc
     def id():
@@ -35,10 +35,7 @@ class WavEncoder(GstEncoder):
         super(WavEncoder, self).setup(
             channels, samplerate, blocksize, totalframes)
 
-        self.pipe = ''' appsrc name=src
-                  ! audioconvert
-                  ! wavenc
-                  '''
+        self.pipe = 'appsrc name=src ! ' + self.encoding_pipe()
         if self.filename and self.streaming:
             self.pipe += ''' ! tee name=t
             ! queue ! filesink location=%s
@@ -52,6 +49,12 @@ class WavEncoder(GstEncoder):
 
         self.start_pipeline(channels, samplerate)
 
+    @interfacedoc
+    def encoding_pipe(self):
+        return '''audioconvert
+                  ! wavenc
+                  '''
+
     @staticmethod
     @interfacedoc
     def id():
@@ -63,6 +63,15 @@ class WebMEncoder(GstEncoder):
 
         self.start_pipeline(channels, samplerate)
 
+    @interfacedoc
+    def encoding_pipe(self):
+        if self.video:
+            # The video source must be muxed with the audio
+            return None
+        return '''queue ! audioconvert ! vorbisenc quality=0.9 ! queue
+              ! webmmux streamable=true
+              '''
+
     @staticmethod
     @interfacedoc
     def id():
@@ -22,6 +22,7 @@
 #   Guillaume Pellerin <yomguy@parisson.com>
 
 
+import itertools
 import math
 import numpy
 
@@ -32,9 +33,10 @@ except ImportError:
     import ImageDraw
 
 from timeside.core import Processor, implements, interfacedoc, abstract
-from timeside.core import FixedSizeInputAdapter
 from timeside.api import IGrapher
-from . utils import smooth, im_watermark, normalize
+from timeside.analyzer.stft import STFT
+from . utils import smooth, im_watermark, normalize, scale_centroids
+from . utils import ColumnRaster
 
 
 class Spectrum(object):
@@ -56,6 +58,8 @@ class Spectrum(object):
         self.totalframes = totalframes
         self.samplerate = samplerate
         self.window_function = window_function
+        self.windows = {}
+        self.stfts = {}
         self.window = self.window_function(self.blocksize)
         # Hanning window by default
         if self.window_function:
@@ -64,54 +68,88 @@ class Spectrum(object):
             self.window_function = numpy.hanning
             self.window = self.window_function(self.blocksize)
 
+    def get_window(self, size):
+        """Returns the analysis window of the given size, computing it once"""
+        if size not in self.windows:
+            self.windows[size] = self.window_function(size)
+        return self.windows[size]
+
+    def get_stft(self, size):
+        """Returns the STFT frontend of the buffers of the given size at the
+        current FFT size, creating it once"""
+        key = (size, self.fft_size)
+        if key not in self.stfts:
+            self.stfts[key] = STFT(blocksize=size, stepsize=size,
+                                   fft_size=self.fft_size,
+                                   window=self.get_window(size))
+        return self.stfts[key]
+
     def process(self, frames, eod, spec_range=120.0):
         """ Returns a tuple containing the spectral centroid and
         the spectrum (dB scales) of the input audio frames.
         FFT window sizes are adatable to the input frame size."""
 
-        samples = frames[:, 0]
-        nsamples = len(frames[:, 0])
-        if nsamples != self.blocksize:
-            self.window = self.window_function(nsamples)
-        samples *= self.window
+        centroids, db_spectra = self.analyze_batch(
+            frames[:, 0][numpy.newaxis], spec_range)
+        return (self.scale_centroids(centroids)[0], db_spectra[0])
+
+    def analyze_batch(self, frames_matrix, spec_range=120.0):
+        """ Returns the spectral centroids in Hz, 0 for silent buffers, and
+        the spectra (dB scales) of the rows of frames_matrix."""
 
+        nbuffers, nsamples = frames_matrix.shape
         while nsamples > self.fft_size:
             self.fft_size = 2 * self.fft_size
 
-        zeros_p = numpy.zeros(self.fft_size / 2 - int(nsamples / 2))
-        if nsamples % 2:
-            zeros_n = numpy.zeros(self.fft_size / 2 - int(nsamples / 2) - 1)
-        else:
-            zeros_n = numpy.zeros(self.fft_size / 2 - int(nsamples / 2))
-        samples = numpy.concatenate((zeros_p, samples, zeros_n), axis=0)
+        # Windowed samples padded with zeros up to the FFT size by the STFT
+        # frontend. The padding only changes the phase of the spectrum, not
+        # its magnitude.
+        stft = self.get_stft(nsamples)
+        stft.process_batch(frames_matrix)
 
-        fft = numpy.fft.fft(samples)
         # normalized abs(FFT) between 0 and 1
-        spectrum = numpy.abs(fft[:fft.shape[0] / 2 + 1]) / float(nsamples)
-        length = numpy.float64(spectrum.shape[0])
+        spectrum = numpy.abs(stft.spectra) / float(nsamples)
+        length = spectrum.shape[1]
 
         # scale the db spectrum from [- spec_range db ... 0 db] > [0..1]
         db_spectrum = ((20 * (numpy.log10(spectrum + 1e-30)))
                        .clip(-spec_range, 0.0) + spec_range) / spec_range
-        energy = spectrum.sum()
-        spectral_centroid = 0
+        energy = spectrum.sum(axis=1)
+        spectral_centroid = numpy.zeros(nbuffers)
 
-        if energy > 1e-20:
+        valid = energy > 1e-20
+        if valid.any():
             # calculate the spectral centroid
-            if self.spectrum_range is None:
-                self.spectrum_range = numpy.arange(length)
-            spectral_centroid = (spectrum * self.spectrum_range).sum() / \
-                (energy * (length - 1)) * \
+            if self.spectrum_range is None or \
+                    len(self.spectrum_range) != length:
+                self.spectrum_range = numpy.arange(length, dtype='float64')
+            spectral_centroid[valid] = \
+                spectrum[valid].dot(self.spectrum_range) / \
+                (energy[valid] * (length - 1)) * \
                 self.samplerate * 0.5
-            # clip > log10 > scale between 0 and 1
-            spectral_centroid = (math.log10(self.clip(spectral_centroid,
-                                                      self.lower,
-                                                      self.higher)) -
-                                 self.lower_log) / (self.higher_log -
-                                                    self.lower_log)
 
         return (spectral_centroid, db_spectrum)
 
+    def analyze_buffers(self, buffers, spec_range=120.0):
+        """ Returns the spectral centroids in Hz and the spectra (dB scales)
+        of a list of sample buffers, the buffers of the same size being
+        processed at once by analyze_batch()."""
+
+        centroids = []
+        db_spectra = []
+        for size, group in itertools.groupby(buffers, len):
+            centroid, db_spectrum = self.analyze_batch(numpy.array(list(group)),
+                                                       spec_range)
+            centroids.append(centroid)
+            db_spectra.append(db_spectrum)
+        return (numpy.concatenate(centroids), numpy.concatenate(db_spectra))
+
+    def scale_centroids(self, centroids):
+        """ Returns spectral centroids in Hz scaled between 0 and 1 on a log
+        scale between the lower and higher frequencies """
+
+        return scale_centroids(centroids, self.lower, self.higher)
+
 
 class Grapher(Processor):
 
@@ -163,18 +201,21 @@ class Grapher(Processor):
             "RGBA", (self.image_width, self.image_height), self.bg_color)
         self.samples_per_pixel = self.total_frames / float(self.image_width)
         self.buffer_size = int(round(self.samples_per_pixel, 0))
-        self.pixels_adapter = FixedSizeInputAdapter(
-            self.buffer_size, 1, pad=False)
-        self.pixels_adapter_totalframes = self.pixels_adapter.blocksize(
-            self.total_frames)
-        self.spectrum = Spectrum(
-            self.fft_size, self.sample_rate, self.block_size, self.total_frames,
-            self.lower_freq, self.higher_freq, numpy.hanning)
         self.pixel = self.image.load()
         self.draw = ImageDraw.Draw(self.image)
+        self.raster = ColumnRaster()
+
+    def rasterize(self):
+        """Draw the peaks recorded by draw_peaks(), draw_peaks_inverted()
+        and draw_anti_aliased_pixels() in the image"""
+        if len(self.raster):
+            self.image = self.raster.draw(self.image)
+            self.pixel = self.image.load()
+            self.draw = ImageDraw.Draw(self.image)
 
     @interfacedoc
     def render(self, output=None):
+        self.rasterize()
         if output:
             try:
                 self.image.save(output)
@@ -185,20 +226,26 @@ class Grapher(Processor):
         return self.image
 
     def watermark(self, text, font=None, color=(255, 255, 255), opacity=.6, margin=(5, 5)):
+        self.rasterize()
         self.image = im_watermark(
             self.image, text, color=color, opacity=opacity, margin=margin)
 
     def draw_peaks(self, x, peaks, line_color):
-        """Draw 2 peaks at x"""
+        """Draw 2 peaks at x
+
+        The peaks are recorded and drawn along with the other peaks of the
+        image by rasterize()."""
 
         y1 = self.image_height * 0.5 - peaks[0] * (self.image_height - 4) * 0.5
         y2 = self.image_height * 0.5 - peaks[1] * (self.image_height - 4) * 0.5
 
         if self.previous_y:
-            self.draw.line(
-                [self.previous_x, self.previous_y, x, y1, x, y2], line_color)
+            # Line from the previous peak
+            top = min(self.previous_y, y1, y2)
+            bottom = max(self.previous_y, y1, y2)
         else:
-            self.draw.line([x, y1, x, y2], line_color)
+            top, bottom = min(y1, y2), max(y1, y2)
+        self.raster.add_span(x, top, bottom, line_color)
 
         self.draw_anti_aliased_pixels(x, y1, y2, line_color)
         self.previous_x, self.previous_y = x, y2
@@ -210,41 +257,29 @@ class Grapher(Processor):
         y2 = self.image_height * 0.5 - peaks[1] * (self.image_height - 4) * 0.5
 
         if self.previous_y and x < self.image_width - 1:
-            if y1 < y2:
-                self.draw.line((x, 0, x, y1), line_color)
-                self.draw.line((x, self.image_height, x, y2), line_color)
-            else:
-                self.draw.line((x, 0, x, y2), line_color)
-                self.draw.line((x, self.image_height, x, y1), line_color)
+            self.raster.add_span(x, 0, min(y1, y2), line_color)
+            self.raster.add_span(x, max(y1, y2), self.image_height,
+                                 line_color)
         else:
-            self.draw.line((x, 0, x, self.image_height), line_color)
+            self.raster.add_span(x, 0, self.image_height, line_color)
         self.draw_anti_aliased_pixels(x, y1, y2, line_color)
         self.previous_x, self.previous_y = x, y1
 
     def draw_anti_aliased_pixels(self, x, y1, y2, color):
-        """ vertical anti-aliasing at y1 and y2 """
-
-        y_max = max(y1, y2)
-        y_max_int = int(y_max)
-        alpha = y_max - y_max_int
-
-        if alpha > 0.0 and alpha < 1.0 and y_max_int + 1 < self.image_height:
-            current_pix = self.pixel[int(x), y_max_int + 1]
-            r = int((1 - alpha) * current_pix[0] + alpha * color[0])
-            g = int((1 - alpha) * current_pix[1] + alpha * color[1])
-            b = int((1 - alpha) * current_pix[2] + alpha * color[2])
-            self.pixel[x, y_max_int + 1] = (r, g, b)
-
-        y_min = min(y1, y2)
-        y_min_int = int(y_min)
-        alpha = 1.0 - (y_min - y_min_int)
-
-        if alpha > 0.0 and alpha < 1.0 and y_min_int - 1 >= 0:
-            current_pix = self.pixel[x, y_min_int - 1]
-            r = int((1 - alpha) * current_pix[0] + alpha * color[0])
-            g = int((1 - alpha) * current_pix[1] + alpha * color[1])
-            b = int((1 - alpha) * current_pix[2] + alpha * color[2])
-            self.pixel[x, y_min_int - 1] = (r, g, b)
+        """ vertical anti-aliasing at y1 and y2
+
+        x, y1 and y2 can be arrays to anti-alias several columns at once.
+        """
+        self.raster.anti_alias(x, y1, y2, color)
+
+    def draw_curve(self, x, y, line_color):
+        """Draw the line joining the points (x, y) of successive columns"""
+        x = numpy.asarray(x)
+        y = numpy.asarray(y)
+        self.raster.add_spans(x[:1], y[:1], y[:1], line_color)
+        self.raster.add_spans(x[1:], numpy.minimum(y[:-1], y[1:]),
+                              numpy.maximum(y[:-1], y[1:]), line_color)
+        self.draw_anti_aliased_pixels(x[1:], y[1:], y[1:], line_color)
 
     def draw_peaks_contour(self):
         contour = self.contour.copy()
@@ -287,29 +322,13 @@ class Grapher(Processor):
             curve = (height - 1) * contour
             #curve = contour*(height-2)/2+height/2
 
-            for x in self.x:
-                x = int(x)
-                y = curve[x]
-                if not x == 0:
-                    if not self.symetry:
-                        self.draw.line(
-                            [self.previous_x, self.previous_y, x, y], line_color)
-                        self.draw_anti_aliased_pixels(x, y, y, line_color)
-                    else:
-                        self.draw.line(
-                            [self.previous_x, self.previous_y + height, x, y + height], line_color)
-                        self.draw_anti_aliased_pixels(
-                            x, y + height, y + height, line_color)
-                        self.draw.line(
-                            [self.previous_x, -self.previous_y + height, x, -y + height], line_color)
-                        self.draw_anti_aliased_pixels(
-                            x, -y + height, -y + height, line_color)
-                else:
-                    if not self.symetry:
-                        self.draw.point((x, y), line_color)
-                    else:
-                        self.draw.point((x, y + height), line_color)
-                self.previous_x, self.previous_y = x, y
+            x = self.x.astype(int)
+            y = curve[x]
+            if not self.symetry:
+                self.draw_curve(x, y, line_color)
+            else:
+                self.draw_curve(x, y + height, line_color)
+                self.draw_curve(x, -y + height, line_color)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014 Parisson SARL
+
+# This file is part of TimeSide.
+
+# TimeSide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+
+# TimeSide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with TimeSide.  If not, see <http://www.gnu.org/licenses/>.
+
+import itertools
+
+from timeside.core import Processor
+from timeside.core import FixedSizeInputAdapter
+from timeside.grapher.core import Grapher, Spectrum
+from . utils import peaks_batch
+import numpy
+
+
+class PixelBuckets(Processor):
+
+    """Pixel columns frontend of the graphers
+
+    This processor does not produce any result: it splits the first channel
+    of the decoded blocks into buckets of samples, one bucket per pixel
+    column of an image of the given width, and analyzes the buckets so that
+    the graphers declaring it as a parent can share it. The pipe runs a
+    single frontend for all the graphers of the same width, whatever their
+    style and height.
+
+    After each call to process, `first_column` is the index of the first
+    bucket completed by the block and `peaks` holds the peaks of these
+    buckets, one pair per row, in the order given by utils.peaks().
+
+    If `with_spectra` is set by a grapher during its setup, `centroids`
+    also holds the spectral centroids in Hz of the buckets and `spectra`
+    their spectra (dB scales), for the buckets of the image width only.
+
+    Parameters
+    ----------
+    width : int
+        width of the images in pixels, which is the number of buckets
+    fft_size : int
+        minimal size of the FFT of the buckets
+    """
+
+    def __init__(self, width=1024, fft_size=Grapher.fft_size):
+        super(PixelBuckets, self).__init__()
+        self.width = width
+        self.fft_size = fft_size
+
+    @staticmethod
+    def id():
+        return "grapher_pixels"
+
+    def setup(self, channels=None, samplerate=None, blocksize=None,
+              totalframes=None):
+        super(PixelBuckets, self).setup(channels, samplerate, blocksize,
+                                        totalframes)
+        self.samples_per_pixel = totalframes / float(self.width)
+        self.buffer_size = int(round(self.samples_per_pixel, 0))
+        self.pixels_adapter = FixedSizeInputAdapter(
+            self.buffer_size, 1, pad=False)
+        self.spectrum = Spectrum(
+            self.fft_size, samplerate, blocksize, totalframes,
+            Grapher.lower_freq, samplerate / 2, numpy.hanning)
+        self.with_spectra = False
+        self.first_column = 0
+        self.peaks = numpy.empty((0, 2))
+        self.centroids = numpy.empty(0)
+        self.spectra = numpy.empty((0, self.fft_size // 2 + 1))
+
+    def process(self, frames, eod=False):
+        self.first_column += len(self.peaks)
+        buckets = []
+        if len(frames) != 1:
+            if frames.ndim > 1:
+                buffer = frames[:, 0]
+            else:
+                buffer = frames
+            buckets = [samples[:, 0].copy() for samples, end in
+                       self.pixels_adapter.process(buffer[:, numpy.newaxis],
+                                                   eod)]
+
+        if buckets:
+            self.peaks = numpy.concatenate(
+                [peaks_batch(numpy.array(list(group)))
+                 for size, group in itertools.groupby(buckets, len)])
+        else:
+            self.peaks = numpy.empty((0, 2))
+
+        columns = buckets[:max(self.width - self.first_column, 0)]
+        if self.with_spectra and columns:
+            self.centroids, self.spectra = self.spectrum.analyze_buffers(
+                columns)
+        else:
+            self.centroids = numpy.empty(0)
+            self.spectra = numpy.empty((0, self.spectrum.fft_size // 2 + 1))
+        return frames, eod
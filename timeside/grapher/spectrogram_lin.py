@@ -23,6 +23,7 @@ from timeside.core import implements, interfacedoc
 from timeside.api import IGrapher
 #from timeside.grapher.core import *
 from timeside.grapher.spectrogram_log import SpectrogramLog
+import numpy
 
 
 class SpectrogramLinear(SpectrogramLog):
@@ -55,13 +56,7 @@ class SpectrogramLinear(SpectrogramLog):
     def set_scale(self):
         """generate the lookup which translates y-coordinate to fft-bin"""
 
-        f_min = float(self.lower_freq)
-        f_max = float(self.higher_freq)
-        y_min = f_min
-        y_max = f_max
-        for y in range(self.image_height):
-            freq = y_min + y / (self.image_height - 1.0) * (y_max - y_min)
-            fft_bin = freq / f_max * (self.fft_size / 2 + 1)
-            if fft_bin < self.fft_size / 2:
-                alpha = fft_bin - int(fft_bin)
-                self.y_to_bin.append((int(fft_bin), alpha * 255))
+        y_min = float(self.lower_freq)
+        y_max = float(self.higher_freq)
+        y = numpy.arange(self.image_height)
+        self.set_bins(y_min + y / (self.image_height - 1.0) * (y_max - y_min))
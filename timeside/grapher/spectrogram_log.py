@@ -23,8 +23,10 @@ from timeside.core import implements, interfacedoc
 from timeside.api import IGrapher
 from timeside.grapher.core import Grapher, Image
 from timeside.grapher.color_schemes import default_color_schemes
+from timeside.grapher.pixels import PixelBuckets
 from . utils import interpolate_colors
 import math
+import numpy
 
 
 class SpectrogramLog(Grapher):
@@ -43,8 +45,9 @@ class SpectrogramLog(Grapher):
             width, height, bg_color, color_scheme)
         self.lower_freq = 100
         self.colors = default_color_schemes[color_scheme]['spectrogram']
-        self.pixels = []
-        self.y_to_bin = []
+        self.bin_index = None
+        self.bin_weights = None
+        self.parents.append(PixelBuckets(width=width, fft_size=self.fft_size))
 
     @staticmethod
     @interfacedoc
@@ -64,45 +67,59 @@ class SpectrogramLog(Grapher):
         self.image = self.image.convert("P")
         self.image = self.image.transpose(Image.ROTATE_90)
         self.image.putpalette(interpolate_colors(self.colors, True))
+        self.pixel_buckets.with_spectra = True
+        # One row of palette indexes per column of the image, the lowest
+        # frequency first
+        self.spectrogram = numpy.zeros((self.image_width, self.image_height),
+                                       dtype='uint8')
         self.set_scale()
 
     def set_scale(self):
         """generate the lookup which translates y-coordinate to fft-bin"""
 
-        f_min = float(self.lower_freq)
-        f_max = float(self.higher_freq)
-        y_min = math.log10(f_min)
-        y_max = math.log10(f_max)
-        for y in range(self.image_height):
-            freq = math.pow(
-                10.0, y_min + y / (self.image_height - 1.0) * (y_max - y_min))
-            fft_bin = freq / f_max * (self.fft_size / 2 + 1)
-            if fft_bin < self.fft_size / 2:
-                alpha = fft_bin - int(fft_bin)
-                self.y_to_bin.append((int(fft_bin), alpha * 255))
+        y_min = math.log10(self.lower_freq)
+        y_max = math.log10(self.higher_freq)
+        y = numpy.arange(self.image_height)
+        self.set_bins(10.0 ** (y_min + y / (self.image_height - 1.0) *
+                               (y_max - y_min)))
+
+    def set_bins(self, frequencies):
+        """Set the fft bins of the rows of the image and their interpolation
+        weights from the frequencies of the rows"""
+        fft_bins = (frequencies / float(self.higher_freq) *
+                    (self.fft_size / 2 + 1))
+        fft_bins = fft_bins[fft_bins < self.fft_size / 2]
+        self.bin_index = fft_bins.astype(int)
+        alpha = (fft_bins - self.bin_index) * 255
+        self.bin_weights = numpy.array([255.0 - alpha, alpha])
+
+    def draw_spectra(self, x, spectra):
+        """Draw the spectra of the columns x, x + 1, ... given as the rows
+        of a 2D array"""
+        spectra = spectra[:max(self.image_width - x, 0)]
+        rows = len(self.bin_index)
+        self.spectrogram[x:x + len(spectra), :rows] = (
+            spectra[:, self.bin_index] * self.bin_weights[0] +
+            spectra[:, self.bin_index + 1] * self.bin_weights[1])
 
     def draw_spectrum(self, x, spectrum):
-        for (index, alpha) in self.y_to_bin:
-            self.pixels.append(
-                int(((255.0 - alpha) * spectrum[index] + alpha * spectrum[index + 1])))
-        for y in range(len(self.y_to_bin), self.image_height):
-            self.pixels.append(0)
+        self.draw_spectra(x, numpy.asarray(spectrum)[numpy.newaxis])
+
+    @property
+    def pixel_buckets(self):
+        return self.parents[0]
 
     @interfacedoc
     def process(self, frames, eod=False):
-        if len(frames) != 1:
-            chunk = frames[:, 0].copy()
-            chunk.shape = (len(chunk), 1)
-            for samples, end in self.pixels_adapter.process(chunk, eod):
-                if self.pixel_cursor < self.image_width:
-                    (spectral_centroid, db_spectrum) = self.spectrum.process(
-                        samples, True)
-                    self.draw_spectrum(self.pixel_cursor, db_spectrum)
-                    self.pixel_cursor += 1
+        db_spectra = self.pixel_buckets.spectra
+        if len(db_spectra):
+            self.draw_spectra(self.pixel_cursor, db_spectra)
+            self.pixel_cursor += len(db_spectra)
         return frames, eod
 
     @interfacedoc
     def post_process(self):
         """ Apply last 2D transforms"""
-        self.image.putdata(self.pixels)
-        self.image = self.image.transpose(Image.ROTATE_90)
+        palette = self.image.getpalette()
+        self.image = Image.fromarray(self.spectrogram.T[::-1].copy())
+        self.image.putpalette(palette)
@@ -195,6 +195,32 @@ def peaks(samples):
         return (max_value, min_value)
 
 
+def peaks_batch(samples):
+    """ Find the minimum and maximum peak of each row of a 2D array of
+    samples. Returns an array of pairs, one pair per row, in the order
+    given by peaks(). """
+    rows = numpy.arange(len(samples))
+    max_index = numpy.argmax(samples, axis=1)
+    max_value = samples[rows, max_index]
+
+    min_index = numpy.argmin(samples, axis=1)
+    min_value = samples[rows, min_index]
+
+    min_first = min_index < max_index
+    return numpy.column_stack((numpy.where(min_first, min_value, max_value),
+                               numpy.where(min_first, max_value, min_value)))
+
+
+def scale_centroids(centroids, lower, higher):
+    """ Scale spectral centroids in Hz between 0 and 1 on a log scale
+    between the lower and higher frequencies """
+    # clip > log10 > scale between 0 and 1
+    lower_log = numpy.log10(lower)
+    higher_log = numpy.log10(higher)
+    return (numpy.log10(numpy.clip(centroids, lower, higher)) - lower_log) / \
+        (higher_log - lower_log)
+
+
 def color_from_value(self, value):
     """ given a value between 0 and 1, return an (r,g,b) tuple """
     return ImageColor.getrgb("hsl(%d,%d%%,%d%%)" % (int((1.0 - value) * 360), 80, 50))
@@ -207,3 +233,150 @@ def mean(samples):
 def normalize(contour):
     contour = contour - min(contour)
     return contour / max(contour)
+
+
+def anti_aliased_pixels(x, y1, y2, height):
+    """Return the (x, y, alpha) arrays of the pixels blended around the
+    vertical spans between y1 and y2 at the columns x, to anti-alias their
+    ends"""
+    x = numpy.asarray(x)
+    y_max = numpy.maximum(y1, y2)
+    y_max_int = numpy.floor(y_max)
+    alpha_max = y_max - y_max_int
+    below = (alpha_max > 0) & (alpha_max < 1) & (y_max_int + 1 < height)
+
+    y_min = numpy.minimum(y1, y2)
+    y_min_int = numpy.floor(y_min)
+    alpha_min = 1.0 - (y_min - y_min_int)
+    above = (alpha_min > 0) & (alpha_min < 1) & (y_min_int - 1 >= 0)
+
+    return (numpy.concatenate((x[below], x[above])),
+            numpy.concatenate((y_max_int[below] + 1, y_min_int[above] - 1)),
+            numpy.concatenate((alpha_max[below], alpha_min[above])))
+
+
+class ColumnRaster(object):
+
+    """Vertical spans of pixels drawn in an RGBA image at once
+
+    Spans and anti-aliased span ends are recorded with their color, either
+    one at a time or as arrays, and drawn in a single vectorized pass by
+    draw(): spans first, then the anti-aliased pixels.
+
+    >>> raster = ColumnRaster()
+    >>> raster.add_span(0, 1, 2, (255, 0, 0))
+    >>> raster.add_spans([1, 2], [0, 1], [3, 1], (255, 0, 0))
+    >>> raster.anti_alias(2, 1., 1.5, (255, 0, 0))
+    >>> image = raster.draw(Image.new('RGBA', (3, 4), (0, 0, 0)))
+    >>> numpy.asarray(image)[:, :, 0]
+    array([[  0, 255,   0],
+           [255, 255, 255],
+           [255, 255, 127],
+           [  0, 255,   0]], dtype=uint8)
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._spans = []
+        self._span_chunks = []
+        self._ends = []
+        self._end_chunks = []
+
+    def __len__(self):
+        return (len(self._spans) + len(self._span_chunks) +
+                len(self._ends) + len(self._end_chunks))
+
+    @staticmethod
+    def _chunk(x, y1, y2, colors):
+        x = numpy.asarray(x, dtype='float64')
+        colors = numpy.asarray(colors, dtype='float64')[..., :3]
+        colors = numpy.resize(colors, (len(x), 3))
+        return numpy.column_stack((x, y1, y2, colors))
+
+    @staticmethod
+    def _rows(rows, chunks):
+        if rows:
+            chunks = chunks + [numpy.array(rows, dtype='float64')]
+        return numpy.concatenate(chunks).T
+
+    def add_span(self, x, top, bottom, color):
+        "Add a span covering the rows top to bottom (included) at column x"
+        self._spans.append((x, top, bottom) + tuple(color[:3]))
+
+    def add_spans(self, x, top, bottom, colors):
+        """Add spans given as arrays. colors is a single color or an array
+        of colors."""
+        self._span_chunks.append(self._chunk(x, top, bottom, colors))
+
+    def anti_alias(self, x, y1, y2, color):
+        """Blend the pixels around the ends of the span between y1 and y2 at
+        column x with color, according to the fractional part of the ends.
+        x, y1 and y2 can be arrays."""
+        if numpy.isscalar(x):
+            self._ends.append((x, y1, y2) + tuple(color[:3]))
+        else:
+            self._end_chunks.append(self._chunk(x, y1, y2, color))
+
+    def draw(self, image):
+        "Return a copy of the image with the spans drawn in it"
+        rgba = numpy.array(image.convert('RGBA'))
+        height, width = rgba.shape[:2]
+
+        if self._spans or self._span_chunks:
+            x, top, bottom, r, g, b = self._rows(self._spans,
+                                                 self._span_chunks)
+            x = x.astype('int64')
+            top = numpy.clip(numpy.floor(top), 0, height - 1).astype('int64')
+            bottom = numpy.clip(numpy.floor(bottom),
+                                0, height - 1).astype('int64')
+            colors = numpy.clip(numpy.column_stack((r, g, b)), 0, 255)
+            valid = (x >= 0) & (x < width) & (top <= bottom)
+            x, top, bottom, colors = (x[valid], top[valid], bottom[valid],
+                                      colors[valid])
+
+            # Draw the spans by layers holding at most one span per column,
+            # the first layer holding the first span of each column
+            order = numpy.argsort(x, kind='mergesort')
+            sorted_x = x[order]
+            first = numpy.ones(len(x), dtype=bool)
+            first[1:] = sorted_x[1:] != sorted_x[:-1]
+            group_start = numpy.maximum.accumulate(
+                numpy.where(first, numpy.arange(len(x)), 0))
+            layer = numpy.empty(len(x), dtype='int64')
+            layer[order] = numpy.arange(len(x)) - group_start
+            nb_layers = layer.max() + 1 if len(x) else 0
+            rows = numpy.arange(height)[:, numpy.newaxis]
+            for index in xrange(nb_layers):
+                spans = layer == index
+                layer_top = numpy.full(width, height, dtype='int64')
+                layer_bottom = numpy.full(width, -1, dtype='int64')
+                layer_colors = numpy.zeros((width, 4), dtype='uint8')
+                layer_top[x[spans]] = top[spans]
+                layer_bottom[x[spans]] = bottom[spans]
+                layer_colors[x[spans], :3] = colors[spans]
+                layer_colors[x[spans], 3] = 255
+                mask = (rows >= layer_top) & (rows <= layer_bottom)
+                numpy.copyto(rgba, layer_colors,
+                             where=mask[:, :, numpy.newaxis])
+
+        if self._ends or self._end_chunks:
+            x, y1, y2, r, g, b = self._rows(self._ends, self._end_chunks)
+            colors = numpy.clip(numpy.column_stack((r, g, b)), 0, 255)
+            index = numpy.arange(len(x))
+            index, y, alpha = anti_aliased_pixels(index, y1, y2, height)
+            x = x[index].astype('int64')
+            y = y.astype('int64')
+            colors = colors[index]
+            valid = (x >= 0) & (x < width)
+            x, y, alpha, colors = (x[valid], y[valid], alpha[valid],
+                                   colors[valid])
+            alpha = alpha[:, numpy.newaxis]
+            current = rgba[y, x, :3]
+            rgba[y, x, :3] = ((1 - alpha) * current + alpha * colors).astype(
+                'uint8')
+            rgba[y, x, 3] = 255
+
+        self.clear()
+        return Image.fromarray(rgba, 'RGBA')
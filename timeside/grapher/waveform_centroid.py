@@ -21,7 +21,7 @@
 
 from timeside.core import implements, interfacedoc
 from timeside.api import IGrapher
-from . utils import peaks, interpolate_colors
+from . utils import interpolate_colors, scale_centroids
 from timeside.grapher.waveform_simple import Waveform
 from timeside.grapher.color_schemes import default_color_schemes
 
@@ -55,19 +55,16 @@ class WaveformCentroid(Waveform):
     def setup(self, channels=None, samplerate=None, blocksize=None, totalframes=None):
         super(WaveformCentroid, self).setup(
             channels, samplerate, blocksize, totalframes)
+        self.pixel_buckets.with_spectra = True
 
     @interfacedoc
     def process(self, frames, eod=False):
-        if len(frames) != 1:
-            buffer = frames[:, 0].copy()
-            buffer.shape = (len(buffer), 1)
-            for samples, end in self.pixels_adapter.process(buffer, eod):
-                if self.pixel_cursor < self.image_width:
-                    (spectral_centroid, db_spectrum) = self.spectrum.process(
-                        samples, True)
-                    line_color = self.color_lookup[
-                        int(spectral_centroid * 255.0)]
-                    self.draw_peaks(
-                        self.pixel_cursor, peaks(samples), line_color)
-                    self.pixel_cursor += 1
+        buckets = self.pixel_buckets
+        spectral_centroids = scale_centroids(buckets.centroids,
+                                             self.lower_freq, self.higher_freq)
+        for bucket_peaks, spectral_centroid in zip(buckets.peaks,
+                                                   spectral_centroids):
+            line_color = self.color_lookup[int(spectral_centroid * 255.0)]
+            self.draw_peaks(self.pixel_cursor, bucket_peaks, line_color)
+            self.pixel_cursor += 1
         return frames, eod
@@ -23,7 +23,6 @@ from timeside.core import implements, interfacedoc
 from timeside.api import IGrapher
 #from timeside.grapher.core import *
 from . waveform_simple import Waveform
-from . utils import peaks
 
 import numpy
 
@@ -62,13 +61,13 @@ class WaveformContourBlack(Waveform):
 
     @interfacedoc
     def process(self, frames, eod=False):
-        if len(frames) != 1:
-            buffer = frames[:, 0].copy()
-            buffer.shape = (len(buffer), 1)
-            for samples, end in self.pixels_adapter.process(buffer, eod):
-                if self.pixel_cursor < self.image_width:
-                    self.contour[self.pixel_cursor] = numpy.max(peaks(samples))
-                    self.pixel_cursor += 1
+        buckets_peaks = self.pixel_buckets.peaks
+        buckets_peaks = buckets_peaks[:max(self.image_width -
+                                           self.pixel_cursor, 0)]
+        self.contour[self.pixel_cursor:
+                     self.pixel_cursor + len(buckets_peaks)] = \
+            numpy.max(buckets_peaks, axis=1)
+        self.pixel_cursor += len(buckets_peaks)
         if eod:
             self.draw_peaks_contour()
         return frames, eod
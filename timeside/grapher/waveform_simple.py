@@ -21,8 +21,10 @@
 
 from timeside.core import implements, interfacedoc
 from timeside.api import IGrapher
-from timeside.grapher.core import Grapher
-from . utils import peaks
+from timeside.grapher.core import Grapher, Image, ImageDraw
+from timeside.grapher.pixels import PixelBuckets
+
+import numpy
 
 
 class Waveform(Grapher):
@@ -36,6 +38,7 @@ class Waveform(Grapher):
     def __init__(self, width=1024, height=256, bg_color=(255, 255, 255), color_scheme='default'):
         super(Waveform, self).__init__(width, height, bg_color, color_scheme)
         self.line_color = (0, 0, 0)
+        self.parents.append(PixelBuckets(width=width, fft_size=self.fft_size))
 
     @staticmethod
     @interfacedoc
@@ -52,28 +55,31 @@ class Waveform(Grapher):
         super(Waveform, self).setup(
             channels, samplerate, blocksize, totalframes)
 
+    @property
+    def pixel_buckets(self):
+        return self.parents[0]
+
     @interfacedoc
     def process(self, frames, eod=False):
-        if len(frames) != 1:
-            if len(frames.shape) > 1:
-                buffer = frames[:, 0]
-            else:
-                buffer = frames
-            buffer.shape = (len(buffer), 1)
-            for samples, end in self.pixels_adapter.process(buffer, eod):
-                if self.pixel_cursor < self.image_width - 1:
-                    self.draw_peaks(
-                        self.pixel_cursor, peaks(samples), self.line_color)
-                    self.pixel_cursor += 1
-            if self.pixel_cursor == self.image_width - 1:
+        buckets_peaks = self.pixel_buckets.peaks
+        for bucket_peaks in buckets_peaks:
+            if self.pixel_cursor < self.image_width - 1:
                 self.draw_peaks(
-                    self.pixel_cursor, peaks(samples), self.line_color)
+                    self.pixel_cursor, bucket_peaks, self.line_color)
                 self.pixel_cursor += 1
+        if self.pixel_cursor == self.image_width - 1 and len(buckets_peaks):
+            self.draw_peaks(
+                self.pixel_cursor, buckets_peaks[-1], self.line_color)
+            self.pixel_cursor += 1
         return frames, eod
 
     @interfacedoc
     def post_process(self, output=None):
         a = 1
-        for x in range(self.image_width):
-            self.pixel[x, self.image_height / 2] = tuple(
-                map(lambda p: p + a, self.pixel[x, self.image_height / 2]))
+        self.rasterize()
+        image = numpy.array(self.image, dtype='int16')
+        middle = image[self.image_height / 2]
+        middle[:] = numpy.clip(middle + a, 0, 255)
+        self.image = Image.fromarray(image.astype('uint8'), self.image.mode)
+        self.pixel = self.image.load()
+        self.draw = ImageDraw.Draw(self.image)
@@ -23,7 +23,6 @@ from timeside.core import implements, interfacedoc
 from timeside.api import IGrapher
 #from timeside.grapher.core import *
 from timeside.grapher.waveform_simple import Waveform
-from . utils import peaks
 
 
 class WaveformTransparent(Waveform):
@@ -59,16 +58,14 @@ class WaveformTransparent(Waveform):
 
     @interfacedoc
     def process(self, frames, eod=False):
-        if len(frames) != 1:
-            buffer = frames[:, 0]
-            buffer.shape = (len(buffer), 1)
-            for samples, end in self.pixels_adapter.process(buffer, eod):
-                if self.pixel_cursor < self.image_width - 1:
-                    self.draw_peaks_inverted(
-                        self.pixel_cursor, peaks(samples), self.line_color)
-                    self.pixel_cursor += 1
-            if self.pixel_cursor == self.image_width - 1:
+        buckets_peaks = self.pixel_buckets.peaks
+        for bucket_peaks in buckets_peaks:
+            if self.pixel_cursor < self.image_width - 1:
                 self.draw_peaks_inverted(
-                    self.pixel_cursor, peaks(samples), self.line_color)
+                    self.pixel_cursor, bucket_peaks, self.line_color)
                 self.pixel_cursor += 1
+        if self.pixel_cursor == self.image_width - 1 and len(buckets_peaks):
+            self.draw_peaks_inverted(
+                self.pixel_cursor, buckets_peaks[-1], self.line_color)
+            self.pixel_cursor += 1
         return frames, eod
@@ -2,15 +2,18 @@
 from __future__ import absolute_import
 
 from celery import Celery
+from django.conf import settings
 
 app = Celery('timeside',
-             broker='amqp://',
-             backend='amqp://',
-             include=['timeside.tasks'])
+             broker=getattr(settings, 'BROKER_URL', 'amqp://'),
+             backend=getattr(settings, 'CELERY_RESULT_BACKEND', 'amqp://'),
+             include=['timeside.server.tasks'])
 
 # Optional configuration, see the application user guide.
 app.conf.update(
     CELERY_TASK_RESULT_EXPIRES=3600,
+    # Run the tasks locally and synchronously, without broker nor workers
+    CELERY_ALWAYS_EAGER=getattr(settings, 'CELERY_ALWAYS_EAGER', False),
 )
 
 if __name__ == '__main__':
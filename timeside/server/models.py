@@ -40,6 +40,10 @@ processors = timeside.core.processors(timeside.api.IProcessor)
 
 PROCESSOR_PIDS = [(processor.id(), processor.id())  for processor in processors]
 
+# Chunk shape and compression filters of the HDF5 result files
+HDF5_OPTIONS = getattr(settings, 'TIMESIDE_HDF5_OPTIONS',
+                       {'compression': 'gzip', 'shuffle': True})
+
 STATUS = ((0, _('failed')), (1, _('draft')), (2, _('pending')),
                          (3, _('running')), (4, _('done')))
 
@@ -52,6 +56,22 @@ def get_processor(pid):
             return proc
     raise ValueError('Processor %s does not exists' % pid)
 
+def get_cached_result(item, preset):
+    """Return a done Result of the encoder preset for an item with the same
+    content, produced by the running version of TimeSide and whose output
+    file still exists, or None"""
+    if not item.sha1:
+        return None
+    results = Result.objects.filter(item__sha1=item.sha1,
+                                    preset__processor__pid=preset.processor.pid,
+                                    preset__parameters=preset.parameters,
+                                    version=timeside.__version__,
+                                    status=4).exclude(file='')
+    for result in results.order_by('-date_modified'):
+        if os.path.exists(result.file.path):
+            return result
+    return None
+
 
 class MetaCore:
 
@@ -174,6 +194,7 @@ class Result(BaseResource):
     hdf5 = models.FileField(_('HDF5 result file'), upload_to='results/%Y/%m/%d', blank=True, max_length=1024)
     file = models.FileField(_('Output file'), upload_to='results/%Y/%m/%d', blank=True, max_length=1024)
     mime_type = models.CharField(_('Output file MIME type'), blank=True, max_length=256)
+    version = models.CharField(_('TimeSide version'), blank=True, max_length=64)
     status = models.IntegerField(_('status'), choices=STATUS, default=1)
     author = models.ForeignKey(User, related_name="results", verbose_name=_('author'), blank=True, null=True, on_delete=models.SET_NULL)
 
@@ -210,74 +231,104 @@ class Task(BaseResource):
         self.save()
 
     def run(self):
-        self.status_setter(3)
+        """Dispatch the experience on each item of the selection to the
+        Celery workers, the task is done when all the items are processed"""
+        from timeside.server.tasks import run_item, task_done
+        from celery import chord
 
+        self.status_setter(3)
+        items = self.selection.items.all()
+        if not items:
+            self.status_setter(4)
+            return
+        chord(run_item.si(self.id, item.id) for item in items)(
+            task_done.s(self.id))
+
+    def run_item(self, item):
+        """Run the experience on an item of the selection"""
         results_root = 'results'
-        if not os.path.exists(settings.MEDIA_ROOT + results_root):
-            os.makedirs(settings.MEDIA_ROOT + results_root)
-
-        for item in self.selection.items.all():
-            path = results_root + os.sep + item.uuid + os.sep
-            if not os.path.exists(settings.MEDIA_ROOT + os.sep + path):
-                os.makedirs(settings.MEDIA_ROOT + os.sep + path)
-
-            pipe = timeside.decoder.FileDecoder(item.file.path, sha1=item.sha1)
-
-            presets = {}
-            for preset in self.experience.presets.all():
-                proc = get_processor(preset.processor.pid)
-                if proc.type == 'encoder':
+        path = results_root + os.sep + item.uuid + os.sep
+        if not os.path.exists(settings.MEDIA_ROOT + os.sep + path):
+            os.makedirs(settings.MEDIA_ROOT + os.sep + path)
+
+        presets = {}
+        procs = []
+        for preset in self.experience.presets.all():
+            proc = get_processor(preset.processor.pid)
+            if proc.type == 'encoder':
+                result, c = Result.objects.get_or_create(preset=preset, item=item)
+                cached = get_cached_result(item, preset)
+                if cached is not None:
+                    # Same content, encoder and parameters: reuse the file
+                    result.file = cached.file.name
+                    result.mime_type = cached.mime_type
+                    result.version = cached.version
+                    result.status_setter(4)
+                    continue
+                result.file = path + str(result.uuid) + '.' + proc.file_extension()
+                result.version = timeside.__version__
+                result.status_setter(3)
+                proc = proc(result.file.path, overwrite=True)
+            else:
+                if proc.type == 'grapher':
                     result, c = Result.objects.get_or_create(preset=preset, item=item)
-                    result.file = path + str(result.uuid) + '.' + proc.file_extension()
-                    result.save()
-                    proc = proc(result.file.path, overwrite=True)
-                else:
-                    proc = proc()
-                #proc.set_parameters(preset.parameters)
-                presets[preset] = proc
-                pipe = pipe | proc
-
-            # while item.lock:
-            #     time.sleep(30)
-
-            if not item.hdf5:
-                item.hdf5 =  path + str(self.experience.uuid) + '.hdf5'
-                item.save()
-
-            pipe.run()
-            item.lock_setter(True)
-            pipe.results.to_hdf5(item.hdf5.path)
-            item.lock_setter(False)
-
-            for preset in presets.keys():
-                proc = presets[preset]
-                if proc.type == 'analyzer':
-                    for processor_id in proc.results.keys():
-                        parameters = proc.results[processor_id].parameters
-                        preset, c = Preset.objects.get_or_create(processor=preset.processor, parameters=unicode(parameters))
-                        result, c = Result.objects.get_or_create(preset=preset, item=item)
-                        result.hdf5 = path + str(result.uuid) + '.hdf5'
-                        proc.results.to_hdf5(result.hdf5.path)
-                        result.status_setter(4)
-                elif proc.type == 'grapher':
-                    parameters = {}
+                    result.status_setter(3)
+                proc = proc()
+            #proc.set_parameters(preset.parameters)
+            presets[preset] = proc
+            procs.append(proc)
+
+        if not procs:
+            # Every output of the item is cached, no need to decode it
+            return
+
+        pipe = timeside.decoder.FileDecoder(item.file.path, sha1=item.sha1)
+        for proc in procs:
+            pipe = pipe | proc
+
+        # while item.lock:
+        #     time.sleep(30)
+
+        if not item.hdf5:
+            item.hdf5 =  path + str(self.experience.uuid) + '.hdf5'
+            item.save()
+
+        pipe.run()
+        item.lock_setter(True)
+        pipe.results.to_hdf5(item.hdf5.path, pyramids=True,
+                             **HDF5_OPTIONS)
+        item.lock_setter(False)
+
+        for preset in presets.keys():
+            proc = presets[preset]
+            if proc.type == 'analyzer':
+                for processor_id in proc.results.keys():
+                    parameters = proc.results[processor_id].parameters
+                    preset, c = Preset.objects.get_or_create(processor=preset.processor, parameters=unicode(parameters))
                     result, c = Result.objects.get_or_create(preset=preset, item=item)
-                    result.file = path + str(result.uuid) + '.png'
-                    proc.render(output=result.file.path)
-                    result.status_setter(4)
-                elif proc.type == 'encoder':
-                    result = Result.objects.get(preset=preset, item=item)
+                    result.hdf5 = path + str(result.uuid) + '.hdf5'
+                    proc.results.to_hdf5(result.hdf5.path,
+                                         pyramids=True, **HDF5_OPTIONS)
                     result.status_setter(4)
-                del proc
-
-            # except:
-            #     self.status_setter(0)
-            #     item.lock_setter(False)
-            #     break
-
-        self.status_setter(4)
+            elif proc.type == 'grapher':
+                parameters = {}
+                result, c = Result.objects.get_or_create(preset=preset, item=item)
+                result.file = path + str(result.uuid) + '.png'
+                proc.render(output=result.file.path)
+                result.status_setter(4)
+            elif proc.type == 'encoder':
+                result = Result.objects.get(preset=preset, item=item)
+                result.status_setter(4)
+            del proc
         del pipe
 
+    def fail_item(self, item):
+        """Mark the unfinished results of the experience on an item as failed"""
+        Result.objects.filter(item=item,
+                              preset__in=self.experience.presets.all()).exclude(
+                                  status=4).update(status=0)
+        item.lock_setter(False)
+
 
 def set_mimetype(sender, **kwargs):
     instance = kwargs['instance']
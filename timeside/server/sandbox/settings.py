@@ -166,4 +166,9 @@ LOGGING = {
 }
 
 REST_FRAMEWORK = {
-}
\ No newline at end of file
+}
+
+# Celery
+BROKER_URL = 'amqp://'
+CELERY_RESULT_BACKEND = 'amqp://'
+CELERY_ALWAYS_EAGER = False
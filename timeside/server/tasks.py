@@ -1,9 +1,59 @@
 
 from __future__ import absolute_import
 
+import errno
+
+try:
+    from django.db import OperationalError
+except ImportError:
+    # Django < 1.6
+    from django.db import DatabaseError as OperationalError
+from celery.utils.log import get_task_logger
+
 from timeside.server.celery import app
+from timeside.server.models import Item, Task
+
+logger = get_task_logger(__name__)
+
+# Errors of the storage worth retrying, unlike the errors of the decoder on
+# unreadable files, which have no errno
+TRANSIENT_ERRNOS = (errno.EAGAIN, errno.EBUSY, errno.EINTR, errno.ESTALE,
+                    errno.ETIMEDOUT)
+
+
+def is_transient(exc):
+    """Return True if the error may not occur again when retrying"""
+    if isinstance(exc, OperationalError):
+        return True
+    if isinstance(exc, EnvironmentError):
+        return exc.errno in TRANSIENT_ERRNOS
+    return False
+
+
+@app.task(bind=True, max_retries=3, default_retry_delay=30)
+def run_item(self, task_id, item_id):
+    """Run the experience of a task on an item, return False on failure"""
+    task = item = None
+    try:
+        task = Task.objects.get(id=task_id)
+        item = Item.objects.get(id=item_id)
+        task.run_item(item)
+    except Exception as exc:
+        if is_transient(exc) and self.request.retries < self.max_retries:
+            raise self.retry(exc=exc)
+        logger.exception('Task %s failed on item %s', task_id, item_id)
+        if task is not None and item is not None:
+            try:
+                task.fail_item(item)
+            except Exception:
+                logger.exception('Could not mark the results of item %s '
+                                 'as failed', item_id)
+        return False
+    return True
 
 
 @app.task
-def process(pipe):
-    pipe.run()
+def task_done(results, task_id):
+    """Set the status of a task once all its items are processed"""
+    task = Task.objects.get(id=task_id)
+    task.status_setter(4 if all(results) else 0)
@@ -21,8 +21,16 @@
 # Author : Guillaume Pellerin <yomguy@parisson.com>
 
 
+import math
+
 from django.views.generic import *
 from django.http import HttpResponse, HttpResponseRedirect
+from django.http import HttpResponseBadRequest
+try:
+    from django.http import StreamingHttpResponse
+except ImportError:
+    # Django < 1.5 streams iterators with HttpResponse
+    StreamingHttpResponse = HttpResponse
 
 from rest_framework import viewsets
 
@@ -42,6 +50,43 @@ def stream_from_file(file):
         yield chunk
 
 
+def time_range(query):
+    """Return the start and stop times in seconds given in a query, None if
+    missing
+
+    Raise a ValueError if a time is not a finite number or if start is
+    after stop."""
+    times = []
+    for name in ['start', 'stop']:
+        value = query.get(name)
+        if value is not None:
+            try:
+                value = float(value)
+            except ValueError:
+                raise ValueError('%s must be a number of seconds' % name)
+            if math.isinf(value) or math.isnan(value):
+                raise ValueError('%s must be a finite number' % name)
+        times.append(value)
+    start, stop = times
+    if start is not None and stop is not None and start > stop:
+        raise ValueError('start must not be after stop')
+    return start, stop
+
+
+def stream_results(results, start=None, stop=None):
+    """Yield the JSON encoding of lazily loaded results, then close their
+    HDF5 file"""
+    try:
+        if start is not None or stop is not None:
+            selection = results.time_slice(start, stop)
+        else:
+            selection = results
+        for chunk in selection.iter_json():
+            yield chunk
+    finally:
+        results.close()
+
+
 class SelectionViewSet(viewsets.ModelViewSet):
 
     model = Selection
@@ -108,10 +153,16 @@ class ResultAnalyzerView(View):
     model = Result
 
     def get(self, request, *args, **kwargs):
+        # Only read the requested time range, e.g. ?start=120&stop=180
+        try:
+            start, stop = time_range(request.GET)
+        except ValueError as e:
+            return HttpResponseBadRequest(str(e))
         result = Result.objects.get(pk=kwargs['pk'])
         container = AnalyzerResultContainer()
-        return HttpResponse(container.from_hdf5(result.hdf5.path).to_json(),
-                            mimetype='application/json')
+        results = container.from_hdf5(result.hdf5.path, lazy=True)
+        return StreamingHttpResponse(stream_results(results, start, stop),
+                                     mimetype='application/json')
 
 
 class ResultGrapherView(View):
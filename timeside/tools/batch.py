@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2014 Parisson SARL
+#
+# This file is part of TimeSide.
+
+# TimeSide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+
+# TimeSide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with TimeSide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Run a processing function on a collection of media sources across a pool
+of processes.
+
+The function is called once per source, in a worker process, and is expected
+to build its own pipe (decoder and processors are not shareable between
+processes). Its return value must be picklable.
+
+>>> from timeside.tools.batch import run_batch
+>>> for source, value, error in run_batch(len, ['a', 'bb', 'ccc'], jobs=2):
+...     print source, value, error
+a 1 None
+bb 2 None
+ccc 3 None
+"""
+
+import multiprocessing
+import traceback
+
+__all__ = ['run_batch']
+
+# Function run by the workers. It is inherited by the forked workers, so that
+# closures and locally defined functions can be used as well.
+_batch_func = None
+
+
+def _run_one(args):
+    index, source = args
+    try:
+        return index, _batch_func(source), None
+    except Exception:
+        return index, None, traceback.format_exc()
+
+
+def run_batch(func, sources, jobs=None, ordered=True, maxtasksperchild=None):
+    """Call func(source) for each source on a pool of `jobs` processes
+
+    Yield a (source, value, error) tuple for each source as soon as it is
+    processed, where `value` is the return value of `func` and `error` is
+    None or the formatted traceback of the exception raised while processing
+    this source. A failing source does not abort the run.
+
+    Parameters
+    ----------
+    func : callable
+        Function processing a single source
+    sources : iterable
+        Sources (e.g. file paths or URIs) to process
+    jobs : int
+        Number of worker processes. Defaults to the number of CPUs.
+        If 1, the sources are processed in the current process.
+    ordered : bool
+        If True, yield the results in the order of `sources`, else yield
+        them as they are completed
+    maxtasksperchild : int
+        Number of sources processed by a worker before it is replaced
+    """
+    global _batch_func
+
+    sources = list(sources)
+    tasks = list(enumerate(sources))
+
+    if jobs == 1:
+        _batch_func = func
+        try:
+            for task in tasks:
+                index, value, error = _run_one(task)
+                yield sources[index], value, error
+        finally:
+            _batch_func = None
+        return
+
+    # The function has to be set whenever a worker is forked
+    _batch_func = func
+    pool = multiprocessing.Pool(processes=jobs,
+                                maxtasksperchild=maxtasksperchild)
+    try:
+        if ordered:
+            results = pool.imap(_run_one, tasks)
+        else:
+            results = pool.imap_unordered(_run_one, tasks)
+        for index, value, error in results:
+            yield sources[index], value, error
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+        _batch_func = None
@@ -1,4 +1,4 @@
-from numpy import getbuffer, frombuffer
+from numpy import getbuffer, frombuffer, ascontiguousarray
 
 import pygst
 pygst.require('0.10')
@@ -10,9 +10,12 @@ import threading
 
 
 def numpy_array_to_gst_buffer(frames, chunk_size, num_samples, sample_rate):
+    """ numpy array to gstreamer buffer conversion
+
+    The frames are only converted when they are not a contiguous float32
+    array already, the gst.Buffer then copies them once into its memory."""
     from gst import Buffer
-    """ gstreamer buffer to numpy array conversion """
-    buf = Buffer(getbuffer(frames.astype("float32")))
+    buf = Buffer(getbuffer(ascontiguousarray(frames, dtype='float32')))
     # Set its timestamp and duration
     buf.timestamp = gst.util_uint64_scale(num_samples, gst.SECOND, sample_rate)
     buf.duration = gst.util_uint64_scale(chunk_size, gst.SECOND, sample_rate)
@@ -20,8 +23,16 @@ def numpy_array_to_gst_buffer(frames, chunk_size, num_samples, sample_rate):
 
 
 def gst_buffer_to_numpy_array(buf, chan):
-    """ gstreamer buffer to numpy array conversion """
-    samples = frombuffer(buf.data, dtype='float32').reshape((-1, chan))
+    """ gstreamer buffer to numpy array conversion
+
+    The array is a read-only view of the memory of the gst.Buffer, which it
+    keeps a reference to. buf.data would return a copy of it."""
+    try:
+        data = frombuffer(buf, dtype='float32')
+    except (TypeError, AttributeError):
+        # gst.Buffer without the buffer interface
+        data = frombuffer(buf.data, dtype='float32')
+    samples = data.reshape((-1, chan))
     return samples
 
 